@@ -6,6 +6,37 @@ and returns optimal n_jobs and chunksize parameters.
 """
 
 from .optimizer import optimize
+from .batch import optimize_batch, iter_batches
+from .async_support import optimize_async, amap
+from .arguments import zip_args
+from .executor import execute
+from .reduce import optimize_reduce, execute_reduce
+from .pipeline import optimize_pipeline, execute_pipeline
+from .pool_manager import PoolManager, get_pool_manager
+from .coordinator import CoreCoordinator, enable_coordination, disable_coordination
+from .watchdog import MemoryWatchdog
+from .autotuner import autotune
+from .cache import PlanCache
 
 __version__ = "0.1.0"
-__all__ = ["optimize"]
+__all__ = [
+    "optimize",
+    "execute",
+    "zip_args",
+    "optimize_reduce",
+    "execute_reduce",
+    "optimize_pipeline",
+    "execute_pipeline",
+    "PoolManager",
+    "get_pool_manager",
+    "CoreCoordinator",
+    "enable_coordination",
+    "disable_coordination",
+    "MemoryWatchdog",
+    "autotune",
+    "PlanCache",
+    "optimize_batch",
+    "iter_batches",
+    "optimize_async",
+    "amap",
+]
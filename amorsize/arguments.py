@@ -0,0 +1,91 @@
+"""
+Arguments module for multi-argument (starmap) and keyword-argument calls.
+"""
+
+import functools
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Union
+
+
+class ZippedArgs:
+    """
+    Sized, indexable view over several sequences zipped into argument tuples.
+
+    Unlike the built-in zip(), the length is known up front so the optimizer
+    can estimate the total workload, and sampling does not consume the data.
+    """
+
+    def __init__(self, *sequences: Sequence):
+        self.sequences = sequences
+
+    def __len__(self):
+        return min((len(seq) for seq in self.sequences), default=0)
+
+    def __iter__(self):
+        return iter(zip(*self.sequences))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ZippedArgs index out of range")
+        return tuple(seq[index] for seq in self.sequences)
+
+
+def zip_args(*iterables: Iterable) -> Union[ZippedArgs, Iterator]:
+    """
+    Zip several iterables into argument tuples for starmap-style calls.
+
+    Args:
+        *iterables: One iterable per positional argument of the function
+
+    Returns:
+        A ZippedArgs sequence when every iterable is a sized sequence,
+        otherwise a lazy zip iterator
+
+    Example:
+        >>> result = optimize(func, zip_args(a_values, b_values), starmap=True)
+    """
+    if all(hasattr(it, '__len__') and hasattr(it, '__getitem__') for it in iterables):
+        return ZippedArgs(*iterables)
+    return zip(*iterables)
+
+
+def bind_kwargs(
+    func: Callable[..., Any],
+    func_kwargs: Optional[Dict[str, Any]] = None
+) -> Callable[..., Any]:
+    """
+    Bind fixed keyword arguments to a function in a picklable way.
+
+    functools.partial objects pickle whenever the function and the
+    keyword values pickle, unlike the lambdas they replace.
+
+    Args:
+        func: Function to call
+        func_kwargs: Keyword arguments passed to every call
+
+    Returns:
+        func itself when there are no keyword arguments, otherwise a partial
+    """
+    if not func_kwargs:
+        return func
+    return functools.partial(func, **func_kwargs)
+
+
+def call_with_args(func: Callable[..., Any], item: Any, starmap: bool = False) -> Any:
+    """
+    Call func on a data item, unpacking it as positional arguments for starmap.
+
+    Args:
+        func: Function to call
+        item: Data item, or tuple of positional arguments when starmap is True
+        starmap: If True, call func(*item) instead of func(item)
+
+    Returns:
+        The function's return value
+    """
+    if starmap:
+        return func(*item)
+    return func(item)
@@ -0,0 +1,237 @@
+"""
+Async module for optimizing and running coroutine functions on an event loop.
+"""
+
+import asyncio
+import inspect
+import itertools
+import math
+import time
+from typing import Any, Awaitable, Callable, Iterator, List, Tuple, Union
+
+from .sampling import safe_slice_data, estimate_total_items
+
+
+class AsyncOptimizationResult:
+    """Container for async optimization results."""
+
+    def __init__(
+        self,
+        concurrency: int,
+        batch_size: int,
+        reason: str,
+        estimated_throughput: float = 0.0,
+        avg_latency: float = 0.0,
+        warnings: List[str] = None
+    ):
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.reason = reason
+        self.estimated_throughput = estimated_throughput
+        self.avg_latency = avg_latency
+        self.warnings = warnings or []
+
+    def __repr__(self):
+        return (
+            f"AsyncOptimizationResult(concurrency={self.concurrency}, "
+            f"batch_size={self.batch_size}, "
+            f"estimated_throughput={self.estimated_throughput:.1f}/s)"
+        )
+
+    def __str__(self):
+        result = f"Recommended: concurrency={self.concurrency}, batch_size={self.batch_size}\n"
+        result += f"Reason: {self.reason}\n"
+        result += f"Estimated throughput: {self.estimated_throughput:.1f} items/s"
+        if self.warnings:
+            result += "\nWarnings:\n" + "\n".join(f"  - {w}" for w in self.warnings)
+        return result
+
+
+async def _measure_concurrency(
+    func: Callable[[Any], Awaitable[Any]],
+    items: List[Any],
+    level: int
+) -> Tuple[float, float]:
+    """
+    Await `level` calls concurrently, cycling through the sample items.
+
+    Returns:
+        Tuple of (throughput in items/s, average latency in seconds)
+    """
+    latencies = []
+
+    async def timed_call(item):
+        start_time = time.perf_counter()
+        await func(item)
+        latencies.append(time.perf_counter() - start_time)
+
+    calls = [timed_call(item) for item in itertools.islice(itertools.cycle(items), level)]
+    start_time = time.perf_counter()
+    await asyncio.gather(*calls)
+    wall_time = time.perf_counter() - start_time
+
+    throughput = level / wall_time if wall_time > 0 else float("inf")
+    return throughput, sum(latencies) / len(latencies)
+
+
+async def optimize_async(
+    func: Callable[[Any], Awaitable[Any]],
+    data: Union[List, Iterator],
+    sample_size: int = 8,
+    max_concurrency: int = 256,
+    tolerance: float = 0.1,
+    max_sample_time: float = 5.0,
+    verbose: bool = False
+) -> AsyncOptimizationResult:
+    """
+    Analyze a coroutine function to determine a concurrency limit and batch size.
+
+    Sample items are awaited concurrently at doubling concurrency levels
+    while throughput and latency are measured. The recommended concurrency
+    is the smallest level reaching within `tolerance` of the best observed
+    throughput - beyond it extra in-flight requests only add latency. The
+    batch size is chosen so the stall at each batch boundary costs at most
+    `tolerance` of throughput.
+
+    Args:
+        func: The `async def` function to run. Must accept a single argument.
+        data: Iterable of input data
+        sample_size: Number of distinct items to sample (default: 8)
+        max_concurrency: Largest concurrency level to probe (default: 256)
+        tolerance: Acceptable fraction of throughput loss (default: 0.1)
+        max_sample_time: Time budget for probing in seconds (default: 5.0)
+        verbose: If True, print detailed information
+
+    Returns:
+        AsyncOptimizationResult with recommended concurrency and batch_size
+
+    Example:
+        >>> async def fetch(url):
+        ...     ...
+        >>> result = await optimize_async(fetch, urls)
+        >>> responses = await amap(fetch, urls, result.concurrency, result.batch_size)
+    """
+    if not inspect.iscoroutinefunction(func):
+        return AsyncOptimizationResult(
+            concurrency=1,
+            batch_size=1,
+            reason="Function is not a coroutine function - use optimize() instead",
+            warnings=["optimize_async() requires an `async def` function."]
+        )
+
+    try:
+        sample, _ = safe_slice_data(data, sample_size)
+        if not sample:
+            raise ValueError("Empty data sample")
+    except Exception as e:
+        return AsyncOptimizationResult(
+            concurrency=1,
+            batch_size=1,
+            reason=f"Error during sampling: {str(e)}",
+            warnings=[f"Sampling failed: {str(e)}"]
+        )
+
+    if verbose:
+        print("Probing concurrency levels...")
+
+    levels = []
+    level = 1
+    best_throughput = 0.0
+    stalled = 0
+    budget_exhausted = False
+    sampling_start = time.perf_counter()
+
+    try:
+        while level <= max_concurrency:
+            throughput, latency = await _measure_concurrency(func, sample, level)
+            levels.append((level, throughput, latency))
+
+            if verbose:
+                print(f"  concurrency={level}: {throughput:.1f} items/s, latency {latency:.4f}s")
+
+            # Stop once throughput has saturated for two consecutive levels
+            if throughput > best_throughput * (1 + tolerance):
+                stalled = 0
+            else:
+                stalled += 1
+            best_throughput = max(best_throughput, throughput)
+
+            if stalled >= 2:
+                break
+            if time.perf_counter() - sampling_start > max_sample_time:
+                budget_exhausted = True
+                break
+            level *= 2
+    except Exception as e:
+        return AsyncOptimizationResult(
+            concurrency=1,
+            batch_size=1,
+            reason=f"Error during sampling: {str(e)}",
+            warnings=[f"Sampling failed: {str(e)}"]
+        )
+
+    # Smallest concurrency within tolerance of the best throughput
+    for concurrency, throughput, latency in levels:
+        if throughput >= best_throughput * (1 - tolerance):
+            break
+
+    # A batch boundary idles up to `concurrency` slots for about half a call
+    batch_size = max(concurrency, math.ceil(concurrency / (2 * tolerance)))
+
+    result_warnings = []
+    total_items = estimate_total_items(data, False)
+    if total_items > 0:
+        batch_size = min(batch_size, total_items)
+    if budget_exhausted:
+        result_warnings.append(
+            "Sampling time budget exhausted before throughput saturated"
+        )
+
+    return AsyncOptimizationResult(
+        concurrency=concurrency,
+        batch_size=batch_size,
+        reason=(
+            f"Throughput saturates at {concurrency} concurrent calls "
+            f"({throughput:.1f} items/s)"
+        ),
+        estimated_throughput=throughput,
+        avg_latency=latency,
+        warnings=result_warnings
+    )
+
+
+async def amap(
+    func: Callable[[Any], Awaitable[Any]],
+    data: Union[List, Iterator],
+    concurrency: int,
+    batch_size: int
+) -> List[Any]:
+    """
+    Await func over data with a concurrency limit, in batches.
+
+    At most `batch_size` coroutines are created at a time and at most
+    `concurrency` of them are in flight, bounding memory for long inputs.
+
+    Args:
+        func: The `async def` function to run
+        data: Iterable of input data
+        concurrency: Maximum number of concurrently awaited calls
+        batch_size: Number of items scheduled per batch
+
+    Returns:
+        List of results in input order
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def limited_call(item):
+        async with semaphore:
+            return await func(item)
+
+    results = []
+    iterator = iter(data)
+    while True:
+        batch = list(itertools.islice(iterator, max(1, batch_size)))
+        if not batch:
+            break
+        results.extend(await asyncio.gather(*(limited_call(item) for item in batch)))
+    return results
@@ -0,0 +1,322 @@
+"""
+Autotune module for choosing a plan from timed trials on a slice of the data.
+"""
+
+import math
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .arguments import bind_kwargs, call_with_args
+from .cache import PlanCache, plan_key
+from .optimizer import optimize, OptimizationResult
+from .pool_manager import BACKENDS, PoolManager
+from .system_info import get_physical_cores
+
+# Smallest slice timed in the first round
+MIN_TRIAL_ITEMS = 16
+
+
+class Trial:
+    """One timed run of a candidate configuration."""
+
+    def __init__(
+        self,
+        backend: str,
+        n_jobs: int,
+        chunksize: int,
+        items: int,
+        seconds: float,
+        error: Optional[Exception] = None,
+        warmup: float = 0.0
+    ):
+        self.backend = backend
+        self.n_jobs = n_jobs
+        self.chunksize = chunksize
+        self.items = items
+        self.seconds = seconds
+        self.error = error
+        # Untimed run that started a new pool's workers, not part of seconds
+        self.warmup = warmup
+
+    @property
+    def time_per_item(self) -> float:
+        """Seconds per item, or infinity if the trial failed."""
+        if self.error is not None or self.items == 0:
+            return math.inf
+        return self.seconds / self.items
+
+    def __repr__(self):
+        return (
+            f"Trial(backend={self.backend!r}, n_jobs={self.n_jobs}, "
+            f"chunksize={self.chunksize}, items={self.items}, seconds={self.seconds:.4f})"
+        )
+
+
+class AutotuneResult:
+    """Container for autotuning results."""
+
+    def __init__(
+        self,
+        plan: OptimizationResult,
+        trials: List[Trial],
+        rounds: int = 0,
+        from_cache: bool = False,
+        warnings: List[str] = None
+    ):
+        self.plan = plan
+        self.trials = trials
+        self.rounds = rounds
+        self.from_cache = from_cache
+        self.warnings = warnings or []
+
+    def __repr__(self):
+        return (
+            f"AutotuneResult(backend={self.plan.backend!r}, n_jobs={self.plan.n_jobs}, "
+            f"chunksize={self.plan.chunksize}, trials={len(self.trials)}, "
+            f"from_cache={self.from_cache})"
+        )
+
+    def __str__(self):
+        result = str(self.plan)
+        if self.from_cache:
+            result += "\nPlan loaded from the plan cache"
+        else:
+            result += f"\nTrials: {len(self.trials)} in {self.rounds} round(s)"
+        if self.warnings:
+            result += "\nAutotune warnings:\n" + "\n".join(f"  - {w}" for w in self.warnings)
+        return result
+
+
+def candidate_configs(
+    plan: OptimizationResult,
+    max_workers: int,
+    backends: Sequence[str] = ("process",)
+) -> List[Tuple[str, int, int]]:
+    """
+    Configurations around a heuristic plan to try.
+
+    Worker counts are the plan's, half of it and all cores; chunk sizes are
+    the plan's and 4x smaller or larger. Serial execution is always a
+    candidate.
+
+    Args:
+        plan: Heuristic plan from optimize()
+        max_workers: Largest worker count to try
+        backends: Pool backends to try ("process", "thread")
+
+    Returns:
+        Distinct (backend, n_jobs, chunksize) tuples; serial execution is
+        ("serial", 1, 1)
+    """
+    n_jobs_values = {max(2, plan.n_jobs // 2), max(2, plan.n_jobs), max_workers}
+    chunksizes = {max(1, plan.chunksize // 4), plan.chunksize, plan.chunksize * 4}
+    configs = [("serial", 1, 1)]
+    for backend in backends:
+        for n_jobs in sorted(n for n in n_jobs_values if 2 <= n <= max_workers):
+            for chunksize in sorted(chunksizes):
+                configs.append((backend, n_jobs, chunksize))
+    return configs
+
+
+def trial_slice(data: Sequence, size: int, stratified: bool = False) -> List:
+    """
+    Items to time a trial on.
+
+    Args:
+        data: Sized, indexable data
+        size: Number of items
+        stratified: Take evenly spaced items across the data instead of a
+            prefix, so ordered data (e.g. sorted by size) is represented
+
+    Returns:
+        List of items
+    """
+    size = min(size, len(data))
+    if not stratified or size == len(data):
+        return list(data[:size])
+    step = len(data) / size
+    return [data[int(i * step)] for i in range(size)]
+
+
+def _run_trial(
+    call: Callable[..., Any],
+    items: List,
+    config: Tuple[str, int, int],
+    starmap: bool,
+    pool_manager: PoolManager
+) -> Trial:
+    """
+    Time one configuration on a slice, excluding worker startup.
+
+    A pool that has to be started first runs the slice once untimed, so
+    its workers (which import their modules under spawn) are up before
+    the timed run.
+    """
+    backend, n_jobs, chunksize = config
+    try:
+        if backend == "serial":
+            start = time.perf_counter()
+            for item in items:
+                call_with_args(call, item, starmap)
+            return Trial(backend, n_jobs, chunksize, len(items), time.perf_counter() - start)
+        cold = pool_manager.startup_workers(n_jobs, backend=backend) > 0
+        with pool_manager.pool(n_jobs, backend=backend) as pool:
+            run = pool.starmap if starmap else pool.map
+            warmup = 0.0
+            if cold:
+                start = time.perf_counter()
+                run(call, items, chunksize=chunksize)
+                warmup = time.perf_counter() - start
+            start = time.perf_counter()
+            run(call, items, chunksize=chunksize)
+            return Trial(
+                backend, n_jobs, chunksize, len(items), time.perf_counter() - start,
+                warmup=warmup
+            )
+    except Exception as e:
+        return Trial(backend, n_jobs, chunksize, len(items), 0.0, error=e)
+
+
+def autotune(
+    func: Callable[..., Any],
+    data: Union[Sequence, Iterator],
+    time_budget: float = 10.0,
+    backends: Sequence[str] = ("process",),
+    stratified: bool = False,
+    starmap: bool = False,
+    func_kwargs: Optional[Dict[str, Any]] = None,
+    cache: Union[bool, PlanCache, None] = None,
+    pool_manager: Optional[PoolManager] = None,
+    verbose: bool = False
+) -> AutotuneResult:
+    """
+    Find the fastest configuration by timing real trials (successive halving).
+
+    Candidate (backend, n_jobs, chunksize) configurations around the
+    heuristic plan from optimize() are run on a slice of the data. After
+    each round the slower half is dropped and the slice doubles, until one
+    candidate is left, the slice covers the data or the time budget would
+    be exceeded. Worker counts above the plan's max_workers, the memory
+    and core coordinator cap, are not tried. Trials reuse warm pools, and
+    a newly started pool runs the slice once untimed first, so worker
+    startup is not timed.
+
+    Args:
+        func: The function to run
+        data: Sized, indexable data. Iterators are materialized into a list.
+        time_budget: Seconds to spend on trials (default: 10.0)
+        backends: Pool backends to try, from "process" and "thread"
+            (default: ("process",))
+        stratified: Time evenly spaced items instead of a prefix
+        starmap: If True, call func(*item) like Pool.starmap (default: False)
+        func_kwargs: Keyword arguments passed to every call (default: None)
+        cache: PlanCache to reuse and store the winning plan in, or True
+            for the default cache file (default: no caching)
+        pool_manager: PoolManager for the trials, left warm afterwards
+            (default: a private one, shut down when tuning ends)
+        verbose: If True, print every round
+
+    Returns:
+        AutotuneResult whose plan can be passed to execute(result=...)
+
+    Raises:
+        ValueError: If a backend is unknown or the time budget is not positive
+    """
+    for backend in backends:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r} - expected one of {sorted(BACKENDS)}")
+    if time_budget <= 0:
+        raise ValueError("time_budget must be positive")
+
+    if not hasattr(data, '__len__') or not hasattr(data, '__getitem__'):
+        data = list(data)
+
+    if cache is True:
+        cache = PlanCache()
+    elif cache is False:
+        cache = None
+    key = plan_key(func, len(data), starmap, func_kwargs, backends)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return AutotuneResult(cached, [], from_cache=True)
+
+    deadline = time.perf_counter() + time_budget
+    heuristic = optimize(func, data, starmap=starmap, func_kwargs=func_kwargs)
+    call = bind_kwargs(func, func_kwargs)
+    configs = candidate_configs(heuristic, heuristic.max_workers or get_physical_cores(), backends)
+    warnings = []
+
+    # The first round must fit in a third of the budget at the estimated item time
+    avg_time = (heuristic.predicted_time or 0.0) * heuristic.estimated_speedup / max(1, len(data))
+    size = min(len(data), max(MIN_TRIAL_ITEMS, heuristic.chunksize * 2))
+    if avg_time > 0:
+        affordable = int(time_budget / 3 / (avg_time * len(configs)))
+        size = max(1, min(size, affordable))
+
+    owns_manager = pool_manager is None
+    manager = pool_manager or PoolManager()
+    trials: List[Trial] = []
+    rounds = 0
+    try:
+        survivors = configs
+        while True:
+            rounds += 1
+            items = trial_slice(data, size, stratified)
+            round_start = time.perf_counter()
+            results = [_run_trial(call, items, config, starmap, manager) for config in survivors]
+            # Later rounds reuse the pools, so their warm-up runs do not recur
+            round_time = time.perf_counter() - round_start - sum(t.warmup for t in results)
+            trials.extend(results)
+            ranked = sorted(zip(results, survivors), key=lambda pair: pair[0].time_per_item)
+            if verbose:
+                best = ranked[0][0]
+                print(
+                    f"Round {rounds}: {len(survivors)} candidates on {len(items)} items, "
+                    f"best {best.backend} n_jobs={best.n_jobs} chunksize={best.chunksize} "
+                    f"({best.time_per_item * 1e3:.3f}ms/item)"
+                )
+            survivors = [config for _, config in ranked[:max(1, math.ceil(len(ranked) / 2))]]
+            if len(survivors) == 1 or size >= len(data):
+                break
+            # Half the candidates on twice the items take about as long again
+            next_size = min(len(data), size * 2)
+            estimate = round_time * (len(survivors) / len(ranked)) * (next_size / size)
+            if time.perf_counter() + estimate > deadline:
+                warnings.append(
+                    f"Time budget reached after {rounds} round(s) with "
+                    f"{len(survivors)} candidates left"
+                )
+                break
+            size = next_size
+    finally:
+        if owns_manager:
+            manager.shutdown()
+
+    winner = ranked[0][0]
+    if winner.error is not None:
+        warnings.append(f"Every trial failed ({winner.error}) - using the heuristic plan")
+        return AutotuneResult(heuristic, trials, rounds, warnings=warnings)
+
+    # Speedup against the serial trial on the largest slice it reached
+    serial_time = [t for t in trials if t.backend == "serial"][-1].time_per_item
+    backend = "process" if winner.backend == "serial" else winner.backend
+    plan = OptimizationResult(
+        n_jobs=winner.n_jobs,
+        chunksize=winner.chunksize,
+        reason=(
+            f"Autotuned: fastest of {len(configs)} configurations over {rounds} "
+            f"round(s) of trials on {winner.items} items"
+        ),
+        estimated_speedup=(
+            serial_time / winner.time_per_item
+            if 0 < winner.time_per_item and serial_time < math.inf else 1.0
+        ),
+        warnings=list(warnings),
+        predicted_time=winner.time_per_item * len(data),
+        core_seconds=winner.time_per_item * len(data) * winner.n_jobs,
+        backend=backend
+    )
+    if cache is not None:
+        cache.put(key, plan)
+    return AutotuneResult(plan, trials, rounds, warnings=warnings)
@@ -0,0 +1,330 @@
+"""
+Batch module for optimizing vectorized functions that process a whole batch per call.
+"""
+
+import math
+import pickle
+import time
+from typing import Any, Callable, Iterator, List, Sequence, Tuple, Union
+
+from .cost_model import fit_linear
+from .memory_model import estimate_memory
+from .memory_probe import trace_memory
+from .optimizer import OptimizationResult, chunks_per_worker, estimate_tail_time
+from .sampling import check_picklability, payload_size
+from .system_info import (
+    get_physical_cores,
+    get_spawn_cost,
+    get_cache_size,
+    calculate_max_workers,
+)
+
+
+class BatchOptimizationResult(OptimizationResult):
+    """Container for batch optimization results."""
+
+    def __init__(
+        self,
+        n_jobs: int,
+        chunksize: int,
+        batch_size: int,
+        reason: str,
+        estimated_speedup: float = 1.0,
+        warnings: List[str] = None,
+        fixed_cost: float = 0.0,
+        per_item_cost: float = 0.0
+    ):
+        super().__init__(n_jobs, chunksize, reason, estimated_speedup, warnings)
+        self.batch_size = batch_size
+        self.fixed_cost = fixed_cost
+        self.per_item_cost = per_item_cost
+
+    def __repr__(self):
+        return (
+            f"BatchOptimizationResult(n_jobs={self.n_jobs}, "
+            f"batch_size={self.batch_size}, "
+            f"chunksize={self.chunksize}, "
+            f"estimated_speedup={self.estimated_speedup:.2f}x)"
+        )
+
+    def __str__(self):
+        result = (
+            f"Recommended: n_jobs={self.n_jobs}, batch_size={self.batch_size}, "
+            f"chunksize={self.chunksize}\n"
+        )
+        result += f"Reason: {self.reason}\n"
+        result += f"Estimated speedup: {self.estimated_speedup:.2f}x"
+        if self.warnings:
+            result += "\nWarnings:\n" + "\n".join(f"  - {w}" for w in self.warnings)
+        return result
+
+
+def iter_batches(data: Sequence, batch_size: int) -> Iterator[Sequence]:
+    """
+    Yield consecutive slices of data with at most batch_size items each.
+
+    Args:
+        data: Sliceable sequence (list, tuple, NumPy array, ...)
+        batch_size: Number of items per batch
+
+    Yields:
+        Slices of data
+    """
+    batch_size = max(1, batch_size)
+    for start in range(0, len(data), batch_size):
+        yield data[start:start + batch_size]
+
+
+def _measure_batch(
+    func: Callable[[Any], Any],
+    batch: Sequence,
+    repeats: int
+) -> Tuple[float, int, int]:
+    """
+    Time a single batch call and record its peak memory and result size.
+
+    Returns:
+        Tuple of (best_time, peak_memory, pickled result size)
+    """
+    best_time = float("inf")
+    with trace_memory() as probe:
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            result = func(batch)
+            elapsed = time.perf_counter() - start_time
+            best_time = min(best_time, elapsed)
+            # Slow batches are measured once - repeats only reduce timer noise
+            if elapsed > 0.05:
+                break
+    return best_time, probe.peak, payload_size(result)
+
+
+def optimize_batch(
+    func: Callable[[Any], Any],
+    data: Union[Sequence, Iterator],
+    max_overhead: float = 0.05,
+    max_sample_time: float = 1.0,
+    target_chunk_duration: float = 0.2,
+    repeats: int = 3,
+    verbose: bool = False
+) -> BatchOptimizationResult:
+    """
+    Analyze a vectorized function to determine batch size and parallelism.
+
+    The function is called on geometrically growing slices of the data and
+    a fixed + per-item cost model is fitted to the timings. The batch size
+    is chosen so the fixed per-call cost is at most max_overhead of each
+    call, then capped by the last-level cache and so every worker receives
+    at least one batch. Workers are limited by memory as in optimize(): each
+    holds its interpreter baseline, a batch call's peak and a chunk of
+    batches in flight, and the parent collects every result. Chunks are
+    then sized so every worker gets chunks_per_worker() of them, and the
+    straggler tail is part of the predicted time.
+
+    Args:
+        func: Function accepting a list or array slice of items
+        data: Sliceable data. Iterators and generators are materialized
+            into a list.
+        max_overhead: Maximum acceptable fraction of a call spent on fixed
+            cost (default: 0.05)
+        max_sample_time: Time budget for sampling batch sizes in seconds
+            (default: 1.0)
+        target_chunk_duration: Target duration per pool task in seconds
+            (default: 0.2)
+        repeats: Timing repeats per batch size for fast batches (default: 3)
+        verbose: If True, print detailed information
+
+    Returns:
+        BatchOptimizationResult with recommended batch_size, n_jobs and
+        chunksize (in batches per pool task)
+
+    Example:
+        >>> import numpy as np
+        >>> data = np.arange(1_000_000)
+        >>> result = optimize_batch(np.sqrt, data)
+        >>> batches = iter_batches(data, result.batch_size)
+    """
+    result_warnings = []
+
+    if not check_picklability(func):
+        return BatchOptimizationResult(
+            n_jobs=1,
+            chunksize=1,
+            batch_size=1,
+            reason="Function is not picklable - cannot use multiprocessing",
+            estimated_speedup=1.0,
+            warnings=["Function cannot be pickled. Use serial execution."]
+        )
+
+    if not (hasattr(data, '__len__') and hasattr(data, '__getitem__')):
+        data = list(data)
+
+    total_items = len(data)
+    if total_items == 0:
+        return BatchOptimizationResult(
+            n_jobs=1,
+            chunksize=1,
+            batch_size=1,
+            reason="Error during sampling: Empty data sample",
+            estimated_speedup=1.0,
+            warnings=["Sampling failed: Empty data sample"]
+        )
+
+    # Step 1: Sample geometrically growing batch sizes within the time budget
+    if verbose:
+        print("Sampling batch sizes...")
+
+    sizes, times, peaks, result_sizes = [], [], [], []
+    size = 1
+    sampling_start = time.perf_counter()
+    try:
+        while True:
+            batch_time, peak, result_size = _measure_batch(func, data[0:size], repeats)
+            sizes.append(size)
+            times.append(batch_time)
+            peaks.append(peak)
+            result_sizes.append(result_size)
+
+            if verbose:
+                print(f"  batch_size={size}: {batch_time:.6f}s, peak memory {peak} bytes")
+
+            elapsed = time.perf_counter() - sampling_start
+            if size >= total_items or (len(sizes) >= 2 and elapsed > max_sample_time):
+                break
+            size = min(size * 4, total_items)
+    except Exception as e:
+        return BatchOptimizationResult(
+            n_jobs=1,
+            chunksize=1,
+            batch_size=1,
+            reason=f"Error during sampling: {str(e)}",
+            estimated_speedup=1.0,
+            warnings=[f"Sampling failed: {str(e)}"]
+        )
+
+    # Step 2: Fit fixed + per-item cost and memory models
+    fixed_cost, per_item_cost = fit_linear(sizes, times)
+    if per_item_cost <= 0:
+        # Timing noise or perfectly flat cost - attribute everything per item
+        per_item_cost = times[-1] / sizes[-1] if sizes[-1] else 0.0
+        fixed_cost = 0.0
+    fixed_cost = max(0.0, fixed_cost)
+
+    fixed_memory, per_item_memory = fit_linear(sizes, peaks)
+    fixed_memory = max(0, int(fixed_memory))
+    per_item_memory = max(0.0, per_item_memory)
+
+    if verbose:
+        print(f"Fixed cost per call: {fixed_cost:.6f}s")
+        print(f"Per-item cost: {per_item_cost:.9f}s")
+
+    # Step 3: Choose the batch size
+    physical_cores = get_physical_cores()
+    spawn_cost = get_spawn_cost()
+
+    if fixed_cost > 0 and per_item_cost > 0:
+        batch_size = math.ceil(
+            fixed_cost * (1 - max_overhead) / (max_overhead * per_item_cost)
+        )
+    else:
+        batch_size = sizes[-1]
+
+    # Keep the working set of a batch within the last-level cache where possible
+    try:
+        sample = data[0:sizes[-1]]
+        item_bytes = max(1, len(pickle.dumps(sample)) // sizes[-1])
+    except Exception:
+        item_bytes = 0
+    if item_bytes > 0:
+        cache_limit = max(1, get_cache_size() // item_bytes)
+        if batch_size > cache_limit:
+            result_warnings.append(
+                f"Batch size capped at {cache_limit} items to stay within CPU cache"
+            )
+            batch_size = cache_limit
+
+    # Every worker should receive at least one batch
+    batch_size = max(1, min(batch_size, math.ceil(total_items / physical_cores)))
+
+    n_batches = math.ceil(total_items / batch_size)
+    batch_time = fixed_cost + per_item_cost * batch_size
+    serial_time = n_batches * batch_time
+
+    if verbose:
+        print(f"Optimal batch_size: {batch_size} ({n_batches} batches)")
+        print(f"Estimated serial execution time: {serial_time:.2f}s")
+
+    # Pool tasks of batches should take at least target_chunk_duration
+    if batch_time > 0:
+        target_chunksize = max(1, int(target_chunk_duration / batch_time))
+    else:
+        target_chunksize = 1
+
+    # Step 4: Determine number of workers from memory, as optimize() does:
+    # the interpreter baseline, a batch call's peak and the largest chunk
+    # of batches in flight per worker, and every result in the parent
+    result_bytes = max(1, result_sizes[-1] // sizes[-1])
+    memory = estimate_memory(
+        1, min(n_batches, target_chunksize) * batch_size, total_items,
+        fixed_memory + int(per_item_memory * batch_size), item_bytes, result_bytes
+    )
+    max_workers = calculate_max_workers(
+        physical_cores,
+        memory.item_memory + 2 * memory.chunk_buffers,
+        memory.worker_baseline + memory.init_memory,
+        memory.parent_results
+    )
+
+    if max_workers < physical_cores:
+        result_warnings.append(
+            f"Memory constraints limit workers to {max_workers} "
+            f"(physical cores: {physical_cores})"
+        )
+
+    n_jobs = min(max_workers, n_batches)
+
+    # Step 5: Chunksize in batches per pool task, small enough that every
+    # worker gets chunks_per_worker() chunks and the last round stays
+    # short (batches of equal size take equal time)
+    chunksize = target_chunksize
+    if n_jobs > 1:
+        chunksize = max(1, min(target_chunksize, n_batches // (n_jobs * chunks_per_worker(0.0))))
+
+    if serial_time < spawn_cost * 2 or n_jobs == 1:
+        reason = (
+            f"Total execution time ({serial_time:.2f}s) too short for parallelization overhead"
+            if serial_time < spawn_cost * 2
+            else "Serial execution recommended based on constraints"
+        )
+        return BatchOptimizationResult(
+            n_jobs=1,
+            chunksize=chunksize,
+            batch_size=batch_size,
+            reason=reason,
+            estimated_speedup=1.0,
+            warnings=result_warnings,
+            fixed_cost=fixed_cost,
+            per_item_cost=per_item_cost
+        )
+
+    # Step 6: Estimate speedup, with the straggler tail of the last round
+    parallel_time = (
+        spawn_cost * n_jobs
+        + serial_time / n_jobs
+        + estimate_tail_time(n_batches, chunksize, n_jobs, batch_time)
+    )
+    estimated_speedup = serial_time / parallel_time
+
+    return BatchOptimizationResult(
+        n_jobs=n_jobs,
+        chunksize=chunksize,
+        batch_size=batch_size,
+        reason=(
+            f"Parallelization beneficial: {n_jobs} workers with batches of "
+            f"{batch_size} items"
+        ),
+        estimated_speedup=estimated_speedup,
+        warnings=result_warnings,
+        fixed_cost=fixed_cost,
+        per_item_cost=per_item_cost
+    )
@@ -0,0 +1,189 @@
+"""
+Cache module for persisting tuned plans between runs.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from .optimizer import OptimizationResult
+from .system_info import get_physical_cores
+
+
+def default_cache_path() -> str:
+    """
+    Default location of the plan cache file.
+
+    Returns:
+        $XDG_CACHE_HOME/amorsize/plans.json, or ~/.cache/amorsize/plans.json
+    """
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "amorsize", "plans.json")
+
+
+def _stable_repr(value: Any) -> str:
+    """repr() without memory addresses, which change from run to run."""
+    return re.sub(r" at 0x[0-9a-fA-F]+", "", repr(value))
+
+
+def _function_name(func: Callable[..., Any]) -> str:
+    """
+    Name of a function that is the same in every run.
+
+    Partials are named by their function and bound arguments, bound
+    methods by their class, and callable objects by their type.
+    """
+    if isinstance(func, functools.partial):
+        bound = _stable_repr((func.args, sorted(func.keywords.items())))
+        return f"partial({_function_name(func.func)}, {bound})"
+    owner = getattr(func, "__self__", None)
+    if owner is not None and not isinstance(owner, ModuleType):
+        cls = owner if isinstance(owner, type) else type(owner)
+        return f"{cls.__module__}.{cls.__qualname__}.{func.__name__}"
+    if not hasattr(func, "__qualname__"):
+        func = type(func)
+    return f"{getattr(func, '__module__', '?')}.{func.__qualname__}"
+
+
+def plan_key(
+    func: Callable[..., Any],
+    total_items: int,
+    starmap: bool = False,
+    func_kwargs: Optional[Dict[str, Any]] = None,
+    backends: Sequence[str] = ("process",)
+) -> str:
+    """
+    Cache key for a workload on this host.
+
+    Data sizes are rounded up to a power of two, so a recurring job whose
+    input grows or shrinks a little reuses its plan. Keyword arguments are
+    included as a short hash of their repr, with memory addresses removed.
+
+    Args:
+        func: The function being run
+        total_items: Number of items
+        starmap: Whether items are argument tuples
+        func_kwargs: Keyword arguments passed to every call
+        backends: Pool backends the plan was chosen from
+
+    Returns:
+        Key string naming the function, size bucket, arguments, backends
+        and core count
+    """
+    bucket = 1 << max(0, total_items - 1).bit_length()
+    kwargs = _stable_repr(sorted((func_kwargs or {}).items()))
+    kwargs_hash = hashlib.sha1(kwargs.encode()).hexdigest()[:12]
+    return (
+        f"{_function_name(func)}|items<={bucket}|starmap={starmap}|kwargs={kwargs_hash}"
+        f"|backends={','.join(sorted(backends))}|cores={get_physical_cores()}"
+    )
+
+
+class PlanCache:
+    """
+    JSON file of tuned plans keyed by plan_key().
+
+    Writes replace the file atomically, so concurrent jobs never read a
+    partial cache. Unreadable or corrupt files are treated as empty, and
+    malformed entries (e.g. written by another version) as missing.
+
+    Example:
+        >>> cache = PlanCache()
+        >>> result = autotune(func, data, cache=cache)   # tunes once
+        >>> result = autotune(func, data, cache=cache)   # reuses the plan
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_cache_path()
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, key: str) -> Optional[OptimizationResult]:
+        """
+        Look up a plan.
+
+        Args:
+            key: Key from plan_key()
+
+        Returns:
+            The stored OptimizationResult, or None. A malformed entry is
+            removed, so the plan is recomputed and stored again.
+        """
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None:
+            return None
+        try:
+            return OptimizationResult(
+                n_jobs=int(entry["n_jobs"]),
+                chunksize=int(entry["chunksize"]),
+                reason=entry.get("reason", "Cached plan"),
+                estimated_speedup=entry.get("estimated_speedup", 1.0),
+                predicted_time=entry.get("predicted_time"),
+                core_seconds=entry.get("core_seconds"),
+                schedule=entry.get("schedule", "static"),
+                backend=entry.get("backend", "process")
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            self.remove(key)
+            return None
+
+    def put(self, key: str, result: OptimizationResult):
+        """
+        Store a plan, replacing any previous plan for the key.
+
+        Args:
+            key: Key from plan_key()
+            result: Plan to store
+        """
+        entry = {
+            "n_jobs": result.n_jobs,
+            "chunksize": result.chunksize,
+            "reason": result.reason,
+            "estimated_speedup": result.estimated_speedup,
+            "predicted_time": result.predicted_time,
+            "core_seconds": result.core_seconds,
+            "schedule": result.schedule,
+            "backend": result.backend,
+        }
+        with self._lock:
+            entries = self._load()
+            entries[key] = entry
+            self._write(entries)
+
+    def remove(self, key: str):
+        """Forget the plan for a key."""
+        with self._lock:
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    def _write(self, entries: Dict[str, dict]):
+        """Replace the cache file atomically (caller holds the lock)."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f, indent=1)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
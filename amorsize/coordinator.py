@@ -0,0 +1,336 @@
+"""
+Coordinator module for sharing a core budget between concurrent jobs on one host.
+"""
+
+import atexit
+import getpass
+import json
+import os
+import tempfile
+import threading
+import uuid
+from typing import Dict, Optional
+
+from .system_info import get_physical_cores
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# Seconds between lease rebalances while execute() runs a job
+REBALANCE_INTERVAL = 1.0
+
+
+def fair_shares(requests: Dict[str, int], total_cores: int) -> Dict[str, int]:
+    """
+    Split cores between requests with max-min fairness (water-filling).
+
+    Requests smaller than an equal share are granted in full and the
+    remainder is split among the larger requests. Every request gets at
+    least one core.
+
+    Args:
+        requests: Requested cores per lease id
+        total_cores: Cores available on the host
+
+    Returns:
+        Granted cores per lease id
+    """
+    shares = {}
+    remaining = dict(requests)
+    budget = total_cores
+    while remaining:
+        equal_share = max(1, budget // len(remaining))
+        satisfied = {key: req for key, req in remaining.items() if req <= equal_share}
+        if not satisfied:
+            for key in remaining:
+                shares[key] = equal_share
+            break
+        for key, req in satisfied.items():
+            shares[key] = max(1, req)
+            budget -= req
+            del remaining[key]
+    return shares
+
+
+def default_lease_path() -> str:
+    """
+    Default location of the lease file for the current user.
+
+    Returns:
+        $XDG_RUNTIME_DIR/amorsize-core-leases.json when the per-user runtime
+        directory exists, otherwise a file named after the user in /dev/shm
+        (or the temp directory)
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "amorsize-core-leases.json")
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    return os.path.join(directory, f"amorsize-core-leases-{user}.json")
+
+
+def _open_lease_file(path: str):
+    """
+    Open the lease file for reading and writing, creating it private to the user.
+
+    Raises:
+        OSError: If the file cannot be opened, is a symlink or belongs to
+            another user
+    """
+    flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0)
+    fd = os.open(path, flags, 0o600)
+    try:
+        if hasattr(os, "getuid") and os.fstat(fd).st_uid != os.getuid():
+            raise PermissionError(f"Lease file {path} belongs to another user")
+        return os.fdopen(fd, "r+")
+    except BaseException:
+        os.close(fd)
+        raise
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process is still running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class CoreLease:
+    """A share of the host's cores held by one job."""
+
+    def __init__(
+        self,
+        coordinator: "CoreCoordinator",
+        lease_id: str,
+        requested: int,
+        cores: int
+    ):
+        self.coordinator = coordinator
+        self.lease_id = lease_id
+        self.requested = requested
+        self.cores = cores
+        self.released = False
+
+    def rebalance(self) -> int:
+        """
+        Recompute this lease's fair share as other jobs come and go.
+
+        Returns:
+            The updated number of cores granted, unchanged if the lease
+            file cannot be read
+        """
+        if not self.released:
+            try:
+                self.cores = self.coordinator._update(self.lease_id, self.requested)
+            except OSError:
+                pass
+        return self.cores
+
+    def release(self):
+        """Return the cores to the shared budget."""
+        if not self.released:
+            try:
+                self.coordinator._remove(self.lease_id)
+            except OSError:
+                # Unreadable lease file - the lease is dropped once this
+                # process exits
+                pass
+            self.released = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def __repr__(self):
+        return f"CoreLease(cores={self.cores}, requested={self.requested})"
+
+
+class CoreCoordinator:
+    """
+    Opt-in coordinator that hands out core leases to jobs on the same host.
+
+    Leases are stored in a JSON file private to the user (see
+    default_lease_path()) guarded by an fcntl lock, so independent Python
+    processes calling optimize() share the physical cores instead of each
+    assuming all of them. If the file cannot be opened, optimize() and
+    execute() run without coordination. Leases
+    of processes that exited are dropped automatically. Nested calls within
+    one process take leases of their own and so see the remaining budget.
+    Without fcntl (Windows) leases are only coordinated within the process.
+
+    A lease is granted its fair share, but never more than the cores the
+    other leases do not hold, so the grants never exceed the budget. A
+    job arriving while the budget is taken is granted 0 cores at first.
+    rebalance() shrinks larger leases back to their fair share and lets
+    smaller ones take the cores that were freed; execute() calls it every
+    REBALANCE_INTERVAL seconds and keeps as many workers busy as its
+    lease allows.
+
+    Example:
+        >>> coordinator = enable_coordination()
+        >>> results = execute(func, data)   # acquires and releases a lease
+    """
+
+    def __init__(
+        self,
+        total_cores: Optional[int] = None,
+        lease_path: Optional[str] = None
+    ):
+        self.total_cores = total_cores or get_physical_cores()
+        self.lease_path = lease_path or default_lease_path()
+        self._thread_lock = threading.Lock()
+        self._own_leases: Dict[str, CoreLease] = {}
+        atexit.register(self._release_all)
+
+    def _transact(self, update):
+        """Read the lease table, apply update(table) and write it back under the lock."""
+        with self._thread_lock:
+            with _open_lease_file(self.lease_path) as f:
+                if HAS_FCNTL:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        table = json.loads(f.read() or "{}")
+                    except ValueError:
+                        table = {}
+                    # Drop leases whose process has exited
+                    table = {
+                        key: lease for key, lease in table.items()
+                        if _pid_alive(lease["pid"])
+                    }
+                    value = update(table)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(table))
+                    f.flush()
+                    return value
+                finally:
+                    if HAS_FCNTL:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _share(self, table: dict, lease_id: str, requested: int) -> int:
+        """Fair share for a lease, capped by the cores other leases still hold."""
+        requests = {key: lease["requested"] for key, lease in table.items()}
+        requests[lease_id] = requested
+        held = sum(lease["cores"] for key, lease in table.items() if key != lease_id)
+        free = max(0, self.total_cores - held)
+        return min(requested, fair_shares(requests, self.total_cores)[lease_id], free)
+
+    def _update(self, lease_id: str, requested: int) -> int:
+        def update(table):
+            cores = self._share(table, lease_id, requested)
+            table[lease_id] = {"pid": os.getpid(), "requested": requested, "cores": cores}
+            return cores
+        return self._transact(update)
+
+    def _remove(self, lease_id: str):
+        def update(table):
+            table.pop(lease_id, None)
+        self._transact(update)
+        self._own_leases.pop(lease_id, None)
+
+    def available(self, requested: Optional[int] = None) -> int:
+        """
+        Cores a new job would be granted right now, without taking a lease.
+
+        Args:
+            requested: Cores the job would ask for (default: all cores)
+
+        Returns:
+            Number of cores, 0 if all cores are held by other leases
+
+        Raises:
+            OSError: If the lease file cannot be opened
+        """
+        requested = requested or self.total_cores
+        return self._transact(lambda table: self._share(table, "pending", requested))
+
+    def acquire(self, requested: int) -> CoreLease:
+        """
+        Take a lease on a fair share of the cores.
+
+        Args:
+            requested: Number of cores the job would like
+
+        Returns:
+            A CoreLease; use it as a context manager or call release()
+
+        Raises:
+            OSError: If the lease file cannot be opened
+        """
+        requested = max(1, requested)
+        lease_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        cores = self._update(lease_id, requested)
+        lease = CoreLease(self, lease_id, requested, cores)
+        self._own_leases[lease_id] = lease
+        return lease
+
+    def leases(self) -> Dict[str, dict]:
+        """
+        Snapshot of all live leases on the host.
+
+        Returns:
+            Mapping of lease id to {"pid", "requested", "cores"}
+        """
+        return self._transact(lambda table: dict(table))
+
+    def _release_all(self):
+        # Forked children inherit the registry but do not own the leases
+        prefix = f"{os.getpid()}-"
+        for lease in list(self._own_leases.values()):
+            if not lease.lease_id.startswith(prefix):
+                continue
+            try:
+                lease.release()
+            except OSError:
+                pass
+
+
+_default_coordinator: Optional[CoreCoordinator] = None
+
+
+def enable_coordination(
+    total_cores: Optional[int] = None,
+    lease_path: Optional[str] = None
+) -> CoreCoordinator:
+    """
+    Opt in to host-wide core coordination for optimize() and execute().
+
+    Args:
+        total_cores: Cores to share (default: physical cores)
+        lease_path: Lease file shared by all participating processes
+
+    Returns:
+        The CoreCoordinator used by default from now on
+    """
+    global _default_coordinator
+    _default_coordinator = CoreCoordinator(total_cores, lease_path)
+    return _default_coordinator
+
+
+def disable_coordination():
+    """Stop using a default coordinator."""
+    global _default_coordinator
+    _default_coordinator = None
+
+
+def get_coordinator() -> Optional[CoreCoordinator]:
+    """
+    Get the default coordinator, if coordination has been enabled.
+
+    Returns:
+        The CoreCoordinator, or None
+    """
+    return _default_coordinator
@@ -0,0 +1,131 @@
+"""
+Cost model module for fitting simple performance models to sampled timings.
+"""
+
+import math
+from typing import Sequence, Tuple
+
+
+def fit_linear(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float]:
+    """
+    Fit y = intercept + slope * x using ordinary least squares.
+
+    Args:
+        xs: Independent variable samples
+        ys: Dependent variable samples (same length as xs)
+
+    Returns:
+        Tuple of (intercept, slope). With a single distinct x value the
+        slope is taken through the origin.
+    """
+    n = len(xs)
+    if n == 0 or n != len(ys):
+        return 0.0, 0.0
+
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+
+    if var_x == 0:
+        # All samples at the same point - fall back to a proportional model
+        slope = mean_y / mean_x if mean_x else 0.0
+        return 0.0, slope
+
+    cov_xy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    slope = cov_xy / var_x
+    intercept = mean_y - slope * mean_x
+    return intercept, slope
+
+
+def predict_linear(model: Tuple[float, float], x: float) -> float:
+    """
+    Evaluate a linear model produced by fit_linear.
+
+    Args:
+        model: Tuple of (intercept, slope)
+        x: Point at which to evaluate the model
+
+    Returns:
+        Predicted value
+    """
+    intercept, slope = model
+    return intercept + slope * x
+
+
+def fit_power_law(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float]:
+    """
+    Fit y = coefficient * x ** exponent by least squares in log-log space.
+
+    Args:
+        xs: Independent variable samples; non-positive points are ignored
+        ys: Dependent variable samples (same length as xs)
+
+    Returns:
+        Tuple of (coefficient, exponent), or (0.0, 0.0) if fewer than one
+        positive point remains
+    """
+    points = [(x, y) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if not points:
+        return 0.0, 0.0
+    log_intercept, exponent = fit_linear(
+        [math.log(x) for x, _ in points], [math.log(y) for _, y in points]
+    )
+    return math.exp(log_intercept), exponent
+
+
+def predict_power_law(model: Tuple[float, float], x: float) -> float:
+    """
+    Evaluate a power-law model produced by fit_power_law.
+
+    Args:
+        model: Tuple of (coefficient, exponent)
+        x: Point at which to evaluate the model
+
+    Returns:
+        Predicted value (0 for non-positive x)
+    """
+    coefficient, exponent = model
+    if x <= 0:
+        return 0.0
+    return coefficient * x ** exponent
+
+
+def fit_scaling_model(xs: Sequence[float], ys: Sequence[float]) -> Tuple[str, float, float]:
+    """
+    Fit both a linear and a power-law model and keep the one with the smaller squared error.
+
+    Args:
+        xs: Independent variable samples (e.g. item sizes)
+        ys: Dependent variable samples (e.g. item times)
+
+    Returns:
+        Tuple of ("linear", intercept, slope) or ("power", coefficient, exponent)
+    """
+    linear = fit_linear(xs, ys)
+    power = fit_power_law(xs, ys)
+
+    def squared_error(predict, model):
+        return sum((predict(model, x) - y) ** 2 for x, y in zip(xs, ys))
+
+    if power != (0.0, 0.0) and (
+        squared_error(predict_power_law, power) < squared_error(predict_linear, linear)
+    ):
+        return ("power",) + power
+    return ("linear",) + linear
+
+
+def predict_scaling_model(model: Tuple[str, float, float], x: float) -> float:
+    """
+    Evaluate a model produced by fit_scaling_model.
+
+    Args:
+        model: Tuple of (kind, parameter, parameter)
+        x: Point at which to evaluate the model
+
+    Returns:
+        Predicted value, never negative
+    """
+    kind, first, second = model
+    if kind == "power":
+        return predict_power_law((first, second), x)
+    return max(0.0, predict_linear((first, second), x))
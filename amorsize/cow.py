@@ -0,0 +1,195 @@
+"""
+Copy-on-write module for keeping forked workers from duplicating the parent's heap.
+"""
+
+import gc
+import multiprocessing
+import weakref
+from contextlib import contextmanager
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, Iterator, MutableMapping, Optional
+
+# Generation-2 threshold that keeps automatic full collections from running
+GEN2_DISABLED_THRESHOLD = 1_000_000_000
+
+# Probed share of the parent's memory a worker copies, keyed by freeze_heap
+_cow_shares: Dict[bool, float] = {}
+
+
+def is_fork_start() -> bool:
+    """
+    Check whether new pools fork their workers.
+
+    The start method is only read, not fixed, so the application can
+    still call multiprocessing.set_start_method() afterwards.
+
+    Returns:
+        True if the multiprocessing start method is "fork"
+    """
+    method = multiprocessing.get_start_method(allow_none=True)
+    if method is None:
+        # Not set yet - the platform default is listed first
+        method = multiprocessing.get_all_start_methods()[0]
+    return method == "fork"
+
+
+def read_smaps_rollup(pid: str = "self") -> Optional[Dict[str, int]]:
+    """
+    Read the memory summary of a process from /proc/<pid>/smaps_rollup (Linux 4.14+).
+
+    Args:
+        pid: Process id, or "self"
+
+    Returns:
+        Mapping of field (e.g. "Rss", "Private_Dirty") to bytes, or None
+        if it cannot be read
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    except (OSError, ValueError):
+        return None
+    return fields or None
+
+
+def unique_memory(smaps: Dict[str, int]) -> int:
+    """
+    Unique set size (USS): memory that only this process holds.
+
+    Args:
+        smaps: Fields from read_smaps_rollup
+
+    Returns:
+        Private clean and dirty memory in bytes
+    """
+    return smaps.get("Private_Clean", 0) + smaps.get("Private_Dirty", 0)
+
+
+@contextmanager
+def frozen_heap(enabled: bool = True) -> Iterator[None]:
+    """
+    Freeze the garbage collector's view of the heap while workers are forked.
+
+    Objects alive on entry are moved to the permanent generation
+    (gc.freeze()), so collections in the forked workers never traverse,
+    and therefore never write to, the pages they share with the parent.
+    The parent unfreezes on exit. Does nothing unless workers are forked.
+
+    Args:
+        enabled: Set to False to make this a no-op
+    """
+    if not enabled or not is_fork_start():
+        yield
+        return
+    # Collect first so garbage is not frozen along with live objects
+    gc.collect()
+    gc.freeze()
+    try:
+        yield
+    finally:
+        gc.unfreeze()
+
+
+class _GCWorkerInitializer:
+    """Worker initializer that disables automatic full collections, then runs the user's."""
+
+    def __init__(self, initializer: Optional[Callable[..., Any]]):
+        self.initializer = initializer
+
+    def __call__(self, *initargs):
+        threshold0, threshold1, _ = gc.get_threshold()
+        gc.set_threshold(threshold0, threshold1, GEN2_DISABLED_THRESHOLD)
+        if self.initializer is not None:
+            self.initializer(*initargs)
+
+
+# Wrappers handed out, kept only while a pool (or caller) still holds them,
+# so lambdas and closures are not kept alive once their pools are gone
+_gc_initializers: MutableMapping[Optional[Callable[..., Any]], _GCWorkerInitializer] = weakref.WeakValueDictionary()
+
+
+def gc_worker_initializer(initializer: Optional[Callable[..., Any]] = None) -> _GCWorkerInitializer:
+    """
+    Wrap a Pool initializer so workers also stop automatic generation-2 collections.
+
+    The same wrapper is returned for the same initializer for as long as
+    it is in use, so warm pools in a PoolManager are still matched and
+    reused.
+
+    Args:
+        initializer: Per-worker setup function to run afterwards, or None
+
+    Returns:
+        Initializer taking the same initargs
+    """
+    wrapper = _gc_initializers.get(initializer)
+    if wrapper is None:
+        wrapper = _GCWorkerInitializer(initializer)
+        _gc_initializers[initializer] = wrapper
+    return wrapper
+
+
+def _probe_worker() -> Optional[int]:
+    """Run a full collection, as a long-lived worker eventually does, and report the USS."""
+    gc.collect()
+    smaps = read_smaps_rollup()
+    return unique_memory(smaps) if smaps else None
+
+
+def probe_cow_share(freeze_heap: bool = False, refresh: bool = False) -> Optional[float]:
+    """
+    Measure the share of this process's memory a forked worker ends up copying.
+
+    Forks one worker, has it run a full garbage collection and compares
+    its unique memory (USS) with this process's resident size. Without
+    freezing, the collection writes to every tracked object and so copies
+    most of the heap; with freeze_heap the frozen objects are skipped.
+    The result is cached per process.
+
+    Args:
+        freeze_heap: Probe a worker forked under frozen_heap()
+        refresh: Probe again instead of returning the cached share
+
+    Returns:
+        Share in [0, 1], or None when workers are not forked or
+        /proc/<pid>/smaps_rollup is unavailable
+    """
+    if freeze_heap in _cow_shares and not refresh:
+        return _cow_shares[freeze_heap]
+    if not is_fork_start():
+        return None
+    parent = read_smaps_rollup()
+    if not parent or not parent.get("Rss"):
+        return None
+
+    initializer = gc_worker_initializer() if freeze_heap else None
+    with frozen_heap(freeze_heap):
+        pool = Pool(processes=1, initializer=initializer)
+    try:
+        worker_uss = pool.apply(_probe_worker)
+    finally:
+        pool.terminate()
+        pool.join()
+    if worker_uss is None:
+        return None
+
+    share = min(1.0, worker_uss / parent["Rss"])
+    _cow_shares[freeze_heap] = share
+    return share
+
+
+def get_cow_share(freeze_heap: bool = False) -> Optional[float]:
+    """
+    Get the probed copy-on-write share without probing.
+
+    Args:
+        freeze_heap: Whether workers are forked under frozen_heap()
+
+    Returns:
+        The cached share from probe_cow_share(), or None
+    """
+    return _cow_shares.get(freeze_heap)
@@ -0,0 +1,453 @@
+"""
+Executor module for running a workload with optimized parallelization parameters.
+"""
+
+import threading
+import time
+import warnings
+import weakref
+from collections import deque
+from collections.abc import Sequence
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterator, List, MutableMapping, Optional, Tuple, Union
+
+from .arguments import bind_kwargs, call_with_args
+from .optimizer import optimize, OptimizationResult
+from .cost_model import predict_linear
+from .pool_manager import BACKENDS, PoolManager
+from .coordinator import REBALANCE_INTERVAL, CoreCoordinator, CoreLease, get_coordinator
+from .cow import frozen_heap, gc_worker_initializer
+from .scheduling import guided_chunk_sizes, iter_chunks, lpt_partition
+from .watchdog import MemoryWatchdog
+
+
+def execute(
+    func: Callable[..., Any],
+    data: Union[List, Iterator],
+    sample_size: int = 5,
+    target_chunk_duration: float = 0.2,
+    verbose: bool = False,
+    starmap: bool = False,
+    func_kwargs: Optional[Dict[str, Any]] = None,
+    result: Optional[OptimizationResult] = None,
+    pool_manager: Optional[PoolManager] = None,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: Tuple = (),
+    coordinator: Optional[CoreCoordinator] = None,
+    cost_hint: Optional[Callable[[Any], float]] = None,
+    watchdog: Union[bool, MemoryWatchdog, None] = None,
+    freeze_heap: bool = False,
+    install_function: bool = False,
+    max_overhead: Optional[float] = None,
+    max_optimize_time: Optional[float] = None
+) -> List[Any]:
+    """
+    Optimize and run func over data, in parallel when it is beneficial.
+
+    Data that is not a sequence - iterators, generators, sets, dict views -
+    is materialized into a list once first, so the items consumed by the
+    dry run are not lost and chunks can be built by index. So is a deque,
+    whose indexing is linear.
+
+    Args:
+        func: The function to run. Must accept a single argument, or one
+            argument per tuple element when starmap is True.
+        data: Iterable of input data
+        sample_size: Number of items to sample for timing (default: 5)
+        target_chunk_duration: Target duration per chunk in seconds (default: 0.2)
+        verbose: If True, print detailed information
+        starmap: If True, call func(*item) like Pool.starmap (default: False)
+        func_kwargs: Keyword arguments passed to every call (default: None)
+        result: A previous OptimizationResult to reuse instead of optimizing
+        pool_manager: PoolManager to borrow a warm pool from instead of
+            creating and tearing down a Pool for this call
+        initializer: Per-worker setup function, as for Pool(initializer=...).
+            Run once in this process when execution is serial.
+        initargs: Arguments for initializer (default: ())
+        coordinator: CoreCoordinator to lease cores from for the duration
+            of the run (default: the one set by enable_coordination(), if any).
+            The lease is rebalanced every REBALANCE_INTERVAL seconds, and
+            the number of chunks running at once follows its share.
+        cost_hint: Cheap function predicting an item's cost. Items are then
+            split into chunks of balanced predicted cost, most expensive
+            first, and results are returned in input order.
+        watchdog: MemoryWatchdog (or True for a default one) that pauses
+            chunk submission while memory is low or under pressure. Chunks
+            are then submitted one at a time, at most one per worker. A
+            pause longer than its max_pause issues a RuntimeWarning, and
+            the run continues with one chunk at a time.
+        freeze_heap: Fork workers under gc.freeze() and disable automatic
+            generation-2 collections in them, so they do not copy the
+            parent's heap by garbage collecting it (fork start method only)
+        install_function: Send the function to each worker once, through
+            the pool initializer, instead of pickling it into every chunk.
+            Worth it for bound methods, functools.partial objects and
+            closures carrying large state (process backend only). The
+            function becomes part of the pool's setup, so it cannot be
+            combined with a pool_manager, whose warm pools are shared
+        max_overhead: Largest acceptable share of a chunk's time spent on
+            dispatch; the chunk duration is then derived from the measured
+            dispatch overhead of this host (see optimize())
+        max_optimize_time: Time budget in seconds for the analysis before
+            running (see optimize())
+
+    Returns:
+        List of results in input order
+
+    Raises:
+        ValueError: If install_function is combined with a pool_manager
+
+    Example:
+        >>> def power(base, exponent, modulo=None):
+        ...     return pow(base, exponent, modulo)
+        >>> results = execute(power, zip_args(bases, exponents), starmap=True,
+        ...                   func_kwargs={"modulo": 97})
+    """
+    if install_function and pool_manager is not None:
+        # A pool set up for one function object could never be reused, and
+        # would keep the function alive until it is reaped
+        raise ValueError("install_function cannot be combined with a pool_manager")
+    if not isinstance(data, Sequence) or isinstance(data, deque):
+        data = list(data)
+
+    if result is None:
+        result = optimize(
+            func,
+            data,
+            sample_size=sample_size,
+            target_chunk_duration=target_chunk_duration,
+            verbose=verbose,
+            starmap=starmap,
+            func_kwargs=func_kwargs,
+            pool_manager=pool_manager,
+            initializer=initializer,
+            initargs=initargs,
+            coordinator=coordinator,
+            cost_hint=cost_hint,
+            freeze_heap=freeze_heap,
+            install_function=install_function,
+            max_overhead=max_overhead,
+            max_optimize_time=max_optimize_time
+        )
+
+    call = bind_kwargs(func, func_kwargs)
+
+    costs = None
+    if result.schedule == "lpt" and cost_hint is not None and result.cost_model is not None:
+        costs = [predict_linear(result.cost_model, cost_hint(item)) for item in data]
+
+    if result.n_jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [call_with_args(call, item, starmap) for item in data]
+
+    if watchdog is True:
+        watchdog = MemoryWatchdog()
+    owns_watchdog = watchdog is not None and not watchdog.running
+    if owns_watchdog:
+        watchdog.start()
+    try:
+        coordinator = coordinator or get_coordinator()
+        lease = None
+        if coordinator is not None:
+            try:
+                lease = coordinator.acquire(result.n_jobs)
+            except OSError:
+                # The lease file cannot be used - run uncoordinated
+                pass
+        if lease is None:
+            return _run_parallel(
+                call, data, result.n_jobs, result.chunksize, starmap,
+                pool_manager, initializer, initargs, result.schedule, costs,
+                watchdog, freeze_heap, result.backend, install_function
+            )
+
+        # Hold a lease on our share of the cores until the run completes.
+        # The pool has the planned size and the lease caps how many of its
+        # workers are busy, so the job grows and shrinks with its share.
+        with lease:
+            return _run_parallel(
+                call, data, result.n_jobs, result.chunksize, starmap,
+                pool_manager, initializer, initargs, result.schedule, costs,
+                watchdog, freeze_heap, result.backend, install_function, lease
+            )
+    finally:
+        if owns_watchdog:
+            watchdog.stop()
+
+
+def _run_parallel(
+    call: Callable[..., Any],
+    data: Union[List, Iterator],
+    n_jobs: int,
+    chunksize: int,
+    starmap: bool,
+    pool_manager: Optional[PoolManager],
+    initializer: Optional[Callable[..., Any]],
+    initargs: Tuple,
+    schedule: str = "static",
+    costs: Optional[List[float]] = None,
+    watchdog: Optional[MemoryWatchdog] = None,
+    freeze_heap: bool = False,
+    backend: str = "process",
+    install_function: bool = False,
+    lease: Optional[CoreLease] = None
+) -> List[Any]:
+    """Run call over data on a warm or freshly created pool."""
+    if install_function and backend == "process":
+        # Workers receive the function once, as an initializer argument,
+        # and every chunk only carries a reference to it
+        initializer = _function_installer(initializer)
+        initargs = (call,) + tuple(initargs)
+        call = _InstalledCall()
+    if freeze_heap:
+        # Workers also skip the full collections that would touch shared pages
+        initializer = gc_worker_initializer(initializer)
+    if watchdog is not None or lease is not None:
+        return _run_watched(
+            call, data, n_jobs, chunksize, starmap, pool_manager,
+            initializer, initargs, schedule, costs, watchdog, freeze_heap, backend, lease
+        )
+    with _open_pool(n_jobs, pool_manager, initializer, initargs, freeze_heap, backend) as pool:
+        return _run_on_pool(pool, call, data, chunksize, starmap, schedule, n_jobs, costs)
+
+
+# Function installed in this worker process by _FunctionInstaller
+_installed_call: Optional[Callable[..., Any]] = None
+
+
+class _FunctionInstaller:
+    """Worker initializer that stores the function in the worker, then runs the user's."""
+
+    def __init__(self, initializer: Optional[Callable[..., Any]]):
+        self.initializer = initializer
+
+    def __call__(self, call: Callable[..., Any], *initargs):
+        global _installed_call
+        _installed_call = call
+        if self.initializer is not None:
+            self.initializer(*initargs)
+
+
+# Installers handed out, kept only while a pool still holds them
+_installers: MutableMapping[Optional[Callable[..., Any]], _FunctionInstaller] = weakref.WeakValueDictionary()
+
+
+def _function_installer(initializer: Optional[Callable[..., Any]]) -> _FunctionInstaller:
+    """Installer wrapping an initializer - the same one while in use, so warm pools match."""
+    installer = _installers.get(initializer)
+    if installer is None:
+        installer = _FunctionInstaller(initializer)
+        _installers[initializer] = installer
+    return installer
+
+
+class _InstalledCall:
+    """Picklable stand-in for the function installed in the worker."""
+
+    def __call__(self, *args, **kwargs):
+        return _installed_call(*args, **kwargs)
+
+
+@contextmanager
+def _open_pool(
+    n_jobs: int,
+    pool_manager: Optional[PoolManager],
+    initializer: Optional[Callable[..., Any]],
+    initargs: Tuple,
+    freeze_heap: bool = False,
+    backend: str = "process"
+) -> Iterator:
+    """Borrow a warm pool from the manager, or create one for this block."""
+    with ExitStack() as stack:
+        # Only the fork itself needs the frozen heap
+        with frozen_heap(freeze_heap):
+            if pool_manager is not None:
+                pool = stack.enter_context(
+                    pool_manager.pool(
+                        n_jobs, backend=backend, initializer=initializer, initargs=initargs
+                    )
+                )
+            else:
+                pool = stack.enter_context(
+                    BACKENDS[backend](processes=n_jobs, initializer=initializer, initargs=initargs)
+                )
+        yield pool
+
+
+class _ChunkRunner:
+    """Picklable worker task that maps call over one chunk of items."""
+
+    def __init__(self, call: Callable[..., Any], starmap: bool):
+        self.call = call
+        self.starmap = starmap
+
+    def __call__(self, chunk: List[Any]) -> List[Any]:
+        return [call_with_args(self.call, item, self.starmap) for item in chunk]
+
+
+def _run_on_pool(
+    pool,
+    call: Callable[..., Any],
+    data: Union[List, Iterator],
+    chunksize: int,
+    starmap: bool,
+    schedule: str = "static",
+    n_jobs: int = 1,
+    costs: Optional[List[float]] = None
+) -> List[Any]:
+    """Map call over data on an open pool."""
+    if schedule == "lpt" and costs is not None:
+        # Chunks of balanced predicted cost, most expensive first; results
+        # are put back in input order
+        partition = lpt_partition(costs, -(-len(data) // chunksize))
+        chunks = pool.imap(
+            _ChunkRunner(call, starmap),
+            ([data[index] for index in indices] for indices in partition)
+        )
+        results = [None] * len(data)
+        for indices, chunk_results in zip(partition, chunks):
+            for index, value in zip(indices, chunk_results):
+                results[index] = value
+        return results
+    if schedule == "guided":
+        # Decreasing chunks, taken in order by whichever worker is free
+        sizes = guided_chunk_sizes(len(data), n_jobs, chunksize)
+        chunks = pool.imap(_ChunkRunner(call, starmap), iter_chunks(data, sizes))
+        return [result for chunk in chunks for result in chunk]
+    # Static and dynamic schedules differ only in chunk size - Pool.map
+    # already hands each chunk to the next free worker
+    if starmap:
+        return pool.starmap(call, data, chunksize=chunksize)
+    return pool.map(call, data, chunksize=chunksize)
+
+
+def _chunk_indices(
+    total_items: int,
+    chunksize: int,
+    schedule: str,
+    n_jobs: int,
+    costs: Optional[List[float]]
+) -> List[List[int]]:
+    """Item indices of each chunk, in submission order, for a schedule."""
+    if schedule == "lpt" and costs is not None:
+        return lpt_partition(costs, -(-total_items // chunksize))
+    if schedule == "guided":
+        sizes = guided_chunk_sizes(total_items, n_jobs, chunksize)
+    else:
+        sizes = chunksize
+    return list(iter_chunks(range(total_items), sizes))
+
+
+def _run_watched(
+    call: Callable[..., Any],
+    data: Union[List, Iterator],
+    n_jobs: int,
+    chunksize: int,
+    starmap: bool,
+    pool_manager: Optional[PoolManager],
+    initializer: Optional[Callable[..., Any]],
+    initargs: Tuple,
+    schedule: str,
+    costs: Optional[List[float]],
+    watchdog: Optional[MemoryWatchdog],
+    freeze_heap: bool = False,
+    backend: str = "process",
+    lease: Optional[CoreLease] = None
+) -> List[Any]:
+    """
+    Map call over data one chunk per free worker, pausing under memory pressure.
+
+    While the watchdog reports pressure no new chunks are submitted. With
+    retire_workers the running chunks are drained and the pool is shut
+    down until the pressure clears, then a new pool takes the remaining
+    chunks. Once a pause outlasts watchdog.max_pause a RuntimeWarning is
+    issued and the run continues with one chunk at a time. With a core lease, at most lease.cores chunks (but at least
+    one) run at once, and the lease is rebalanced every REBALANCE_INTERVAL
+    seconds as other jobs come and go.
+    """
+    partition = _chunk_indices(len(data), chunksize, schedule, n_jobs, costs)
+    runner = _ChunkRunner(call, starmap)
+    results = [None] * len(data)
+
+    def collect(indices, async_result):
+        for index, value in zip(indices, async_result.get()):
+            results[index] = value
+
+    # Set by each chunk as it completes, so the loop wakes on whichever
+    # chunk finishes first
+    finished = threading.Event()
+
+    def notify(_):
+        finished.set()
+
+    warned = []
+
+    def under_pressure():
+        """True while submission is paused - not after a pause outlasts its limit."""
+        if watchdog is None or not watchdog.under_pressure:
+            return False
+        if not watchdog.pause_exceeded:
+            return True
+        if not warned:
+            warned.append(True)
+            warnings.warn(
+                f"Memory pressure has lasted over {watchdog.max_pause}s - "
+                f"continuing with one chunk at a time",
+                RuntimeWarning
+            )
+        return False
+
+    def busy_limit():
+        """Chunks that may run at once: the pool size, or the lease's share of it."""
+        if watchdog is not None and watchdog.pause_exceeded:
+            return 1
+        if lease is None:
+            return n_jobs
+        return min(n_jobs, max(1, lease.cores))
+
+    poll_interval = watchdog.interval if watchdog is not None else REBALANCE_INTERVAL
+    if lease is not None:
+        poll_interval = min(poll_interval, REBALANCE_INTERVAL)
+    next_rebalance = time.monotonic() + REBALANCE_INTERVAL
+
+    position = 0
+    while position < len(partition):
+        while under_pressure():
+            watchdog.wait(poll_interval)
+        retired = False
+        with _open_pool(
+            n_jobs, pool_manager, initializer, initargs, freeze_heap, backend
+        ) as pool:
+            pending = []
+            while pending or position < len(partition):
+                finished.clear()
+                for entry in [entry for entry in pending if entry[1].ready()]:
+                    pending.remove(entry)
+                    collect(*entry)
+                if lease is not None and time.monotonic() >= next_rebalance:
+                    lease.rebalance()
+                    next_rebalance = time.monotonic() + REBALANCE_INTERVAL
+                if under_pressure() and watchdog.retire_workers and position < len(partition):
+                    # Let the running chunks finish, then give back the workers
+                    for entry in pending:
+                        collect(*entry)
+                    retired = True
+                    break
+                if position < len(partition) and len(pending) < busy_limit() and not under_pressure():
+                    indices = partition[position]
+                    position += 1
+                    pending.append(
+                        (indices, pool.apply_async(
+                            runner, ([data[index] for index in indices],),
+                            callback=notify, error_callback=notify
+                        ))
+                    )
+                elif pending:
+                    finished.wait(poll_interval)
+                elif under_pressure():
+                    watchdog.wait(poll_interval)
+        if retired and pool_manager is not None:
+            # Only the pool this run borrowed - other warm pools stay up
+            pool_manager.retire(pool)
+    return results
@@ -0,0 +1,191 @@
+"""
+Memory model module for estimating the footprint of a parallel map.
+"""
+
+from typing import Optional
+
+from .system_info import get_available_memory
+from .cow import get_cow_share, is_fork_start
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+# Memory of a worker's interpreter and imports, charged to spawned and frozen-heap workers (50MB)
+DEFAULT_WORKER_BASELINE = 50 * 1024 * 1024
+
+# Recommend imap once the collected results would take this share of available RAM
+IMAP_RESULT_SHARE = 0.5
+
+
+def get_process_memory() -> int:
+    """
+    Get the resident memory of the current process.
+
+    Returns:
+        Resident set size in bytes, or 0 if it cannot be read
+    """
+    if HAS_PSUTIL:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def get_worker_baseline_memory(freeze_heap: bool = False) -> int:
+    """
+    Estimate the memory a worker holds before it processes any item.
+
+    A spawned worker starts a fresh interpreter that imports its modules
+    but does not hold this process's data: its baseline is
+    DEFAULT_WORKER_BASELINE, the size of an interpreter with its imports.
+    A forked worker shares this process's pages until it writes to them.
+    Once probe_cow_share() has measured how much of this process a forked
+    worker ends up copying, that share of the resident size is charged.
+    Without a probe, a worker forked under frozen_heap() is charged the
+    interpreter baseline, while an unfrozen one is charged the whole
+    resident size, since its full collections write to every tracked
+    object and so eventually copy the heap.
+
+    Args:
+        freeze_heap: Whether workers are forked under frozen_heap()
+
+    Returns:
+        Baseline memory per worker in bytes
+    """
+    share = None
+    if is_fork_start():
+        share = get_cow_share(freeze_heap)
+        if share is None and not freeze_heap:
+            share = 1.0
+    if share is not None:
+        resident = get_process_memory()
+        if resident:
+            return int(resident * share)
+    return DEFAULT_WORKER_BASELINE
+
+
+class MemoryEstimate:
+    """Predicted memory footprint of a parallel map."""
+
+    def __init__(
+        self,
+        n_jobs: int,
+        worker_baseline: int,
+        init_memory: int,
+        item_memory: int,
+        chunk_buffers: int,
+        parent_in_flight: int,
+        parent_results: int
+    ):
+        self.n_jobs = n_jobs
+        self.worker_baseline = worker_baseline
+        self.init_memory = init_memory
+        self.item_memory = item_memory
+        self.chunk_buffers = chunk_buffers
+        self.parent_in_flight = parent_in_flight
+        self.parent_results = parent_results
+
+    @property
+    def per_worker(self) -> int:
+        """Bytes held by one worker: baseline, initializer state, one item and its chunk."""
+        return self.worker_baseline + self.init_memory + self.item_memory + self.chunk_buffers
+
+    @property
+    def parent(self) -> int:
+        """Bytes held by the parent: chunks in flight and the collected results."""
+        return self.parent_in_flight + self.parent_results
+
+    @property
+    def total(self) -> int:
+        """Bytes held by all workers and the parent together."""
+        return self.n_jobs * self.per_worker + self.parent
+
+    def __repr__(self):
+        return (
+            f"MemoryEstimate(n_jobs={self.n_jobs}, per_worker={self.per_worker}, "
+            f"parent={self.parent}, total={self.total})"
+        )
+
+    def __str__(self):
+        mb = 1024 * 1024
+        return (
+            f"{self.total / mb:.1f}MB total: {self.n_jobs} workers x "
+            f"{self.per_worker / mb:.1f}MB + {self.parent / mb:.1f}MB in the parent"
+        )
+
+
+def estimate_memory(
+    n_jobs: int,
+    chunksize: int,
+    total_items: int,
+    item_memory: int,
+    input_size: int,
+    return_size: int,
+    init_memory: int = 0,
+    worker_baseline: Optional[int] = None,
+    collect_results: bool = True,
+    freeze_heap: bool = False
+) -> MemoryEstimate:
+    """
+    Estimate the memory footprint of mapping a function over the data.
+
+    Each worker holds its interpreter baseline, what the initializer keeps,
+    the peak memory of the item it is processing, and the arguments and
+    accumulated results of its current chunk. The parent holds a chunk of
+    arguments and results in flight per worker and, for Pool.map, every
+    result until the map completes.
+
+    Args:
+        n_jobs: Number of workers
+        chunksize: Items per chunk (the largest chunk for uneven schedules)
+        total_items: Number of items
+        item_memory: Peak memory of processing one item in bytes
+        input_size: Pickled size of one item in bytes
+        return_size: Pickled size of one result in bytes
+        init_memory: Memory kept by the initializer per worker in bytes
+        worker_baseline: Baseline memory per worker in bytes
+            (default: get_worker_baseline_memory())
+        collect_results: False when results are streamed (imap) or reduced
+            so the parent does not keep them all
+        freeze_heap: Whether workers are forked under frozen_heap()
+
+    Returns:
+        MemoryEstimate
+    """
+    if worker_baseline is None:
+        worker_baseline = get_worker_baseline_memory(freeze_heap)
+    chunk_buffers = chunksize * (input_size + return_size)
+    return MemoryEstimate(
+        n_jobs=n_jobs,
+        worker_baseline=worker_baseline,
+        init_memory=init_memory,
+        item_memory=item_memory,
+        chunk_buffers=chunk_buffers,
+        parent_in_flight=n_jobs * chunk_buffers,
+        parent_results=max(0, total_items) * return_size if collect_results else 0
+    )
+
+
+def recommend_imap(parent_results: int, available_memory: Optional[int] = None) -> bool:
+    """
+    Check whether results should be streamed with imap instead of collected.
+
+    Args:
+        parent_results: Bytes of results Pool.map would collect in the parent
+        available_memory: Available RAM in bytes (default: get_available_memory())
+
+    Returns:
+        True if collecting every result would take more than
+        IMAP_RESULT_SHARE of the available memory
+    """
+    if available_memory is None:
+        available_memory = get_available_memory()
+    return parent_results > IMAP_RESULT_SHARE * available_memory
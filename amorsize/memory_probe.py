@@ -0,0 +1,104 @@
+"""
+Memory probe module for measuring allocations without disturbing other tracemalloc users.
+"""
+
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+# Guards starting and stopping probes - tracemalloc's session and peak are
+# process-wide. Held only for that bookkeeping, never while the probed code
+# runs, so probes in different threads overlap.
+_probe_lock = threading.Lock()
+
+# Probes currently open, in any thread, oldest first
+_active_probes: List["MemoryProbe"] = []
+
+# Whether the running tracemalloc session was started by a probe, and so is
+# stopped when the last probe ends
+_owns_session = False
+
+
+class MemoryProbe:
+    """Memory allocated inside a trace_memory() block, relative to its start."""
+
+    def __init__(self, baseline: int, start_peak: int):
+        self.baseline = baseline
+        # tracemalloc's peak when the probe started - only a peak above it
+        # was reached inside the block
+        self.start_peak = start_peak
+        # Final readings, set when the block exits
+        self.current = 0
+        self.peak = 0
+        # Highest peak seen before a nested probe reset tracemalloc's peak
+        self._peak_seen = 0
+
+    def get_traced_memory(self) -> Tuple[int, int]:
+        """
+        Read the memory allocated since the probe started.
+
+        Returns:
+            Tuple of (current, peak) bytes above the baseline
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        # Without reset_peak() (Python < 3.9) a peak that did not rise above
+        # the session's earlier peak is unknown - current is a lower bound
+        block_peak = peak if peak > self.start_peak else current
+        return (
+            max(0, current - self.baseline),
+            max(0, self._peak_seen, block_peak - self.baseline)
+        )
+
+    def _fold_peak(self):
+        """Remember the peak so far before tracemalloc's peak is reset."""
+        self._peak_seen = self.get_traced_memory()[1]
+
+    def __repr__(self):
+        return f"MemoryProbe(current={self.current}, peak={self.peak})"
+
+
+@contextmanager
+def trace_memory() -> Iterator[MemoryProbe]:
+    """
+    Measure the memory allocated in a block with tracemalloc.
+
+    If tracing is already running - started by the application or another
+    probe - the session is reused: the peak is reset with
+    tracemalloc.reset_peak() and readings are taken relative to the memory
+    traced at the start. Python < 3.9 has no reset_peak(); there a peak
+    that stays below the session's earlier peak is reported as the memory
+    held at that moment. Otherwise tracing is started for the block, and
+    stopped once the last open probe ends; an application's session is
+    left running. Probes may be nested and may overlap across threads, as
+    each open probe keeps its peak before another one resets it.
+    tracemalloc is process-wide, so allocations by other threads during a
+    probe are counted too, and their frees can offset the probe's own
+    allocations.
+
+    Yields:
+        MemoryProbe whose current and peak are set when the block exits;
+        probe.get_traced_memory() reads them inside the block
+    """
+    global _owns_session
+    with _probe_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _owns_session = True
+        # Open probes keep their peak; the peak since this reset
+        # (including this block) still counts towards theirs
+        for other in _active_probes:
+            other._fold_peak()
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        probe = MemoryProbe(*tracemalloc.get_traced_memory())
+        _active_probes.append(probe)
+    try:
+        yield probe
+    finally:
+        with _probe_lock:
+            probe.current, probe.peak = probe.get_traced_memory()
+            _active_probes.remove(probe)
+            if _owns_session and not _active_probes:
+                tracemalloc.stop()
+                _owns_session = False
@@ -2,11 +2,42 @@
 Main optimizer module that coordinates the analysis and returns optimal parameters.
 """
 
-from typing import Any, Callable, Iterator, List, Union, Tuple, Optional
+from typing import Any, Callable, Dict, Iterator, List, Union, Tuple, Optional
+import math
+import time
 import warnings
 
-from .system_info import get_physical_cores, get_spawn_cost, calculate_max_workers
-from .sampling import perform_dry_run, estimate_total_items
+from .system_info import (
+    get_physical_cores,
+    get_spawn_cost,
+    get_ipc_cost_per_byte,
+    get_chunk_overhead,
+    get_measured_chunk_overhead,
+    measure_chunk_overhead,
+    calculate_max_workers,
+    CALIBRATION_TASKS,
+)
+from .sampling import perform_dry_run, estimate_total_items, safe_slice_data, sample_item_sizes
+from .cost_model import fit_linear, predict_linear, fit_scaling_model, predict_scaling_model
+from .scheduling import (
+    MAX_DISPATCH_OVERHEAD,
+    SCHEDULES,
+    choose_schedule,
+    min_chunksize_for_overhead,
+    guided_chunk_sizes,
+    lpt_partition,
+)
+from .cow import get_cow_share, is_fork_start, probe_cow_share
+from .memory_model import MemoryEstimate, estimate_memory, recommend_imap
+from .simulator import (
+    MAX_SIMULATED_CHUNKS,
+    SimulationResult,
+    estimate_simulation_time,
+    simulate_plan,
+)
+from .surface import RuntimeSurface, compute_surface, log_spaced_chunksizes
+from .pool_manager import PoolManager
+from .coordinator import CoreCoordinator, get_coordinator
 
 
 class OptimizationResult:
@@ -18,13 +49,39 @@ class OptimizationResult:
         chunksize: int,
         reason: str,
         estimated_speedup: float = 1.0,
-        warnings: List[str] = None
+        warnings: List[str] = None,
+        predicted_time: Optional[float] = None,
+        core_seconds: Optional[float] = None,
+        tail_time: Optional[float] = None,
+        schedule: str = "static",
+        cost_model: Optional[Tuple[float, float]] = None,
+        size_model: Optional[Tuple[str, float, float]] = None,
+        memory_estimate: Optional[MemoryEstimate] = None,
+        use_imap: bool = False,
+        surface: Optional[RuntimeSurface] = None,
+        simulation: Optional[SimulationResult] = None,
+        backend: str = "process",
+        confidence: Optional[float] = None,
+        max_workers: Optional[int] = None
     ):
         self.n_jobs = n_jobs
         self.chunksize = chunksize
         self.reason = reason
         self.estimated_speedup = estimated_speedup
         self.warnings = warnings or []
+        self.predicted_time = predicted_time
+        self.core_seconds = core_seconds
+        self.tail_time = tail_time
+        self.schedule = schedule
+        self.cost_model = cost_model
+        self.size_model = size_model
+        self.memory_estimate = memory_estimate
+        self.use_imap = use_imap
+        self.surface = surface
+        self.simulation = simulation
+        self.backend = backend
+        self.confidence = confidence
+        self.max_workers = max_workers
     
     def __repr__(self):
         return (
@@ -34,20 +91,157 @@ class OptimizationResult:
         )
     
     def __str__(self):
-        result = f"Recommended: n_jobs={self.n_jobs}, chunksize={self.chunksize}\n"
+        result = f"Recommended: n_jobs={self.n_jobs}, chunksize={self.chunksize}"
+        if self.schedule != "static":
+            result += f", schedule={self.schedule}"
+        if self.backend != "process":
+            result += f", backend={self.backend}"
+        result += "\n"
         result += f"Reason: {self.reason}\n"
         result += f"Estimated speedup: {self.estimated_speedup:.2f}x"
+        if self.predicted_time is not None:
+            result += f"\nPredicted time: {self.predicted_time:.2f}s"
+            result += f" ({self.core_seconds:.2f} core-seconds)"
+        if self.confidence is not None:
+            result += f"\nConfidence in the sampled item time: {self.confidence:.0%}"
         if self.warnings:
             result += "\nWarnings:\n" + "\n".join(f"  - {w}" for w in self.warnings)
         return result
 
 
+OBJECTIVES = ("speedup", "deadline", "efficiency")
+
+# Upper bound on the chunks per worker asked for by highly variable workloads
+MAX_CHUNKS_PER_WORKER = 16
+
+# Worker counts whose plans are simulated for the final choice
+SIMULATED_CANDIDATES = 3
+
+# Shipping the function with every chunk is flagged above this share of the run
+FUNCTION_SHIPPING_WARNING_SHARE = 0.05
+
+# Share of max_optimize_time kept for planning after the dry run
+PLANNING_RESERVE = 0.1
+
+# A size model is only trusted when it explains this share of the time variance
+MIN_SIZE_MODEL_R2 = 0.9
+
+
+def fit_size_model(
+    sizes: List[float],
+    times: List[float]
+) -> Optional[Tuple[str, float, float]]:
+    """
+    Fit item time against item size, if the sample shows a real dependency.
+    
+    The sample must span at least a 2x range of positive sizes, the model
+    must explain most of the time variance and predict at least 1.5x more
+    time for the largest sampled item than for the smallest - otherwise
+    the average item time is the better estimate.
+    
+    Args:
+        sizes: Sampled item sizes
+        times: Sampled item times in seconds
+    
+    Returns:
+        A model from fit_scaling_model, or None
+    """
+    points = [(x, t) for x, t in zip(sizes, times) if x > 0]
+    if len(points) < 3:
+        return None
+    xs = [x for x, _ in points]
+    ys = [t for _, t in points]
+    if max(xs) < 2 * min(xs):
+        return None
+    
+    model = fit_scaling_model(xs, ys)
+    mean_y = sum(ys) / len(ys)
+    total_variance = sum((y - mean_y) ** 2 for y in ys)
+    residual = sum((predict_scaling_model(model, x) - y) ** 2 for x, y in points)
+    if total_variance == 0 or 1 - residual / total_variance < MIN_SIZE_MODEL_R2:
+        return None
+    if predict_scaling_model(model, max(xs)) < 1.5 * predict_scaling_model(model, min(xs)):
+        return None
+    return model
+
+
+def chunks_per_worker(time_cv: float) -> int:
+    """
+    Minimum number of chunks each worker should receive.
+    
+    With uniform item times a couple of chunks per worker keep the last
+    round short. More variable items need more, smaller chunks so a slow
+    chunk can be offset by the other workers picking up the rest.
+    
+    Args:
+        time_cv: Coefficient of variation (std / mean) of the per-item time
+    
+    Returns:
+        Minimum chunks per worker
+    """
+    return min(MAX_CHUNKS_PER_WORKER, 2 + math.ceil(4 * time_cv))
+
+
+def estimate_tail_time(
+    total_items: int,
+    chunksize: int,
+    n_jobs: int,
+    avg_time: float,
+    time_cv: float = 0.0
+) -> float:
+    """
+    Estimate the straggler time at the end of a parallel map.
+    
+    Workers take chunks as they become free, so the busiest worker runs
+    ceil(n_chunks / n_jobs) chunks while a perfect split would give each
+    total_items / n_jobs items. Chunk durations also vary with the item
+    times, and the slowest of n_jobs concurrent chunks finishes about
+    sqrt(2 ln n_jobs) standard deviations late.
+    
+    Args:
+        total_items: Number of items
+        chunksize: Items per chunk
+        n_jobs: Number of workers
+        avg_time: Average time per item in seconds
+        time_cv: Coefficient of variation of the per-item time
+    
+    Returns:
+        Seconds beyond the perfectly balanced total time / n_jobs
+    """
+    if n_jobs <= 1 or total_items <= 0:
+        return 0.0
+    n_chunks = -(-total_items // chunksize)
+    busiest_items = min(total_items, -(-n_chunks // n_jobs) * chunksize)
+    imbalance = max(0.0, (busiest_items - total_items / n_jobs) * avg_time)
+    chunk_std = avg_time * time_cv * math.sqrt(chunksize)
+    return imbalance + chunk_std * math.sqrt(2 * math.log(n_jobs))
+
+
 def optimize(
-    func: Callable[[Any], Any],
+    func: Callable[..., Any],
     data: Union[List, Iterator],
     sample_size: int = 5,
     target_chunk_duration: float = 0.2,
-    verbose: bool = False
+    verbose: bool = False,
+    starmap: bool = False,
+    func_kwargs: Optional[Dict[str, Any]] = None,
+    combine: Optional[Callable[[Any, Any], Any]] = None,
+    initial: Any = None,
+    pool_manager: Optional[PoolManager] = None,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: Tuple = (),
+    objective: str = "speedup",
+    deadline: Optional[float] = None,
+    min_efficiency: Optional[float] = None,
+    coordinator: Optional[CoreCoordinator] = None,
+    schedule: str = "auto",
+    cost_hint: Optional[Callable[[Any], float]] = None,
+    freeze_heap: bool = False,
+    return_surface: bool = False,
+    simulate: bool = False,
+    install_function: bool = False,
+    max_overhead: Optional[float] = None,
+    max_optimize_time: Optional[float] = None
 ) -> OptimizationResult:
     """
     Analyze a function and data to determine optimal parallelization parameters.
@@ -56,14 +250,91 @@ def optimize(
     where parallelism is slower than serial execution.
     
     Args:
-        func: The function to parallelize. Must accept a single argument.
-        data: Iterable of input data
+        func: The function to parallelize. Must accept a single argument,
+            or one argument per tuple element when starmap is True.
+        data: Iterable of input data (argument tuples when starmap is True,
+            e.g. from zip_args())
         sample_size: Number of items to sample for timing (default: 5)
         target_chunk_duration: Target duration per chunk in seconds (default: 0.2)
         verbose: If True, print detailed information
+        starmap: If True, call func(*item) like Pool.starmap (default: False)
+        func_kwargs: Keyword arguments passed to every call (default: None)
+        combine: Optional reducer for map-reduce workloads. Workers then
+            send one partial result per chunk instead of every result
+            (see optimize_reduce).
+        initial: Initial accumulator for combine (default: None)
+        pool_manager: PoolManager whose warm pools will run the work. Spawn
+            cost is then only charged for workers that must be started.
+        initializer: Per-worker setup function, as for Pool(initializer=...).
+            Its time and retained memory are measured once and charged to
+            every worker.
+        initargs: Arguments for initializer (default: ())
+        objective: What the plan optimizes (default: "speedup"):
+            "speedup" - minimize wall-clock time;
+            "deadline" - fewest workers that finish within `deadline` seconds;
+            "efficiency" - fastest plan whose parallel efficiency
+            (speedup / n_jobs) stays at or above `min_efficiency`
+        deadline: Time limit in seconds for the "deadline" objective
+        min_efficiency: Efficiency floor in (0, 1] for the "efficiency" objective
+        coordinator: CoreCoordinator sharing the host's cores with other jobs
+            (default: the one set by enable_coordination(), if any). Workers
+            are limited to the share a new lease would currently receive.
+        schedule: Chunk schedule - "static" (equal chunks), "guided"
+            (decreasing chunks, chunksize is the smallest), "dynamic"
+            (small equal chunks) or "lpt" (chunks balanced by predicted
+            cost, needs cost_hint); "auto" uses "lpt" when a cost_hint is
+            given and otherwise chooses from the variation of the sampled
+            item times (default: "auto")
+        cost_hint: Cheap function of an item that predicts its cost, such as
+            a file size or string length. Item times are fitted linearly
+            against it and the fit predicts every item's cost, so the total
+            work and a balanced partition come from the whole dataset.
+        freeze_heap: Plan for workers forked under gc.freeze(), as
+            execute(freeze_heap=True) does. Under fork, a worker is probed
+            once (per setting) to measure how much of this process's memory
+            it ends up copying, and that share is charged as each worker's
+            baseline; freezing keeps it small.
+        return_surface: Also predict the runtime of equal-size chunks for
+            every n_jobs from 1 to the physical cores and a log-spaced range
+            of chunk sizes (result.surface), to show how flat the optimum is
+        simulate: Replay the sampled item times through a discrete-event
+            model of the pool (serial dispatch and result collection in
+            the parent, workers taking chunks as they become free) for the
+            most promising worker counts. The fastest simulated plan is
+            chosen under the "speedup" objective, and the simulated
+            makespan becomes the predicted time (result.simulation).
+        install_function: Plan for workers that receive the function once,
+            through the pool initializer, as execute(install_function=True)
+            does. Its pickling and transfer cost is then charged to worker
+            startup instead of to every chunk.
+        max_overhead: Largest acceptable share of a chunk's time spent on
+            dispatch, e.g. 0.05. The empty-task round trip of a worker is
+            then measured on this host (once per process) and
+            target_chunk_duration is derived from it, replacing the given
+            value (default: None)
+        max_optimize_time: Time budget in seconds for the analysis (default:
+            None, no limit). The dry run gets all but PLANNING_RESERVE of
+            it, and stops as soon as the mean item time is known to within
+            10%, or before the next item would overrun its share. An item
+            still running when the share is spent is abandoned (it finishes
+            in a background thread) and its time so far is used as a lower
+            bound on the item time. Timing the function's pickling and
+            re-timing short calls stop at the budget as well. Measuring the
+            dispatch overhead (max_overhead) and probing copy-on-write
+            start a worker, so they are skipped, with a warning, unless
+            the remaining budget covers a worker's start; so is simulate
+            once the budget is spent. The sampled time's confidence is
+            reported in result.confidence.
     
     Returns:
-        OptimizationResult with recommended n_jobs and chunksize
+        OptimizationResult with recommended n_jobs and chunksize, and the
+        predicted time and core-second cost of the plan when the data size
+        is known
+    
+    Raises:
+        ValueError: If the objective or schedule is unknown, the objective
+            is missing its parameter, max_overhead is not in (0, 1) or
+            max_optimize_time is not positive
     
     Example:
         >>> def expensive_function(x):
@@ -72,13 +343,45 @@ def optimize(
         >>> result = optimize(expensive_function, data)
         >>> print(f"Use n_jobs={result.n_jobs}, chunksize={result.chunksize}")
     """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r} - expected one of {OBJECTIVES}")
+    if objective == "deadline" and (deadline is None or deadline <= 0):
+        raise ValueError("The 'deadline' objective requires a positive deadline")
+    if objective == "efficiency" and not (min_efficiency and 0 < min_efficiency <= 1):
+        raise ValueError("The 'efficiency' objective requires min_efficiency in (0, 1]")
+    if schedule != "auto" and schedule not in SCHEDULES:
+        raise ValueError(f"Unknown schedule {schedule!r} - expected 'auto' or one of {SCHEDULES}")
+    if schedule == "lpt" and cost_hint is None:
+        raise ValueError("The 'lpt' schedule requires a cost_hint")
+    if max_overhead is not None and not 0 < max_overhead < 1:
+        raise ValueError("max_overhead must be in (0, 1)")
+    if max_optimize_time is not None and max_optimize_time <= 0:
+        raise ValueError("max_optimize_time must be positive")
+    started_at = time.perf_counter()
+    
+    def fits_budget(duration: float) -> bool:
+        """Check whether a step of the given duration ends within max_optimize_time."""
+        if max_optimize_time is None:
+            return True
+        return time.perf_counter() - started_at + duration <= max_optimize_time
+    
     result_warnings = []
     
     # Step 1: Perform dry run sampling
     if verbose:
         print("Performing dry run sampling...")
     
-    sampling_result = perform_dry_run(func, data, sample_size)
+    if max_optimize_time is not None:
+        # Keep a share of the budget for the planning steps after sampling
+        sample_budget = (1 - PLANNING_RESERVE) * (
+            max_optimize_time - (time.perf_counter() - started_at)
+        )
+    else:
+        sample_budget = None
+    sampling_result = perform_dry_run(
+        func, data, sample_size, starmap, func_kwargs, combine, initial,
+        initializer, initargs, sample_budget
+    )
     
     # Check for errors during sampling
     if sampling_result.error:
@@ -102,28 +405,91 @@ def optimize(
     
     avg_time = sampling_result.avg_time
     return_size = sampling_result.return_size
+    input_size = sampling_result.input_size
     peak_memory = sampling_result.peak_memory
+    init_time = sampling_result.init_time
+    init_memory = sampling_result.init_memory
+    confidence = sampling_result.confidence
+    
+    if sampling_result.censored:
+        result_warnings.append(
+            f"An item was still running after {avg_time:.2f}s when max_optimize_time "
+            f"ran out - planning with that as a lower bound on the item time"
+        )
     
     if verbose:
-        print(f"Average execution time: {avg_time:.4f}s")
+        if max_optimize_time is not None:
+            print(
+                f"Sampled {sampling_result.sample_count} item(s) within the "
+                f"{max_optimize_time:.2f}s budget (confidence {confidence:.0%})"
+            )
+        print(f"Average execution time: {avg_time:.6f}s")
+        print(f"Average argument size: {input_size} bytes")
         print(f"Average return size: {return_size} bytes")
+        if combine is not None:
+            print(f"Sampled partial result size: {sampling_result.partial_size} bytes")
         print(f"Peak memory: {peak_memory} bytes")
-    
-    # Step 2: Fast Fail - very quick functions
-    if avg_time < 0.001:
-        return OptimizationResult(
-            n_jobs=1,
-            chunksize=1,
-            reason="Function is too fast (< 1ms) - parallelization overhead would dominate",
-            estimated_speedup=1.0
+        if initializer is not None:
+            print(f"Initializer time: {init_time:.4f}s, memory: {init_memory} bytes")
+        print(
+            f"Pickled function size: {sampling_result.func_size} bytes "
+            f"({sampling_result.func_pickle_time * 1e6:.1f}us to pickle)"
         )
     
-    # Step 3: Estimate total workload
+    # Step 2: Estimate total workload
     total_items = estimate_total_items(data, False)
     
+    item_costs = None
+    cost_model = None
+    size_model = None
+    # Item times the simulator draws from
+    time_distribution = sampling_result.item_times
     if total_items > 0:
         estimated_total_time = avg_time * total_items
         
+        # A cost hint predicts each item's time from a cheap feature of the item
+        if cost_hint is not None:
+            try:
+                sample, _ = safe_slice_data(data, len(sampling_result.item_times))
+                cost_model = fit_linear(
+                    [cost_hint(item) for item in sample], sampling_result.item_times
+                )
+                item_costs = [
+                    max(0.0, predict_linear(cost_model, cost_hint(item))) for item in data
+                ]
+            except Exception as e:
+                cost_model = None
+                result_warnings.append(f"cost_hint failed ({e}) - using the average item time")
+        
+        if item_costs and sum(item_costs) > 0:
+            estimated_total_time = sum(item_costs)
+            avg_time = estimated_total_time / total_items
+            if verbose:
+                intercept, slope = cost_model
+                print(f"Cost model: time = {intercept:.6f}s + {slope:.6g}s * hint")
+        else:
+            item_costs = None
+        
+        # Without a hint, learn how item time scales with item size and
+        # apply it to the size distribution of the whole dataset
+        if item_costs is None:
+            size_model = fit_size_model(sampling_result.item_sizes, sampling_result.item_times)
+            if size_model is not None:
+                dataset_sizes = sample_item_sizes(data, starmap)
+                avg_time = sum(
+                    predict_scaling_model(size_model, size) for size in dataset_sizes
+                ) / len(dataset_sizes)
+                time_distribution = [
+                    predict_scaling_model(size_model, size) for size in dataset_sizes
+                ]
+                estimated_total_time = avg_time * total_items
+                if verbose:
+                    kind, first, second = size_model
+                    if kind == "power":
+                        print(f"Size model: time = {first:.6g}s * size^{second:.2f}")
+                    else:
+                        print(f"Size model: time = {first:.6f}s + {second:.6g}s * size")
+        
         if verbose:
             print(f"Estimated total items: {total_items}")
             print(f"Estimated serial execution time: {estimated_total_time:.2f}s")
@@ -131,44 +497,209 @@ def optimize(
         # Can't determine size for generators
         estimated_total_time = None
         result_warnings.append("Cannot determine data size - using heuristics")
+        if cost_hint is not None:
+            result_warnings.append("cost_hint needs a sized dataset - ignoring it")
     
-    # Step 4: Get system information
+    # Step 3: Get system information
     physical_cores = get_physical_cores()
     spawn_cost = get_spawn_cost()
+    if max_overhead is not None:
+        # Calibrate the dispatch cost on this host instead of assuming it,
+        # if the budget leaves time to start a worker and time the round trips
+        chunk_overhead = get_measured_chunk_overhead()
+        if chunk_overhead is None:
+            if fits_budget(spawn_cost + CALIBRATION_TASKS * get_chunk_overhead()):
+                chunk_overhead = measure_chunk_overhead()
+            else:
+                chunk_overhead = get_chunk_overhead()
+                result_warnings.append(
+                    "max_optimize_time leaves no time to measure the dispatch "
+                    "overhead - assuming the default"
+                )
+    else:
+        chunk_overhead = get_chunk_overhead()
+    
+    if pool_manager is not None:
+        warm_workers = pool_manager.warm_workers(initializer=initializer, initargs=initargs)
+    else:
+        warm_workers = 0
+    # Every started worker pays the process spawn and the initializer
+    worker_startup_cost = spawn_cost + init_time
+    # Pool.map pickles the function (with bound state) into every chunk;
+    # installed by the initializer it is sent once per worker instead
+    function_cost = (
+        sampling_result.func_pickle_time
+        + sampling_result.func_size * get_ipc_cost_per_byte()
+    )
+    if install_function:
+        worker_startup_cost += function_cost
+    else:
+        chunk_overhead += function_cost
+    if max_overhead is not None:
+        # Chunks just long enough to keep dispatch within max_overhead
+        target_chunk_duration = chunk_overhead / max_overhead
+    else:
+        max_overhead = MAX_DISPATCH_OVERHEAD
     
     if verbose:
         print(f"Physical cores: {physical_cores}")
         print(f"Estimated spawn cost: {spawn_cost}s")
+        print(f"Estimated dispatch overhead per chunk: {chunk_overhead:.6f}s")
+        print(f"Target chunk duration: {target_chunk_duration:.4f}s")
+        if initializer is not None:
+            print(f"Estimated worker startup cost: {worker_startup_cost:.4f}s")
+        if pool_manager is not None:
+            print(f"Warm pool workers: {warm_workers}")
+    
+    def startup_time_for(n_jobs: int) -> float:
+        """Startup time of the workers that are not already warm."""
+        if pool_manager is not None:
+            started_workers = pool_manager.startup_workers(
+                n_jobs, initializer=initializer, initargs=initargs
+            )
+        else:
+            started_workers = n_jobs
+        return worker_startup_cost * started_workers
     
-    # Step 5: Check if parallelization is worth it
-    if estimated_total_time is not None and estimated_total_time < spawn_cost * 2:
+    def build_surface(chunksize: int) -> Optional[RuntimeSurface]:
+        """What-if runtime grid over n_jobs and chunksize, if requested."""
+        if not return_surface or not estimated_total_time:
+            return None
+        ipc_cost = get_ipc_cost_per_byte()
+        result_bytes = total_items * return_size if combine is None else 0
+        return compute_surface(
+            total_items,
+            avg_time,
+            [startup_time_for(n) for n in range(1, physical_cores + 1)],
+            chunk_overhead,
+            estimated_total_time + init_time,
+            log_spaced_chunksizes(total_items, include=[chunksize]),
+            time_cv=sampling_result.time_std / avg_time if avg_time > 0 else 0.0,
+            fixed_ipc_time=(total_items * input_size + result_bytes) * ipc_cost,
+            ipc_time_per_chunk=sampling_result.partial_size * ipc_cost if combine is not None else 0.0
+        )
+    
+    # Step 4: Check if the total work can pay for the parallel overhead
+    # (no startup cost with a warm pool). Cheap functions are not ruled out
+    # here - large chunks amortize their dispatch cost.
+    if (
+        estimated_total_time is not None
+        and warm_workers == 0
+        and estimated_total_time < worker_startup_cost * 2
+    ):
         return OptimizationResult(
             n_jobs=1,
             chunksize=1,
             reason=f"Total execution time ({estimated_total_time:.2f}s) too short for parallelization overhead",
-            estimated_speedup=1.0
+            estimated_speedup=1.0,
+            predicted_time=estimated_total_time + init_time,
+            core_seconds=estimated_total_time + init_time,
+            surface=build_surface(1),
+            confidence=confidence
         )
     
-    # Step 6: Calculate optimal chunksize
+    # Step 5: Plan chunks
     # Target: each chunk should take at least target_chunk_duration seconds
     if avg_time > 0:
-        optimal_chunksize = max(1, int(target_chunk_duration / avg_time))
+        target_chunksize = max(1, int(target_chunk_duration / avg_time))
     else:
-        optimal_chunksize = 1
+        target_chunksize = 1
     
-    # Cap chunksize at a reasonable value
-    if total_items > 0:
-        # Don't make chunks larger than 10% of total items
-        max_reasonable_chunksize = max(1, total_items // 10)
-        optimal_chunksize = min(optimal_chunksize, max_reasonable_chunksize)
+    # More variable item times need more chunks per worker to keep the tail short
+    time_cv = sampling_result.time_std / avg_time if avg_time > 0 else 0.0
+    min_chunks_per_worker = chunks_per_worker(time_cv)
+    
+    # Predicted item costs allow balanced chunks; otherwise the sampled
+    # variation picks the schedule
+    if schedule == "auto" and item_costs is not None:
+        schedule = "lpt"
+    elif schedule == "auto" or (schedule == "lpt" and item_costs is None):
+        schedule = choose_schedule(time_cv)
+    
+    # Guided and dynamic chunks only shrink until dispatch would dominate them
+    floor_chunksize = min(
+        target_chunksize, min_chunksize_for_overhead(avg_time, chunk_overhead, max_overhead)
+    )
     
     if verbose:
-        print(f"Optimal chunksize: {optimal_chunksize}")
+        print(f"Item time variation (CV): {time_cv:.2f}")
+        print(f"Minimum chunks per worker: {min_chunks_per_worker}")
+        print(f"Schedule: {schedule}")
+    
+    def chunksize_for(n_jobs: int) -> int:
+        """Chunk size giving every worker at least min_chunks_per_worker chunks."""
+        if schedule == "lpt":
+            # Average size of the balanced chunks
+            return -(-total_items // chunk_count(n_jobs))
+        if schedule != "static":
+            # Smallest (guided) or only (dynamic) chunk size
+            return floor_chunksize
+        if total_items <= 0:
+            return target_chunksize
+        return max(1, min(target_chunksize, total_items // (n_jobs * min_chunks_per_worker)))
+    
+    def chunk_count(n_jobs: int) -> int:
+        """Number of chunks dispatched with n_jobs workers."""
+        if schedule == "lpt":
+            n_chunks = max(
+                n_jobs * min_chunks_per_worker,
+                math.ceil(estimated_total_time / target_chunk_duration)
+            )
+            return min(total_items, n_chunks)
+        if schedule == "guided":
+            return len(guided_chunk_sizes(total_items, n_jobs, floor_chunksize))
+        return -(-total_items // chunksize_for(n_jobs))
+    
+    def tail_time_for(n_jobs: int) -> float:
+        """Straggler time at the end of the map with n_jobs workers."""
+        chunksize = chunksize_for(n_jobs)
+        if schedule == "lpt":
+            # Balanced chunks - only the rounding of chunks to workers and a
+            # single item longer than a worker's share remain
+            return (
+                estimate_tail_time(total_items, chunksize, n_jobs, avg_time)
+                + max(0.0, max(item_costs) - estimated_total_time / n_jobs)
+            )
+        return estimate_tail_time(total_items, chunksize, n_jobs, avg_time, time_cv)
     
-    # Step 7: Determine number of workers
-    # Consider memory constraints
-    estimated_job_ram = peak_memory if peak_memory > 0 else 0
-    max_workers = calculate_max_workers(physical_cores, estimated_job_ram)
+    # Step 6: Determine number of workers
+    # Consider memory constraints: each worker holds the interpreter baseline,
+    # the initializer's state, one item's peak and a chunk of arguments and
+    # results (mirrored in flight in the parent), while Pool.map also keeps
+    # every result in the parent
+    largest_chunk = target_chunksize if total_items <= 0 else min(total_items, target_chunksize)
+    if schedule == "guided" and total_items > 0:
+        largest_chunk = max(largest_chunk, guided_chunk_sizes(total_items, 1, floor_chunksize)[0])
+    # Forked workers copy part of this process as they run - probe how much,
+    # if the budget leaves time to fork a worker
+    cow_share = get_cow_share(freeze_heap)
+    if cow_share is None:
+        if fits_budget(spawn_cost):
+            cow_share = probe_cow_share(freeze_heap=freeze_heap)
+        elif is_fork_start():
+            result_warnings.append(
+                "max_optimize_time leaves no time to probe copy-on-write - "
+                "charging the worker baseline without it"
+            )
+    if verbose and cow_share is not None:
+        heap = "frozen" if freeze_heap else "unfrozen"
+        print(f"Copy-on-write share ({heap} heap): {cow_share:.0%}")
+    memory = estimate_memory(
+        1, largest_chunk, total_items, max(0, peak_memory), input_size, return_size,
+        init_memory, collect_results=combine is None, freeze_heap=freeze_heap
+    )
+    use_imap = recommend_imap(memory.parent_results)
+    if use_imap:
+        result_warnings.append(
+            f"Collecting all results would need {memory.parent_results / (1024 * 1024):.0f}MB "
+            f"in the parent - iterate over pool.imap() instead of pool.map()"
+        )
+    max_workers = calculate_max_workers(
+        physical_cores,
+        memory.item_memory + 2 * memory.chunk_buffers,
+        memory.worker_baseline + init_memory,
+        0 if use_imap else memory.parent_results
+    )
     
     if max_workers < physical_cores:
         result_warnings.append(
@@ -176,36 +707,264 @@ def optimize(
             f"(physical cores: {physical_cores})"
         )
     
-    # For CPU-bound tasks, use physical cores (not logical/hyperthreaded)
-    optimal_n_jobs = max_workers
+    # Respect the core budget shared with concurrent jobs on this host
+    coordinator = coordinator or get_coordinator()
+    if coordinator is not None:
+        try:
+            # Even without a free core the job can still run serially
+            core_share = max(1, coordinator.available(max_workers))
+            other_jobs = len(coordinator.leases())
+        except OSError as e:
+            core_share = max_workers
+            result_warnings.append(f"Core coordination unavailable ({e}) - ignoring other jobs")
+        if core_share < max_workers:
+            result_warnings.append(
+                f"Core coordinator limits workers to {core_share} "
+                f"(shared with {other_jobs} other job(s))"
+            )
+            max_workers = core_share
+    
+    def predict_parallel_time(n_jobs: int) -> float:
+        """Simplified Amdahl's law estimate with startup, tail, dispatch and IPC costs."""
+        # The last chunks leave some workers idle while stragglers finish
+        tail_time = tail_time_for(n_jobs)
+        # Every chunk pays a fixed dispatch cost in the parent
+        n_chunks = chunk_count(n_jobs)
+        dispatch_time = n_chunks * chunk_overhead
+        # Arguments and results are pickled through the parent one at a time
+        if combine is not None:
+            # Workers reduce locally and send back one partial per chunk
+            result_bytes = n_chunks * sampling_result.partial_size
+        else:
+            result_bytes = total_items * return_size
+        ipc_time = (total_items * input_size + result_bytes) * get_ipc_cost_per_byte()
+        # Only workers that are not already warm pay the startup cost
+        return (
+            startup_time_for(n_jobs)
+            + (estimated_total_time / n_jobs)
+            + tail_time
+            + dispatch_time
+            + ipc_time
+        )
+    
+    def predict_time(n_jobs: int) -> float:
+        """Predicted wall-clock time; serial execution runs the initializer once."""
+        if n_jobs == 1:
+            return estimated_total_time + init_time
+        return predict_parallel_time(n_jobs)
+    
+    # Worker counts left unsimulated because max_optimize_time would run out
+    out_of_budget = []
+    
+    def simulate_for(n_jobs: int) -> Optional[SimulationResult]:
+        """Discrete-event prediction of the plan with n_jobs workers."""
+        n_chunks = chunk_count(n_jobs)
+        if not time_distribution or n_chunks > MAX_SIMULATED_CHUNKS:
+            return None
+        if not fits_budget(estimate_simulation_time(n_chunks, total_items)):
+            out_of_budget.append(n_jobs)
+            return None
+        chunk_times = None
+        if schedule == "lpt":
+            partition = lpt_partition(item_costs, chunk_count(n_jobs))
+            chunk_sizes = [len(indices) for indices in partition]
+            chunk_times = [sum(item_costs[i] for i in indices) for indices in partition]
+        elif schedule == "guided":
+            chunk_sizes = guided_chunk_sizes(total_items, n_jobs, floor_chunksize)
+        else:
+            chunksize = chunksize_for(n_jobs)
+            chunk_sizes = [chunksize] * (total_items // chunksize)
+            if total_items % chunksize:
+                chunk_sizes.append(total_items % chunksize)
+        ipc_cost = get_ipc_cost_per_byte()
+        return simulate_plan(
+            time_distribution,
+            chunk_sizes,
+            n_jobs,
+            chunk_overhead,
+            input_bytes_time=input_size * ipc_cost,
+            result_bytes_time=return_size * ipc_cost,
+            partial_time=sampling_result.partial_size * ipc_cost if combine is not None else None,
+            startup_time=startup_time_for(n_jobs),
+            chunk_times=chunk_times
+        )
+    
+    # For CPU-bound tasks, use physical cores (not logical/hyperthreaded),
+    # choosing among them according to the objective
+    objective_reason = None
+    if estimated_total_time:
+        candidates = range(1, max_workers + 1)
+        fastest_n_jobs = min(candidates, key=predict_time)
+        
+        if objective == "deadline":
+            feasible = [n for n in candidates if predict_time(n) <= deadline]
+            if feasible:
+                optimal_n_jobs = feasible[0]
+                objective_reason = f"fewest workers meeting the {deadline:.2f}s deadline"
+            else:
+                optimal_n_jobs = fastest_n_jobs
+                result_warnings.append(
+                    f"Deadline of {deadline:.2f}s cannot be met - fastest plan takes "
+                    f"{predict_time(fastest_n_jobs):.2f}s"
+                )
+        elif objective == "efficiency":
+            serial_time = predict_time(1)
+            efficient = [
+                n for n in candidates
+                if serial_time / predict_time(n) / n >= min_efficiency
+            ]
+            optimal_n_jobs = min(efficient, key=predict_time)
+            objective_reason = f"parallel efficiency at or above {min_efficiency:.0%}"
+        else:
+            optimal_n_jobs = fastest_n_jobs
+    else:
+        # Without the data size the stream may be short, so parallelize only
+        # if a single item pays for starting its worker, its dispatch and
+        # its IPC - then even one item per worker comes out ahead
+        item_overhead = (
+            startup_time_for(max_workers) / max_workers
+            + chunk_overhead
+            + (input_size + return_size) * get_ipc_cost_per_byte()
+        )
+        if avg_time >= item_overhead:
+            optimal_n_jobs = max_workers
+        else:
+            optimal_n_jobs = 1
+            result_warnings.append(
+                f"Items take {avg_time * 1e3:.3f}ms, less than a worker's startup and "
+                f"dispatch cost ({item_overhead * 1e3:.3f}ms) - staying serial as the "
+                f"data size is unknown; pass a sized sequence to plan for the whole dataset"
+            )
+        if objective != "speedup":
+            result_warnings.append(
+                f"Cannot evaluate the '{objective}' objective without the data size - "
+                f"maximizing speedup"
+            )
+    
+    # The simulator captures chunk granularity, item-time variation and the
+    # serial parent, so it makes the final choice among the best candidates
+    simulation = None
+    if simulate and estimated_total_time:
+        if objective == "speedup":
+            finalists = sorted(range(2, max_workers + 1), key=predict_time)[:SIMULATED_CANDIDATES]
+            simulations = {n: simulate_for(n) for n in finalists}
+            simulations = {n: sim for n, sim in simulations.items() if sim is not None}
+            if simulations:
+                best_n_jobs = min(simulations, key=lambda n: simulations[n].makespan)
+                if simulations[best_n_jobs].makespan < predict_time(1):
+                    optimal_n_jobs = best_n_jobs
+                    simulation = simulations[best_n_jobs]
+                else:
+                    optimal_n_jobs = 1
+        elif optimal_n_jobs > 1:
+            simulation = simulate_for(optimal_n_jobs)
+        if simulation is None and optimal_n_jobs > 1:
+            if out_of_budget:
+                result_warnings.append(
+                    "max_optimize_time leaves no time to simulate - using the analytic estimate"
+                )
+            else:
+                result_warnings.append(
+                    "Plan has too many chunks to simulate - using the analytic estimate"
+                )
+    
+    optimal_chunksize = chunksize_for(optimal_n_jobs)
+    memory_estimate = estimate_memory(
+        optimal_n_jobs,
+        largest_chunk if schedule == "guided" else optimal_chunksize,
+        total_items, max(0, peak_memory), input_size, return_size, init_memory,
+        worker_baseline=memory.worker_baseline,
+        collect_results=combine is None and not use_imap
+    )
     
     if verbose:
         print(f"Optimal n_jobs: {optimal_n_jobs}")
+        print(f"Optimal chunksize: {optimal_chunksize}")
+        print(f"Estimated memory: {memory_estimate}")
     
-    # Step 8: Estimate speedup
-    if estimated_total_time and optimal_n_jobs > 1:
-        # Simplified Amdahl's law calculation
-        parallel_fraction = 1.0  # Assume fully parallelizable
-        serial_time = estimated_total_time
-        parallel_time = (spawn_cost * optimal_n_jobs) + (serial_time / optimal_n_jobs)
-        estimated_speedup = serial_time / parallel_time
+    # Step 7: Estimate speedup, time and cost, including the straggler tail
+    if estimated_total_time:
+        if simulation is not None:
+            predicted_time = simulation.makespan
+        else:
+            predicted_time = predict_time(optimal_n_jobs)
+        core_seconds = predicted_time * optimal_n_jobs
+        estimated_speedup = predict_time(1) / predicted_time
+        tail_time = tail_time_for(optimal_n_jobs)
+        
+        shipping_time = function_cost * chunk_count(optimal_n_jobs)
+        if (
+            optimal_n_jobs > 1
+            and not install_function
+            and shipping_time > FUNCTION_SHIPPING_WARNING_SHARE * predicted_time
+        ):
+            result_warnings.append(
+                f"The function pickles to {sampling_result.func_size} bytes and is sent "
+                f"with every chunk ({shipping_time:.2f}s in total) - use "
+                f"execute(install_function=True) to send it once per worker"
+            )
+        
+        if verbose:
+            print(f"Predicted time: {predicted_time:.2f}s ({core_seconds:.2f} core-seconds)")
+            print(f"Estimated straggler tail: {tail_time:.2f}s")
+            if simulation is not None:
+                print(simulation)
     else:
+        predicted_time = None
+        core_seconds = None
+        tail_time = None
         estimated_speedup = float(optimal_n_jobs)
     
-    # Step 9: Final sanity check
+    # Step 8: Final sanity check
     if optimal_n_jobs == 1:
+        reason = "Serial execution recommended based on constraints"
+        if objective_reason:
+            reason = f"Serial execution recommended: {objective_reason}"
         return OptimizationResult(
             n_jobs=1,
             chunksize=optimal_chunksize,
-            reason="Serial execution recommended based on constraints",
+            reason=reason,
             estimated_speedup=1.0,
-            warnings=result_warnings
+            warnings=result_warnings,
+            predicted_time=predicted_time,
+            core_seconds=core_seconds,
+            tail_time=tail_time,
+            memory_estimate=memory_estimate,
+            use_imap=use_imap,
+            surface=build_surface(optimal_chunksize),
+            simulation=simulation,
+            confidence=confidence,
+            max_workers=max_workers
         )
     
+    reason = f"Parallelization beneficial: {optimal_n_jobs} workers with chunks of {optimal_chunksize}"
+    if schedule == "guided":
+        reason = (
+            f"Parallelization beneficial: {optimal_n_jobs} workers with guided chunks "
+            f"shrinking to {optimal_chunksize}"
+        )
+    elif schedule == "dynamic":
+        reason += " (dynamic schedule)"
+    elif schedule == "lpt":
+        reason += " (balanced by predicted cost, most expensive first)"
+    if objective_reason:
+        reason += f" ({objective_reason})"
     return OptimizationResult(
         n_jobs=optimal_n_jobs,
         chunksize=optimal_chunksize,
-        reason=f"Parallelization beneficial: {optimal_n_jobs} workers with chunks of {optimal_chunksize}",
+        reason=reason,
         estimated_speedup=estimated_speedup,
-        warnings=result_warnings
+        warnings=result_warnings,
+        predicted_time=predicted_time,
+        core_seconds=core_seconds,
+        tail_time=tail_time,
+        schedule=schedule,
+        cost_model=cost_model,
+        size_model=size_model,
+        memory_estimate=memory_estimate,
+        use_imap=use_imap,
+        surface=build_surface(optimal_chunksize),
+        simulation=simulation,
+        confidence=confidence,
+        max_workers=max_workers
     )
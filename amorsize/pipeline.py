@@ -0,0 +1,451 @@
+"""
+Pipeline module for planning and running multi-stage pipelines across processes.
+"""
+
+import threading
+import time
+from multiprocessing import Process, Queue
+from typing import Any, Callable, Iterator, List, Optional, Union
+
+from .memory_probe import trace_memory
+from .sampling import (
+    MIN_MEASURE_TIME,
+    check_picklability,
+    safe_slice_data,
+    estimate_total_items,
+    measure_call_time,
+    payload_size,
+)
+from .scheduling import min_chunksize_for_overhead
+from .system_info import (
+    get_physical_cores,
+    get_spawn_cost,
+    get_ipc_cost_per_byte,
+    get_chunk_overhead,
+    calculate_max_workers,
+)
+
+# Most items per queue message, so a stream of cheap items still flows
+MAX_BATCH_SIZE = 1000
+
+
+class PipelinePlan:
+    """Container for pipeline planning results."""
+
+    def __init__(
+        self,
+        workers: List[int],
+        stage_times: List[float],
+        reason: str,
+        queue_size: int = 1,
+        serial: bool = False,
+        estimated_throughput: float = 0.0,
+        warnings: List[str] = None,
+        batch_sizes: Optional[List[int]] = None
+    ):
+        self.workers = workers
+        self.stage_times = stage_times
+        self.reason = reason
+        self.queue_size = queue_size
+        # Items per queue message into each stage
+        self.batch_sizes = batch_sizes or [1] * len(workers)
+        self.serial = serial
+        self.estimated_throughput = estimated_throughput
+        self.warnings = warnings or []
+
+    def __repr__(self):
+        return (
+            f"PipelinePlan(workers={self.workers}, "
+            f"batch_sizes={self.batch_sizes}, "
+            f"queue_size={self.queue_size}, "
+            f"serial={self.serial}, "
+            f"estimated_throughput={self.estimated_throughput:.1f}/s)"
+        )
+
+    def __str__(self):
+        result = (
+            f"Recommended: workers per stage={self.workers}, "
+            f"batch sizes={self.batch_sizes}, queue_size={self.queue_size}\n"
+        )
+        result += f"Reason: {self.reason}\n"
+        result += f"Estimated throughput: {self.estimated_throughput:.1f} items/s"
+        if self.warnings:
+            result += "\nWarnings:\n" + "\n".join(f"  - {w}" for w in self.warnings)
+        return result
+
+
+def allocate_workers(stage_times: List[float], core_budget: int) -> List[int]:
+    """
+    Split a core budget across stages to maximize pipeline throughput.
+
+    Every stage gets one worker, then each remaining core goes to the
+    current bottleneck (the stage with the highest time per worker).
+
+    Args:
+        stage_times: Average time per item for each stage in seconds
+        core_budget: Total number of workers to distribute
+
+    Returns:
+        Number of workers for each stage
+    """
+    workers = [1] * len(stage_times)
+    for _ in range(max(0, core_budget - len(stage_times))):
+        bottleneck = max(range(len(stage_times)), key=lambda i: stage_times[i] / workers[i])
+        workers[bottleneck] += 1
+    return workers
+
+
+def optimize_pipeline(
+    stages: List[Callable[[Any], Any]],
+    data: Union[List, Iterator],
+    sample_size: int = 5,
+    core_budget: Optional[int] = None,
+    verbose: bool = False
+) -> PipelinePlan:
+    """
+    Analyze a multi-stage pipeline and split the core budget across stages.
+
+    Each stage is sampled on the outputs of the previous stage. Items move
+    between stages in batches, each large enough that the queue's
+    per-message cost stays within MAX_DISPATCH_OVERHEAD of the batch's
+    work. A stage's cost per item is its work plus its share of that
+    message cost and the pickling of its input and output. Cores are
+    allocated so the stage throughputs (workers / cost per item) are as
+    balanced as possible, since the slowest stage - or the parent, which
+    feeds the first stage and collects the last - sets the pace.
+
+    Args:
+        stages: Stage functions, each accepting the previous stage's output
+        data: Iterable of input data for the first stage
+        sample_size: Number of items to sample (default: 5)
+        core_budget: Total workers across all stages (default: physical
+            cores, limited by memory)
+        verbose: If True, print detailed information
+
+    Returns:
+        PipelinePlan with workers per stage and the inter-stage queue size
+
+    Example:
+        >>> plan = optimize_pipeline([parse, enrich, score], records)
+        >>> results = execute_pipeline([parse, enrich, score], records, plan)
+    """
+    result_warnings = []
+    n_stages = len(stages)
+
+    if n_stages == 0:
+        return PipelinePlan(
+            workers=[],
+            stage_times=[],
+            reason="Pipeline has no stages",
+            serial=True,
+            warnings=["Pipeline has no stages"]
+        )
+
+    if not all(check_picklability(stage) for stage in stages):
+        return PipelinePlan(
+            workers=[1] * n_stages,
+            stage_times=[0.0] * n_stages,
+            reason="A stage function is not picklable - cannot use multiprocessing",
+            serial=True,
+            warnings=["Stage function cannot be pickled. Use serial execution."]
+        )
+
+    # Step 1: Sample each stage on the previous stage's outputs
+    if verbose:
+        print("Performing dry run sampling of pipeline stages...")
+
+    try:
+        items, _ = safe_slice_data(data, sample_size)
+        if not items:
+            raise ValueError("Empty data sample")
+
+        stage_times = []
+        # Pickled size of the items entering each stage, then of the results
+        payload_sizes = [sum(payload_size(item) for item in items) / len(items)]
+        peak_memory = 0
+        for index, stage in enumerate(stages):
+            outputs = []
+            with trace_memory() as probe:
+                start_time = time.perf_counter()
+                for item in items:
+                    outputs.append(stage(item))
+                elapsed = time.perf_counter() - start_time
+
+            stage_times.append(elapsed / len(items))
+            if stage_times[-1] < MIN_MEASURE_TIME:
+                # Too short for the timer, and slowed by tracemalloc -
+                # re-time the calls in batches without tracing
+                stage_times[-1] = sum(measure_call_time(stage, item) for item in items) / len(items)
+            peak_memory = max(peak_memory, probe.peak)
+            items = outputs
+            payload_sizes.append(sum(payload_size(item) for item in items) / len(items))
+
+            if verbose:
+                print(f"  stage {index}: {stage_times[-1]:.6f}s per item")
+    except Exception as e:
+        return PipelinePlan(
+            workers=[1] * n_stages,
+            stage_times=[0.0] * n_stages,
+            reason=f"Error during sampling: {str(e)}",
+            serial=True,
+            warnings=[f"Sampling failed: {str(e)}"]
+        )
+
+    # Step 2: Determine the core budget
+    physical_cores = get_physical_cores()
+    if core_budget is None:
+        core_budget = calculate_max_workers(physical_cores, peak_memory)
+        if core_budget < physical_cores:
+            result_warnings.append(
+                f"Memory constraints limit workers to {core_budget} "
+                f"(physical cores: {physical_cores})"
+            )
+
+    if core_budget < n_stages:
+        result_warnings.append(
+            f"Core budget ({core_budget}) is smaller than the number of stages "
+            f"({n_stages}) - stages will share cores"
+        )
+
+    # Step 3: Batch items so the per-message queue cost is amortized, then
+    # allocate cores to balance the stages' cost per item
+    total_items = estimate_total_items(data, False)
+    message_cost = get_chunk_overhead()
+    ipc_cost = get_ipc_cost_per_byte()
+    batch_sizes = [
+        min(min_chunksize_for_overhead(stage_time, message_cost), MAX_BATCH_SIZE)
+        for stage_time in stage_times
+    ]
+    if total_items > 0:
+        # Keep at least two batches per worker of the widest stage in flight
+        batch_cap = max(1, total_items // (2 * max(1, core_budget)))
+        batch_sizes = [min(size, batch_cap) for size in batch_sizes]
+    stage_costs = [
+        stage_time + message_cost / batch_size
+        + (payload_sizes[index] + payload_sizes[index + 1]) * ipc_cost
+        for index, (stage_time, batch_size) in enumerate(zip(stage_times, batch_sizes))
+    ]
+    # The parent pickles every input and unpickles every result
+    parent_cost = (
+        message_cost / batch_sizes[0] + message_cost / batch_sizes[-1]
+        + (payload_sizes[0] + payload_sizes[-1]) * ipc_cost
+    )
+    workers = allocate_workers(stage_costs, core_budget)
+    stage_throughputs = [w / cost for w, cost in zip(workers, stage_costs)]
+    throughput = min(min(stage_throughputs), 1.0 / parent_cost)
+    serial_throughput = 1.0 / sum(stage_times) if sum(stage_times) > 0 else float("inf")
+
+    # Bounded queues: enough slack for the widest stage to stay busy
+    queue_size = 2 * max(workers)
+
+    if verbose:
+        print(f"Workers per stage: {workers}")
+        print(f"Batch sizes: {batch_sizes}")
+        print(f"Bottleneck throughput: {throughput:.1f} items/s")
+
+    # Step 4: Check if a process per stage is worth it
+    spawn_cost = get_spawn_cost()
+    if total_items > 0:
+        serial_time = total_items * sum(stage_times)
+        parallel_time = spawn_cost * sum(workers) + total_items / throughput
+        if serial_time < parallel_time:
+            return PipelinePlan(
+                workers=[1] * n_stages,
+                stage_times=stage_times,
+                reason=(
+                    f"Total execution time ({serial_time:.2f}s) too short for "
+                    f"pipeline overhead"
+                ),
+                queue_size=queue_size,
+                serial=True,
+                estimated_throughput=serial_throughput,
+                warnings=result_warnings,
+                batch_sizes=batch_sizes
+            )
+    else:
+        result_warnings.append("Cannot determine data size - using heuristics")
+
+    if throughput in stage_throughputs:
+        pace = f"stage {stage_throughputs.index(throughput)} sets the pace"
+    else:
+        pace = "feeding and collecting in the parent sets the pace"
+    return PipelinePlan(
+        workers=workers,
+        stage_times=stage_times,
+        reason=f"Pipeline beneficial: {sum(workers)} workers across {n_stages} stages, {pace}",
+        queue_size=queue_size,
+        serial=False,
+        estimated_throughput=throughput,
+        warnings=result_warnings,
+        batch_sizes=batch_sizes
+    )
+
+
+class _StageFailure:
+    """Marker forwarded downstream when a stage raises for an item."""
+
+    def __init__(self, stage: int, message: str):
+        self.stage = stage
+        self.message = message
+
+
+def _stage_worker(
+    stage: int,
+    func: Callable[[Any], Any],
+    in_queue: Queue,
+    out_queue: Queue,
+    out_batch: int = 1
+):
+    """
+    Process loop: apply func to batches of (index, item) until a None sentinel.
+
+    Outputs are sent on in batches of out_batch, the rest when the input ends.
+    """
+    outputs = []
+    while True:
+        batch = in_queue.get()
+        if batch is None:
+            if outputs:
+                out_queue.put(outputs)
+            return
+        for index, item in batch:
+            if not isinstance(item, _StageFailure):
+                try:
+                    item = func(item)
+                except Exception as e:
+                    item = _StageFailure(stage, repr(e))
+            outputs.append((index, item))
+        while len(outputs) >= out_batch:
+            out_queue.put(outputs[:out_batch])
+            outputs = outputs[out_batch:]
+
+
+def execute_pipeline(
+    stages: List[Callable[[Any], Any]],
+    data: Union[List, Iterator],
+    plan: Optional[PipelinePlan] = None,
+    sample_size: int = 5,
+    verbose: bool = False
+) -> List[Any]:
+    """
+    Run a multi-stage pipeline with a pool of processes per stage.
+
+    Stages are connected by bounded queues, so a fast stage blocks once its
+    output queue is full and the slowest stage sets the pace without
+    unbounded buffering. Items travel in batches of plan.batch_sizes.
+    Input is streamed, so generators are not materialized.
+
+    Args:
+        stages: Stage functions, each accepting the previous stage's output
+        data: Iterable of input data for the first stage
+        plan: A previous PipelinePlan to reuse instead of optimizing
+        sample_size: Number of items to sample (default: 5)
+        verbose: If True, print detailed information
+
+    Returns:
+        List of final-stage results in input order
+
+    Raises:
+        RuntimeError: If any stage raised for an item, or items were lost
+            because a stage worker exited
+    """
+    if plan is None:
+        if not hasattr(data, '__len__'):
+            data = list(data)
+        plan = optimize_pipeline(stages, data, sample_size=sample_size, verbose=verbose)
+
+    if plan.serial:
+        results = []
+        for item in data:
+            for stage in stages:
+                item = stage(item)
+            results.append(item)
+        return results
+
+    queues = [Queue(maxsize=plan.queue_size) for _ in range(len(stages) + 1)]
+    # Each stage batches its outputs for the next stage; the last one
+    # returns results in batches of its own input size
+    out_batches = plan.batch_sizes[1:] + plan.batch_sizes[-1:]
+    processes = [
+        [
+            Process(
+                target=_stage_worker,
+                args=(index, stage, queues[index], queues[index + 1], out_batches[index]),
+                daemon=True
+            )
+            for _ in range(n_workers)
+        ]
+        for index, (stage, n_workers) in enumerate(zip(stages, plan.workers))
+    ]
+    for stage_processes in processes:
+        for process in stage_processes:
+            process.start()
+
+    # Items sent into the pipeline, and an error raised by the input
+    fed = [0]
+    feed_errors = []
+
+    def feed():
+        batch = []
+        try:
+            for message in enumerate(data):
+                batch.append(message)
+                fed[0] += 1
+                if len(batch) >= plan.batch_sizes[0]:
+                    queues[0].put(batch)
+                    batch = []
+            if batch:
+                queues[0].put(batch)
+        except Exception as e:
+            feed_errors.append(e)
+        finally:
+            # Stop the stages even if the input failed, so nothing waits forever
+            for _ in processes[0]:
+                queues[0].put(None)
+
+    def close_stages():
+        # A stage is finished once all its workers exit - then the next
+        # stage's workers can be told to stop
+        for index, stage_processes in enumerate(processes):
+            for process in stage_processes:
+                process.join()
+            downstream = processes[index + 1] if index + 1 < len(processes) else [None]
+            for _ in downstream:
+                queues[index + 1].put(None)
+
+    threads = [threading.Thread(target=feed, daemon=True),
+               threading.Thread(target=close_stages, daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    results = {}
+    while True:
+        batch = queues[-1].get()
+        if batch is None:
+            break
+        results.update(batch)
+
+    for thread in threads:
+        thread.join()
+
+    if feed_errors:
+        raise feed_errors[0]
+
+    failures = [item for item in results.values() if isinstance(item, _StageFailure)]
+    if failures:
+        raise RuntimeError(
+            f"Pipeline stage {failures[0].stage} failed for {len(failures)} item(s): "
+            f"{failures[0].message}"
+        )
+
+    missing = [index for index in range(fed[0]) if index not in results]
+    if missing:
+        shown = ", ".join(str(index) for index in missing[:10])
+        if len(missing) > 10:
+            shown += ", ..."
+        raise RuntimeError(
+            f"Pipeline lost {len(missing)} of {fed[0]} item(s) (indices {shown}) - "
+            f"a stage worker exited without returning them"
+        )
+
+    return [results[index] for index in range(fed[0])]
@@ -0,0 +1,297 @@
+"""
+Pool manager module for keeping worker pools warm between calls.
+"""
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+BACKENDS = {
+    "process": Pool,
+    "thread": ThreadPool,
+}
+
+
+class _ManagedPool:
+    """Registry entry for a warm pool."""
+
+    def __init__(
+        self,
+        pool,
+        backend: str,
+        n_jobs: int,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple = ()
+    ):
+        self.pool = pool
+        self.backend = backend
+        self.n_jobs = n_jobs
+        self.initializer = initializer
+        self.initargs = initargs
+        self.in_use = False
+        self.last_used = time.monotonic()
+
+
+class PoolManager:
+    """
+    Registry of reusable worker pools keyed by backend and worker count.
+
+    Pools stay warm between calls so the process spawn cost is paid once
+    per service rather than once per map. Idle pools are shut down after
+    idle_timeout seconds by a background reaper thread.
+
+    Example:
+        >>> manager = PoolManager(idle_timeout=300)
+        >>> with manager.pool(8) as pool:
+        ...     results = pool.map(func, data, chunksize=16)
+    """
+
+    def __init__(self, idle_timeout: float = 300.0):
+        self.idle_timeout = idle_timeout
+        self._entries: List[_ManagedPool] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    def _idle_entries(
+        self,
+        backend: str,
+        initializer: Optional[Callable[..., Any]],
+        initargs: Tuple
+    ) -> List[_ManagedPool]:
+        """Idle pools whose workers were set up by the same initializer."""
+        return [
+            entry for entry in self._entries
+            if entry.backend == backend
+            and not entry.in_use
+            and entry.initializer is initializer
+            and entry.initargs == initargs
+        ]
+
+    def _find_idle(
+        self,
+        backend: str,
+        n_jobs: int,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple = ()
+    ) -> Optional[_ManagedPool]:
+        """
+        Find an idle pool with exactly n_jobs workers.
+
+        A larger idle pool is not lent for a smaller request: Pool.map hands
+        chunks to all of a pool's workers, so the caller would run on more
+        workers than it planned for - beyond its core lease and the memory
+        estimate for n_jobs workers.
+        """
+        for entry in self._idle_entries(backend, initializer, initargs):
+            if entry.n_jobs == n_jobs:
+                return entry
+        return None
+
+    def _find_smaller_idle(
+        self,
+        backend: str,
+        n_jobs: int,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple = ()
+    ) -> Optional[_ManagedPool]:
+        """Find the largest idle pool with fewer than n_jobs workers."""
+        candidates = [
+            entry for entry in self._idle_entries(backend, initializer, initargs)
+            if entry.n_jobs < n_jobs
+        ]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda entry: entry.n_jobs)
+
+    def startup_workers(
+        self,
+        n_jobs: int,
+        backend: str = "process",
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple = ()
+    ) -> int:
+        """
+        Number of workers that must be started to serve a request.
+
+        Args:
+            n_jobs: Requested number of workers
+            backend: "process" or "thread"
+            initializer: Per-worker setup function the pool must have run
+            initargs: Arguments for initializer
+
+        Returns:
+            0 for an idle warm pool of exactly n_jobs workers, otherwise
+            n_jobs - a pool is never resized in place, so a larger request
+            starts a whole new pool
+        """
+        with self._lock:
+            entry = self._find_idle(backend, n_jobs, initializer, initargs)
+            return 0 if entry else n_jobs
+
+    def warm_workers(
+        self,
+        backend: str = "process",
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple = ()
+    ) -> int:
+        """
+        Size of the largest idle warm pool for a backend.
+
+        Args:
+            backend: "process" or "thread"
+            initializer: Per-worker setup function the pool must have run
+            initargs: Arguments for initializer
+
+        Returns:
+            Number of warm idle workers, or 0 if there is no idle pool
+        """
+        with self._lock:
+            entries = self._idle_entries(backend, initializer, initargs)
+            return max((entry.n_jobs for entry in entries), default=0)
+
+    @contextmanager
+    def pool(
+        self,
+        n_jobs: int,
+        backend: str = "process",
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple = ()
+    ) -> Iterator:
+        """
+        Borrow a warm pool with n_jobs workers, creating one if needed.
+
+        Pools are only shared between callers using the same initializer,
+        so per-worker state such as a loaded model is reused as well. A new
+        pool replaces the largest smaller idle pool, which is shut down.
+
+        Args:
+            n_jobs: Number of workers
+            backend: "process" or "thread"
+            initializer: Per-worker setup function, as for Pool(initializer=...)
+            initargs: Arguments for initializer
+
+        Yields:
+            A multiprocessing Pool (or ThreadPool) that stays alive afterwards
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r} - expected one of {sorted(BACKENDS)}")
+
+        replaced = None
+        with self._lock:
+            entry = self._find_idle(backend, n_jobs, initializer, initargs)
+            if entry is None:
+                # Pools cannot be resized through their public API - the new
+                # pool supersedes a smaller idle one instead
+                replaced = self._find_smaller_idle(backend, n_jobs, initializer, initargs)
+                if replaced is not None:
+                    self._entries.remove(replaced)
+                pool = BACKENDS[backend](
+                    processes=n_jobs, initializer=initializer, initargs=initargs
+                )
+                entry = _ManagedPool(pool, backend, n_jobs, initializer, initargs)
+                self._entries.append(entry)
+            entry.in_use = True
+            self._start_reaper()
+        if replaced is not None:
+            replaced.pool.terminate()
+            replaced.pool.join()
+
+        try:
+            yield entry.pool
+        finally:
+            with self._lock:
+                entry.in_use = False
+                entry.last_used = time.monotonic()
+
+    def _start_reaper(self):
+        """Start the idle-pool reaper thread (caller holds the lock)."""
+        if self._reaper is None or not self._reaper.is_alive():
+            self._stop.clear()
+            self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(0.05, min(self.idle_timeout / 2, 5.0))
+        while not self._stop.wait(interval):
+            self.shutdown_idle()
+
+    def shutdown_idle(self, idle_timeout: Optional[float] = None) -> int:
+        """
+        Shut down pools that have been idle longer than the timeout.
+
+        Args:
+            idle_timeout: Override for the manager's idle timeout
+
+        Returns:
+            Number of pools shut down
+        """
+        timeout = self.idle_timeout if idle_timeout is None else idle_timeout
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                entry for entry in self._entries
+                if not entry.in_use and now - entry.last_used >= timeout
+            ]
+            for entry in expired:
+                self._entries.remove(entry)
+        for entry in expired:
+            entry.pool.terminate()
+            entry.pool.join()
+        return len(expired)
+
+    def retire(self, pool) -> bool:
+        """
+        Shut down one idle pool, leaving the manager's other pools warm.
+
+        Args:
+            pool: A pool previously borrowed from this manager
+
+        Returns:
+            True if the pool was shut down, False if it is unknown or has
+            been borrowed again in the meantime
+        """
+        with self._lock:
+            entry = next((entry for entry in self._entries if entry.pool is pool), None)
+            if entry is None or entry.in_use:
+                return False
+            self._entries.remove(entry)
+        entry.pool.terminate()
+        entry.pool.join()
+        return True
+
+    def shutdown(self):
+        """Stop the reaper and shut down every pool."""
+        self._stop.set()
+        with self._lock:
+            entries, self._entries = self._entries, []
+        for entry in entries:
+            entry.pool.terminate()
+            entry.pool.join()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+_default_manager: Optional[PoolManager] = None
+_default_lock = threading.Lock()
+
+
+def get_pool_manager() -> PoolManager:
+    """
+    Get the process-wide default PoolManager, creating it on first use.
+
+    Returns:
+        The shared PoolManager, shut down automatically at interpreter exit
+    """
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = PoolManager()
+            atexit.register(_default_manager.shutdown)
+        return _default_manager
@@ -0,0 +1,176 @@
+"""
+Reduce module for map-reduce workloads where workers reduce their chunks locally.
+"""
+
+import copy
+import functools
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from .arguments import bind_kwargs, call_with_args
+from .optimizer import optimize, OptimizationResult
+from .scheduling import guided_chunk_sizes, iter_chunks
+
+
+def _fold(
+    func: Callable[..., Any],
+    combine: Callable[[Any, Any], Any],
+    initial: Any,
+    items: Iterator,
+    starmap: bool
+) -> Any:
+    """Map func over items and fold the results with combine."""
+    accumulator = copy.deepcopy(initial)
+    for index, item in enumerate(items):
+        result = call_with_args(func, item, starmap)
+        if index == 0 and initial is None:
+            accumulator = result
+        else:
+            accumulator = combine(accumulator, result)
+    return accumulator
+
+
+class _ChunkReducer:
+    """Picklable worker task that maps and reduces one chunk of items."""
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        combine: Callable[[Any, Any], Any],
+        initial: Any,
+        starmap: bool
+    ):
+        self.func = func
+        self.combine = combine
+        self.initial = initial
+        self.starmap = starmap
+
+    def __call__(self, chunk: List[Any]) -> Any:
+        return _fold(self.func, self.combine, self.initial, chunk, self.starmap)
+
+
+def optimize_reduce(
+    func: Callable[..., Any],
+    combine: Callable[[Any, Any], Any],
+    data: Union[List, Iterator],
+    initial: Any = None,
+    sample_size: int = 5,
+    target_chunk_duration: float = 0.2,
+    verbose: bool = False,
+    starmap: bool = False,
+    func_kwargs: Optional[Dict[str, Any]] = None
+) -> OptimizationResult:
+    """
+    Analyze a map-reduce workload to determine optimal parallelization parameters.
+
+    Workers reduce each chunk locally and send back a single partial, so
+    the IPC model charges one partial per chunk rather than one result per
+    item. The sampled results are folded with combine during the dry run
+    to measure the fold cost and the partial size.
+
+    Args:
+        func: The map function. Must accept a single argument, or one
+            argument per tuple element when starmap is True.
+        combine: Reducer called as combine(accumulator, result). Must return
+            the new accumulator and be associative.
+        data: Iterable of input data
+        initial: Identity accumulator each chunk starts from, e.g. 0 or
+            Counter() (default: the chunk's first result)
+        sample_size: Number of items to sample for timing (default: 5)
+        target_chunk_duration: Target duration per chunk in seconds (default: 0.2)
+        verbose: If True, print detailed information
+        starmap: If True, call func(*item) like Pool.starmap (default: False)
+        func_kwargs: Keyword arguments passed to every call (default: None)
+
+    Returns:
+        OptimizationResult with recommended n_jobs and chunksize
+    """
+    return optimize(
+        func,
+        data,
+        sample_size=sample_size,
+        target_chunk_duration=target_chunk_duration,
+        verbose=verbose,
+        starmap=starmap,
+        func_kwargs=func_kwargs,
+        combine=combine,
+        initial=initial
+    )
+
+
+def execute_reduce(
+    func: Callable[..., Any],
+    combine: Callable[[Any, Any], Any],
+    data: Union[List, Iterator],
+    initial: Any = None,
+    merge: Optional[Callable[[Any, Any], Any]] = None,
+    sample_size: int = 5,
+    target_chunk_duration: float = 0.2,
+    verbose: bool = False,
+    starmap: bool = False,
+    func_kwargs: Optional[Dict[str, Any]] = None,
+    result: Optional[OptimizationResult] = None
+) -> Any:
+    """
+    Map func over data and reduce the results, reducing chunks inside workers.
+
+    Args:
+        func: The map function
+        combine: Reducer called as combine(accumulator, result)
+        data: Iterable of input data. Iterators and generators are
+            materialized into a list first.
+        initial: Identity accumulator each chunk starts from (default: the
+            chunk's first result)
+        merge: Reducer for two partials, called as merge(partial, partial)
+            in the parent (default: combine)
+        sample_size: Number of items to sample for timing (default: 5)
+        target_chunk_duration: Target duration per chunk in seconds (default: 0.2)
+        verbose: If True, print detailed information
+        starmap: If True, call func(*item) like Pool.starmap (default: False)
+        func_kwargs: Keyword arguments passed to every call (default: None)
+        result: A previous OptimizationResult to reuse instead of optimizing
+
+    Returns:
+        The reduced value, or initial when data is empty
+
+    Example:
+        >>> import operator
+        >>> from collections import Counter
+        >>> def count_tld(domain):
+        ...     return Counter([domain.rsplit(".", 1)[-1]])
+        >>> totals = execute_reduce(count_tld, operator.add, domains,
+        ...                         initial=Counter())
+    """
+    if not hasattr(data, '__len__'):
+        data = list(data)
+
+    if len(data) == 0:
+        return initial
+
+    if result is None:
+        result = optimize_reduce(
+            func,
+            combine,
+            data,
+            initial=initial,
+            sample_size=sample_size,
+            target_chunk_duration=target_chunk_duration,
+            verbose=verbose,
+            starmap=starmap,
+            func_kwargs=func_kwargs
+        )
+
+    call = bind_kwargs(func, func_kwargs)
+
+    if result.n_jobs <= 1:
+        return _fold(call, combine, initial, data, starmap)
+
+    if result.schedule == "guided":
+        sizes = guided_chunk_sizes(len(data), result.n_jobs, result.chunksize)
+    else:
+        sizes = result.chunksize
+
+    reducer = _ChunkReducer(call, combine, initial, starmap)
+    with Pool(processes=result.n_jobs) as pool:
+        partials = pool.imap(reducer, iter_chunks(data, sizes))
+        return functools.reduce(merge or combine, partials)
@@ -3,11 +3,36 @@ Sampling module for performing dry runs and measuring function performance.
 """
 
 import sys
+import copy
+import math
 import time
+import inspect
 import pickle
-import tracemalloc
-from typing import Any, Callable, Iterator, List, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 import itertools
+import threading
+
+from .arguments import bind_kwargs, call_with_args
+from .memory_probe import trace_memory
+
+# Calls faster than this are repeated until a batch takes at least this long
+MIN_MEASURE_TIME = 0.002
+
+# Timed batches per measurement - the fastest is the least disturbed
+MEASURE_REPEATS = 3
+
+# Share of a time budget that timing the function's pickling may use
+PICKLE_BUDGET_SHARE = 0.1
+
+# Items whose size is read to estimate the dataset's size distribution
+MAX_SIZE_SAMPLES = 1000
+
+# z-score of the confidence interval behind SamplingResult.confidence (95%)
+CONFIDENCE_Z = 1.96
+
+# A time-budgeted dry run stops once the mean item time is known to within
+# this relative 95% interval half-width
+BUDGET_HALF_WIDTH = 0.1
 
 
 class SamplingResult:
@@ -20,7 +45,18 @@ class SamplingResult:
         peak_memory: int,
         sample_count: int,
         is_picklable: bool,
-        error: Exception = None
+        error: Exception = None,
+        input_size: int = 0,
+        partial_size: int = 0,
+        init_time: float = 0.0,
+        init_memory: int = 0,
+        time_std: float = 0.0,
+        item_times: Optional[List[float]] = None,
+        item_sizes: Optional[List[float]] = None,
+        func_size: int = 0,
+        func_pickle_time: float = 0.0,
+        censored: bool = False,
+        confidence: float = 1.0
     ):
         self.avg_time = avg_time
         self.return_size = return_size
@@ -28,6 +64,19 @@ class SamplingResult:
         self.sample_count = sample_count
         self.is_picklable = is_picklable
         self.error = error
+        self.input_size = input_size
+        self.partial_size = partial_size
+        self.init_time = init_time
+        self.init_memory = init_memory
+        self.time_std = time_std
+        self.item_times = item_times or []
+        self.item_sizes = item_sizes or []
+        self.func_size = func_size
+        self.func_pickle_time = func_pickle_time
+        # The last item was still running at the time budget, so avg_time
+        # is a lower bound
+        self.censored = censored
+        self.confidence = confidence
 
 
 def check_picklability(func: Callable) -> bool:
@@ -47,6 +96,275 @@ def check_picklability(func: Callable) -> bool:
         return False
 
 
+def _fits(deadline: Optional[float], duration: float) -> bool:
+    """Check whether work of the given duration, started now, ends by the deadline."""
+    return deadline is None or time.perf_counter() + duration <= deadline
+
+
+def measure_pickle_cost(
+    obj: Any,
+    min_time: float = MIN_MEASURE_TIME,
+    deadline: Optional[float] = None
+) -> Tuple[int, float]:
+    """
+    Measure the pickled size of an object and the time to pickle it.
+    
+    Pool.map pickles the callable into every task chunk, so for bound
+    methods, functools.partial objects and closures over large state this
+    is paid once per chunk. Pickling is repeated until a batch takes at
+    least min_time, and the fastest of MEASURE_REPEATS batches is kept.
+    Batches that would end after the deadline are not started.
+    
+    Args:
+        obj: Object to pickle (e.g. the function with its bound arguments)
+        min_time: Minimum duration of the timed batch in seconds
+        deadline: time.perf_counter() value to finish by (default: None)
+    
+    Returns:
+        Tuple of (pickled size in bytes, seconds per pickle), or (0, 0.0)
+        if the object cannot be pickled
+    """
+    try:
+        size = len(pickle.dumps(obj))
+    except Exception:
+        return 0, 0.0
+    
+    number = 1
+    while True:
+        start_time = time.perf_counter()
+        for _ in range(number):
+            pickle.dumps(obj)
+        elapsed = time.perf_counter() - start_time
+        if elapsed >= min_time or not _fits(deadline, 2 * elapsed):
+            break
+        number *= 2
+    for _ in range(MEASURE_REPEATS - 1):
+        if not _fits(deadline, elapsed):
+            break
+        start_time = time.perf_counter()
+        for _ in range(number):
+            pickle.dumps(obj)
+        elapsed = min(elapsed, time.perf_counter() - start_time)
+    return size, elapsed / number
+
+
+def sample_confidence(times: List[float], censored: bool = False) -> float:
+    """
+    Confidence in the mean of sampled item times.
+    
+    Computed as 1 / (1 + h), where h is the relative half-width of the 95%
+    confidence interval of the mean: 1.0 for identical times, 0.5 when the
+    mean is only known to within +-100%. A single item has unknown spread
+    and scores 0.5; a censored sample (an item still running at the time
+    budget) only bounds the mean from below and scores 0.
+    
+    Args:
+        times: Sampled item times in seconds
+        censored: Whether the last time is a lower bound
+    
+    Returns:
+        Confidence in [0, 1]
+    """
+    if censored or not times:
+        return 0.0
+    return 1.0 / (1.0 + _relative_half_width(times))
+
+
+def _relative_half_width(times: List[float]) -> float:
+    """Half-width of the 95% interval of the mean, relative to the mean (1.0 for one item)."""
+    if len(times) < 2:
+        return 1.0
+    mean = sum(times) / len(times)
+    if mean <= 0:
+        return 0.0
+    std = math.sqrt(sum((t - mean) ** 2 for t in times) / (len(times) - 1))
+    return CONFIDENCE_Z * std / (mean * math.sqrt(len(times)))
+
+
+def payload_size(obj: Any) -> int:
+    """
+    Size of obj when sent to another process.
+    
+    Args:
+        obj: Object to measure
+    
+    Returns:
+        Pickled size in bytes, or the in-memory size if it cannot be pickled
+    """
+    try:
+        return len(pickle.dumps(obj))
+    except:
+        return sys.getsizeof(obj)
+
+
+class _SampleTimeout(Exception):
+    """A sampled call was still running when the time budget ran out."""
+
+
+def _timed_call(
+    call: Callable[..., Any],
+    item: Any,
+    starmap: bool,
+    timeout: Optional[float] = None
+) -> Tuple[Any, float]:
+    """
+    Call and time call on item, giving up after timeout seconds.
+    
+    With a timeout the call runs in a daemon thread. A call still running
+    at the timeout cannot be interrupted - it finishes in the background
+    and its result is discarded.
+    
+    Returns:
+        Tuple of (result, seconds)
+    
+    Raises:
+        _SampleTimeout: If the call did not finish within the timeout
+    """
+    if timeout is None:
+        start_time = time.perf_counter()
+        result = call_with_args(call, item, starmap)
+        return result, time.perf_counter() - start_time
+    
+    outcome = {}
+    
+    def run():
+        start_time = time.perf_counter()
+        try:
+            outcome["result"] = call_with_args(call, item, starmap)
+        except BaseException as e:
+            outcome["error"] = e
+        outcome["time"] = time.perf_counter() - start_time
+    
+    thread = threading.Thread(target=run, name="amorsize-sample", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise _SampleTimeout()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"], outcome["time"]
+
+
+def _time_empty_loop(number: int) -> float:
+    """Time a loop of number iterations with an empty body."""
+    start_time = time.perf_counter()
+    for _ in range(number):
+        pass
+    return time.perf_counter() - start_time
+
+
+def _time_calls(call: Callable[..., Any], item: Any, starmap: bool, number: int) -> float:
+    """Time number back-to-back calls of call on item."""
+    start_time = time.perf_counter()
+    for _ in range(number):
+        call_with_args(call, item, starmap)
+    return time.perf_counter() - start_time
+
+
+def measure_call_time(
+    call: Callable[..., Any],
+    item: Any,
+    starmap: bool = False,
+    min_time: float = MIN_MEASURE_TIME,
+    deadline: Optional[float] = None
+) -> float:
+    """
+    Measure the time of a single call, even when it is shorter than the timer can resolve.
+    
+    Like timeit.Timer.autorange, the call is repeated 1, 2, 5, 10, 20, ...
+    times until a batch takes at least min_time. The batch is timed
+    MEASURE_REPEATS times and the fastest run is kept. As in timeit, only
+    the time of an empty loop of the same length is subtracted, so loop and
+    timer overhead are not counted as work while the call itself is. Should
+    the subtraction leave nothing, the raw batch time is reported instead.
+    Batches that would end after the deadline are not started, so a short
+    budget gets a noisier time from the first batch.
+    
+    Args:
+        call: Function to time
+        item: Argument (or argument tuple when starmap is True)
+        starmap: If True, call func(*item)
+        min_time: Minimum duration of the timed batch in seconds
+        deadline: time.perf_counter() value to finish by (default: None)
+    
+    Returns:
+        Estimated time per call in seconds
+    """
+    number = 1
+    multipliers = itertools.cycle((2, 2.5, 2))
+    while True:
+        elapsed = _time_calls(call, item, starmap, number)
+        if elapsed >= min_time:
+            break
+        multiplier = next(multipliers)
+        if not _fits(deadline, elapsed * multiplier):
+            break
+        number = int(number * multiplier)
+    
+    for _ in range(MEASURE_REPEATS - 1):
+        if not _fits(deadline, elapsed):
+            break
+        elapsed = min(elapsed, _time_calls(call, item, starmap, number))
+    overhead = min(_time_empty_loop(number) for _ in range(MEASURE_REPEATS))
+    if overhead >= elapsed:
+        return elapsed / number
+    return (elapsed - overhead) / number
+
+
+def item_size(item: Any, starmap: bool = False) -> float:
+    """
+    Size of an item as a feature that work may scale with.
+    
+    Numbers count as their magnitude (e.g. a matrix dimension), sized
+    objects as their len() and anything else as its pickled size. For
+    starmap argument tuples the largest argument is used.
+    
+    Args:
+        item: Input item
+        starmap: If True, item is a tuple of positional arguments
+    
+    Returns:
+        Item size
+    """
+    if starmap and isinstance(item, tuple):
+        return max((item_size(arg) for arg in item), default=0.0)
+    if isinstance(item, (int, float)) and not isinstance(item, bool):
+        return abs(float(item))
+    if hasattr(item, '__len__'):
+        try:
+            return float(len(item))
+        except TypeError:
+            pass
+    try:
+        return float(len(pickle.dumps(item)))
+    except Exception:
+        return float(sys.getsizeof(item))
+
+
+def sample_item_sizes(
+    data: Union[List, Iterator],
+    starmap: bool = False,
+    max_items: int = MAX_SIZE_SAMPLES
+) -> List[float]:
+    """
+    Sizes of items spread evenly across a sized dataset.
+    
+    Args:
+        data: Sized input data (indexable data is sampled with a stride,
+            other sized data is read in full)
+        starmap: If True, items are tuples of positional arguments
+        max_items: Maximum number of items to read from indexable data
+    
+    Returns:
+        List of item sizes
+    """
+    if hasattr(data, '__getitem__') and hasattr(data, '__len__'):
+        total = len(data)
+        step = max(1, total // max_items)
+        return [item_size(data[index], starmap) for index in range(0, total, step)]
+    return [item_size(item, starmap) for item in data]
+
+
 def safe_slice_data(data: Union[List, Iterator], sample_size: int) -> Tuple[List, bool]:
     """
     Safely extract a sample from data without consuming generators.
@@ -72,9 +390,16 @@ def safe_slice_data(data: Union[List, Iterator], sample_size: int) -> Tuple[List
 
 
 def perform_dry_run(
-    func: Callable[[Any], Any],
+    func: Callable[..., Any],
     data: Union[List, Iterator],
-    sample_size: int = 5
+    sample_size: int = 5,
+    starmap: bool = False,
+    func_kwargs: Optional[Dict[str, Any]] = None,
+    combine: Optional[Callable[[Any, Any], Any]] = None,
+    initial: Any = None,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: Tuple = (),
+    max_time: Optional[float] = None
 ) -> SamplingResult:
     """
     Perform a dry run of the function on a small sample of data.
@@ -83,12 +408,54 @@ def perform_dry_run(
         func: The function to test
         data: The input data
         sample_size: Number of items to sample (default: 5)
+        starmap: If True, each item is a tuple of positional arguments
+        func_kwargs: Keyword arguments passed to every call
+        combine: Optional reducer. Results are folded as they are produced,
+            the fold time is included in avg_time and the pickled size of
+            the accumulated value is reported as partial_size.
+        initial: Initial accumulator for combine (default: first result)
+        initializer: Optional per-worker setup function. It is run once
+            before the sample, and its time and retained memory are reported
+            as init_time and init_memory.
+        initargs: Arguments for initializer (default: ())
+        max_time: Time budget in seconds (default: None, no limit). Items
+            are then sampled until the mean time is known to within
+            BUDGET_HALF_WIDTH, or until the next item would overrun the
+            budget. Each call runs in a helper thread, and a call still
+            running when the budget is spent is abandoned: its time so far
+            becomes a lower bound on the item time (result.censored).
+            Timing the function's pickling (at most PICKLE_BUDGET_SHARE of
+            the budget) and re-timing short calls in batches stop at the
+            budget too.
     
     Returns:
         SamplingResult with timing and memory information
     """
-    # Check if function is picklable
-    is_picklable = check_picklability(func)
+    deadline = None if max_time is None else time.perf_counter() + max_time
+    # Check if function (with any bound keyword arguments) is picklable
+    call = bind_kwargs(func, func_kwargs)
+    is_picklable = check_picklability(call)
+    # The function is pickled into every task chunk sent to the workers
+    if is_picklable:
+        pickle_deadline = None
+        if deadline is not None:
+            pickle_deadline = time.perf_counter() + max_time * PICKLE_BUDGET_SHARE
+        func_size, func_pickle_time = measure_pickle_cost(call, deadline=pickle_deadline)
+    else:
+        func_size, func_pickle_time = 0, 0.0
+    
+    # Calling a coroutine function only creates the coroutine object
+    if inspect.iscoroutinefunction(func):
+        return SamplingResult(
+            avg_time=0.0,
+            return_size=0,
+            peak_memory=0,
+            sample_count=0,
+            is_picklable=is_picklable,
+            error=TypeError(
+                "Coroutine functions cannot be timed synchronously - use optimize_async()"
+            )
+        )
     
     # Get sample data
     try:
@@ -113,49 +480,159 @@ def perform_dry_run(
             error=ValueError("Empty data sample")
         )
     
-    # Start memory tracking
-    tracemalloc.start()
+    # Run the per-worker initializer first - the sampled calls may depend on it
+    init_time = 0.0
+    init_memory = 0
+    if initializer is not None:
+        try:
+            with trace_memory() as probe:
+                start_time = time.perf_counter()
+                initializer(*initargs)
+                init_time = time.perf_counter() - start_time
+            # Memory still held after setup stays resident in every worker
+            init_memory = probe.current
+        except Exception as e:
+            return SamplingResult(
+                avg_time=0.0,
+                return_size=0,
+                peak_memory=0,
+                sample_count=0,
+                is_picklable=is_picklable,
+                error=e
+            )
     
     try:
-        times = []
-        return_sizes = []
-        
-        for item in sample:
-            # Measure execution time
-            start_time = time.perf_counter()
-            result = func(item)
-            end_time = time.perf_counter()
-            
-            times.append(end_time - start_time)
+        # Measure memory without disturbing other tracemalloc users
+        with trace_memory() as probe:
+            times = []
+            # Fold time per item, and the result folded (None if not folded)
+            combine_times = []
+            folded = []
+            return_sizes = []
+            input_sizes = []
+            item_sizes = []
+            accumulator = copy.deepcopy(initial)
+            censored = False
             
-            # Measure return object size
-            try:
-                # Try to pickle the result to get realistic size
-                pickled = pickle.dumps(result)
-                return_sizes.append(len(pickled))
-            except:
-                # Fallback to sys.getsizeof
-                return_sizes.append(sys.getsizeof(result))
+            loop_started = time.perf_counter()
+            for index, item in enumerate(sample):
+                timeout = None
+                if deadline is not None:
+                    remaining = deadline - time.perf_counter()
+                    if times:
+                        # Stop once the mean is known well enough, or
+                        # before an average item - with its sizing and
+                        # bookkeeping - would overrun the budget
+                        step = (time.perf_counter() - loop_started) / len(times)
+                        if remaining < step or _relative_half_width(times) <= BUDGET_HALF_WIDTH:
+                            break
+                    # The first item is always given a moment to finish
+                    timeout = max(remaining, MIN_MEASURE_TIME)
+                
+                # Measure execution time
+                start_time = time.perf_counter()
+                try:
+                    result, call_time = _timed_call(call, item, starmap, timeout)
+                except _SampleTimeout:
+                    # The item takes at least as long as it has run so far
+                    censored = True
+                    times.append(time.perf_counter() - start_time)
+                    if combine is not None:
+                        combine_times.append(0.0)
+                        folded.append(None)
+                    input_sizes.append(payload_size(item))
+                    item_sizes.append(item_size(item, starmap))
+                    break
+                if combine is not None:
+                    if index == 0 and initial is None:
+                        accumulator = result
+                        combine_times.append(0.0)
+                        folded.append(None)
+                    else:
+                        fold_start = time.perf_counter()
+                        accumulator = combine(accumulator, result)
+                        combine_times.append(time.perf_counter() - fold_start)
+                        folded.append(result)
+                
+                times.append(call_time)
+                
+                # Measure return object size
+                try:
+                    # Try to pickle the result to get realistic size
+                    pickled = pickle.dumps(result)
+                    return_sizes.append(len(pickled))
+                except:
+                    # Fallback to sys.getsizeof
+                    return_sizes.append(sys.getsizeof(result))
+                
+                # Measure the argument payload sent to workers
+                input_sizes.append(payload_size(item))
+                item_sizes.append(item_size(item, starmap))
+        peak = probe.peak
         
-        # Get peak memory usage
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
+        # A single reading of a microsecond call is mostly timer and loop
+        # overhead - re-time those calls in batches (outside tracemalloc).
+        # Only when every call is that short, so that per-item times stay
+        # comparable with each other. A call that no longer fits in the
+        # budget keeps its single reading.
+        if all(t < MIN_MEASURE_TIME for t in times):
+            times = [
+                measure_call_time(call, item, starmap, deadline=deadline)
+                if _fits(deadline, t) else t
+                for item, t in zip(sample, times)
+            ]
+            if combine is not None:
+                # The folds are as short - batch them too, into a copy of
+                # the accumulator so the real one is left as it was
+                combine_times = [
+                    0.0 if result is None else measure_call_time(
+                        combine, (copy.deepcopy(accumulator), result), starmap=True,
+                        deadline=deadline
+                    ) if _fits(deadline, c) else c
+                    for result, c in zip(folded, combine_times)
+                ]
+        if combine is not None:
+            times = [t + c for t, c in zip(times, combine_times)]
         
         # Calculate averages
         avg_time = sum(times) / len(times) if times else 0.0
+        if len(times) > 1:
+            time_std = math.sqrt(
+                sum((t - avg_time) ** 2 for t in times) / (len(times) - 1)
+            )
+        else:
+            time_std = 0.0
         avg_return_size = sum(return_sizes) // len(return_sizes) if return_sizes else 0
+        avg_input_size = sum(input_sizes) // len(input_sizes) if input_sizes else 0
+        
+        partial_size = 0
+        if combine is not None:
+            try:
+                partial_size = len(pickle.dumps(accumulator))
+            except:
+                partial_size = sys.getsizeof(accumulator)
         
         return SamplingResult(
             avg_time=avg_time,
             return_size=avg_return_size,
             peak_memory=peak,
-            sample_count=len(sample),
+            sample_count=len(times),
             is_picklable=is_picklable,
-            error=None
+            error=None,
+            input_size=avg_input_size,
+            partial_size=partial_size,
+            init_time=init_time,
+            init_memory=init_memory,
+            time_std=time_std,
+            item_times=times,
+            item_sizes=item_sizes,
+            func_size=func_size,
+            func_pickle_time=func_pickle_time,
+            censored=censored,
+            confidence=sample_confidence(times, censored)
         )
     
     except Exception as e:
-        tracemalloc.stop()
         return SamplingResult(
             avg_time=0.0,
             return_size=0,
@@ -0,0 +1,143 @@
+"""
+Scheduling module for the chunk-size schedules used to execute a parallel map.
+"""
+
+import heapq
+import itertools
+import math
+from typing import Iterable, Iterator, List, Sequence, Union
+
+# "static": equal chunks of the recommended chunksize
+# "guided": chunks start large and shrink towards a minimum (OpenMP-style)
+# "dynamic": small equal chunks handed to whichever worker is free
+# "lpt": chunks balanced by predicted item cost, most expensive items first
+SCHEDULES = ("static", "guided", "dynamic", "lpt")
+
+# Item-time variation (std / mean) above which each schedule is chosen
+GUIDED_CV = 0.5
+DYNAMIC_CV = 1.5
+
+# A guided chunk is remaining / (GUIDED_SCALE * n_jobs) items
+GUIDED_SCALE = 2
+
+# Largest share of a chunk's time that may be spent dispatching it
+MAX_DISPATCH_OVERHEAD = 0.05
+
+
+def choose_schedule(time_cv: float) -> str:
+    """
+    Choose a chunk schedule from the variation of the sampled item times.
+
+    Uniform items are best served by equal chunks. Moderately variable
+    items benefit from guided chunks, whose small final chunks fill the
+    tail, and heavy-tailed items from small dynamic chunks throughout.
+
+    Args:
+        time_cv: Coefficient of variation (std / mean) of the per-item time
+
+    Returns:
+        "static", "guided" or "dynamic"
+    """
+    if time_cv >= DYNAMIC_CV:
+        return "dynamic"
+    if time_cv >= GUIDED_CV:
+        return "guided"
+    return "static"
+
+
+def min_chunksize_for_overhead(
+    avg_time: float,
+    chunk_overhead: float,
+    max_overhead: float = MAX_DISPATCH_OVERHEAD
+) -> int:
+    """
+    Smallest chunk whose dispatch overhead stays within a share of its run time.
+
+    Args:
+        avg_time: Average time per item in seconds
+        chunk_overhead: Fixed dispatch cost per chunk in seconds
+        max_overhead: Largest acceptable overhead / chunk time ratio
+
+    Returns:
+        Minimum number of items per chunk
+    """
+    if avg_time <= 0:
+        return 1
+    # Round first so float noise does not push an exact ratio up by one
+    return max(1, math.ceil(round(chunk_overhead / (max_overhead * avg_time), 9)))
+
+
+def guided_chunk_sizes(total_items: int, n_jobs: int, min_chunksize: int = 1) -> List[int]:
+    """
+    Chunk sizes for a guided schedule.
+
+    Each chunk takes remaining / (GUIDED_SCALE * n_jobs) items, so early
+    chunks are large and cheap to dispatch while the final ones are small
+    enough for the workers to finish together.
+
+    Args:
+        total_items: Number of items
+        n_jobs: Number of workers
+        min_chunksize: Smallest chunk size
+
+    Returns:
+        Sizes of consecutive chunks, summing to total_items
+    """
+    sizes = []
+    remaining = total_items
+    while remaining > 0:
+        size = max(min_chunksize, -(-remaining // (GUIDED_SCALE * max(1, n_jobs))))
+        size = min(size, remaining)
+        sizes.append(size)
+        remaining -= size
+    return sizes
+
+
+def lpt_partition(costs: Sequence[float], n_chunks: int) -> List[List[int]]:
+    """
+    Partition items into chunks of balanced total cost (longest processing time first).
+
+    Items are taken from most to least expensive and each goes to the
+    chunk with the lowest total so far, which keeps every chunk within one
+    item's cost of the others.
+
+    Args:
+        costs: Predicted cost of each item
+        n_chunks: Number of chunks
+
+    Returns:
+        Lists of item indices, most expensive chunk first; empty chunks
+        are dropped
+    """
+    n_chunks = max(1, min(n_chunks, len(costs)))
+    chunks = [[] for _ in range(n_chunks)]
+    loads = [0.0] * n_chunks
+    heap = [(0.0, index) for index in range(n_chunks)]
+    for item in sorted(range(len(costs)), key=costs.__getitem__, reverse=True):
+        load, index = heapq.heappop(heap)
+        chunks[index].append(item)
+        loads[index] = load + costs[item]
+        heapq.heappush(heap, (loads[index], index))
+    order = sorted(range(n_chunks), key=loads.__getitem__, reverse=True)
+    return [chunks[index] for index in order if chunks[index]]
+
+
+def iter_chunks(data: Union[List, Iterator], sizes: Union[int, Iterable[int]]) -> Iterator[List]:
+    """
+    Yield consecutive lists of items.
+
+    Args:
+        data: Iterable of input data
+        sizes: A fixed chunk size, or the size of each consecutive chunk
+
+    Yields:
+        Lists of items; the last chunk may be shorter
+    """
+    if isinstance(sizes, int):
+        sizes = itertools.repeat(sizes)
+    iterator = iter(data)
+    for size in sizes:
+        chunk = list(itertools.islice(iterator, max(1, size)))
+        if not chunk:
+            return
+        yield chunk
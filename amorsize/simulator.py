@@ -0,0 +1,203 @@
+"""
+Simulator module for predicting pool execution with a discrete-event model.
+"""
+
+import heapq
+import math
+import random
+from typing import List, Optional, Sequence
+
+# Chunks with more items than this draw their time from a normal approximation
+EXACT_DRAW_ITEMS = 32
+
+# Plans with more chunks than this are not simulated
+MAX_SIMULATED_CHUNKS = 20000
+
+# Rough time to simulate one drawn item or chunk, for planning within a time budget
+SIMULATION_STEP_TIME = 3e-6
+
+
+class SimulationResult:
+    """Outcome of a simulated parallel map."""
+
+    def __init__(
+        self,
+        makespan: float,
+        n_jobs: int,
+        n_chunks: int,
+        worker_busy: List[float],
+        parent_busy: float
+    ):
+        self.makespan = makespan
+        self.n_jobs = n_jobs
+        self.n_chunks = n_chunks
+        self.worker_busy = worker_busy
+        self.parent_busy = parent_busy
+
+    @property
+    def utilization(self) -> float:
+        """Share of the workers' time spent running items."""
+        if self.makespan <= 0:
+            return 0.0
+        return sum(self.worker_busy) / (self.n_jobs * self.makespan)
+
+    def __repr__(self):
+        return (
+            f"SimulationResult(makespan={self.makespan:.4f}, n_jobs={self.n_jobs}, "
+            f"utilization={self.utilization:.2f})"
+        )
+
+    def __str__(self):
+        return (
+            f"Simulated makespan: {self.makespan:.2f}s over {self.n_chunks} chunks, "
+            f"{self.utilization:.0%} worker utilization, "
+            f"parent busy {self.parent_busy:.2f}s"
+        )
+
+
+def sample_chunk_times(
+    item_times: Sequence[float],
+    chunk_sizes: Sequence[int],
+    seed: int = 0
+) -> List[float]:
+    """
+    Draw chunk durations from the sampled item times.
+
+    Small chunks sum item times drawn with replacement; larger chunks use
+    the normal approximation of such a sum, so the cost does not grow with
+    the number of items.
+
+    Args:
+        item_times: Sampled item times in seconds
+        chunk_sizes: Number of items in each chunk
+        seed: Seed for the random draws, so predictions are repeatable
+
+    Returns:
+        Duration of each chunk in seconds
+    """
+    rng = random.Random(seed)
+    mean = sum(item_times) / len(item_times)
+    std = (
+        math.sqrt(sum((t - mean) ** 2 for t in item_times) / (len(item_times) - 1))
+        if len(item_times) > 1 else 0.0
+    )
+    times = []
+    for size in chunk_sizes:
+        if size <= EXACT_DRAW_ITEMS:
+            times.append(sum(rng.choice(item_times) for _ in range(size)))
+        else:
+            times.append(max(0.0, rng.gauss(size * mean, math.sqrt(size) * std)))
+    return times
+
+
+def estimate_simulation_time(n_chunks: int, total_items: int) -> float:
+    """
+    Roughly predict how long simulate_plan() takes, without building the chunks.
+
+    Args:
+        n_chunks: Number of chunks
+        total_items: Number of items across the chunks
+
+    Returns:
+        Predicted simulation time in seconds
+    """
+    # At most EXACT_DRAW_ITEMS draws per chunk, plus its dispatch event
+    steps = n_chunks + min(total_items, n_chunks * EXACT_DRAW_ITEMS)
+    return steps * SIMULATION_STEP_TIME
+
+
+def simulate_pool(
+    chunk_times: Sequence[float],
+    n_jobs: int,
+    dispatch_times: Sequence[float],
+    collect_times: Sequence[float],
+    startup_time: float = 0.0
+) -> SimulationResult:
+    """
+    Replay chunks through a model of multiprocessing.Pool.
+
+    The parent pickles and sends chunks one after another in a single
+    task-handler thread, so chunk i cannot start before the first i
+    dispatches are done. Each free worker takes the next dispatched chunk.
+    A single result-handler thread unpickles results in completion order,
+    and the map ends when the last result has been collected.
+
+    Args:
+        chunk_times: Duration of each chunk in the workers, in dispatch order
+        n_jobs: Number of workers
+        dispatch_times: Parent time to send each chunk
+        collect_times: Parent time to receive each chunk's results
+        startup_time: Time until the workers are ready
+
+    Returns:
+        SimulationResult
+    """
+    n_jobs = max(1, n_jobs)
+    workers = [(startup_time, worker) for worker in range(n_jobs)]
+    heapq.heapify(workers)
+    worker_busy = [0.0] * n_jobs
+    completions = []
+    dispatched = 0.0
+
+    for chunk_time, dispatch_time in zip(chunk_times, dispatch_times):
+        dispatched += dispatch_time
+        free_at, worker = heapq.heappop(workers)
+        finish = max(free_at, dispatched) + chunk_time
+        worker_busy[worker] += chunk_time
+        heapq.heappush(workers, (finish, worker))
+        completions.append(finish)
+
+    # Results are collected one at a time, in the order they complete
+    collected = 0.0
+    for finish, collect_time in sorted(zip(completions, collect_times)):
+        collected = max(collected, finish) + collect_time
+
+    return SimulationResult(
+        makespan=max(collected, startup_time),
+        n_jobs=n_jobs,
+        n_chunks=len(completions),
+        worker_busy=worker_busy,
+        parent_busy=sum(dispatch_times) + sum(collect_times)
+    )
+
+
+def simulate_plan(
+    item_times: Sequence[float],
+    chunk_sizes: Sequence[int],
+    n_jobs: int,
+    chunk_overhead: float,
+    input_bytes_time: float = 0.0,
+    result_bytes_time: float = 0.0,
+    partial_time: Optional[float] = None,
+    startup_time: float = 0.0,
+    chunk_times: Optional[Sequence[float]] = None,
+    seed: int = 0
+) -> SimulationResult:
+    """
+    Simulate a plan given its chunk sizes and per-item costs.
+
+    Args:
+        item_times: Sampled item times in seconds
+        chunk_sizes: Number of items in each chunk, in dispatch order
+        n_jobs: Number of workers
+        chunk_overhead: Fixed parent cost per chunk in seconds
+        input_bytes_time: IPC time to send one item's arguments
+        result_bytes_time: IPC time to receive one item's result
+        partial_time: IPC time to receive a chunk's reduced partial result,
+            replacing the per-item result time (map-reduce)
+        startup_time: Time until the workers are ready
+        chunk_times: Known chunk durations (e.g. from predicted item costs)
+            instead of drawing them from item_times
+        seed: Seed for the random draws
+
+    Returns:
+        SimulationResult
+    """
+    if chunk_times is None:
+        chunk_times = sample_chunk_times(item_times, chunk_sizes, seed)
+    dispatch_times = [chunk_overhead + size * input_bytes_time for size in chunk_sizes]
+    if partial_time is not None:
+        collect_times = [partial_time] * len(chunk_sizes)
+    else:
+        collect_times = [size * result_bytes_time for size in chunk_sizes]
+    return simulate_pool(chunk_times, n_jobs, dispatch_times, collect_times, startup_time)
@@ -0,0 +1,219 @@
+"""
+Surface module for predicting runtime over a grid of n_jobs and chunksize.
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Chunk sizes per factor of 10 in the log-spaced grid
+CHUNKSIZES_PER_DECADE = 4
+
+
+def log_spaced_chunksizes(
+    total_items: int,
+    per_decade: int = CHUNKSIZES_PER_DECADE,
+    include: Sequence[int] = ()
+) -> List[int]:
+    """
+    Log-spaced chunk sizes from 1 to total_items.
+
+    Args:
+        total_items: Number of items (the largest chunk size)
+        per_decade: Chunk sizes per factor of 10
+        include: Extra chunk sizes to add to the grid
+
+    Returns:
+        Sorted, distinct chunk sizes
+    """
+    total_items = max(1, total_items)
+    steps = max(1, math.ceil(math.log10(total_items) * per_decade))
+    sizes = {round(total_items ** (step / steps)) for step in range(steps + 1)}
+    sizes.update(size for size in include if 1 <= size <= total_items)
+    return sorted(sizes)
+
+
+class RuntimeSurface:
+    """Predicted runtime, speedup and efficiency for every n_jobs and chunksize."""
+
+    def __init__(
+        self,
+        n_jobs: List[int],
+        chunksizes: List[int],
+        times,
+        serial_time: float
+    ):
+        self.n_jobs = n_jobs
+        self.chunksizes = chunksizes
+        self.times = times
+        self.serial_time = serial_time
+        if HAS_NUMPY and isinstance(times, np.ndarray):
+            self.speedup = serial_time / times
+            self.efficiency = self.speedup / np.asarray(n_jobs)[:, None]
+        else:
+            self.speedup = [[serial_time / time for time in row] for row in times]
+            self.efficiency = [
+                [speedup / n for speedup in row] for n, row in zip(n_jobs, self.speedup)
+            ]
+
+    def time(self, n_jobs: int, chunksize: int) -> float:
+        """
+        Predicted runtime of one point of the grid.
+
+        Args:
+            n_jobs: Number of workers (a value in self.n_jobs)
+            chunksize: Chunk size (a value in self.chunksizes)
+
+        Returns:
+            Predicted wall-clock seconds
+        """
+        return float(self.times[self.n_jobs.index(n_jobs)][self.chunksizes.index(chunksize)])
+
+    def best(self) -> Tuple[int, int, float]:
+        """
+        Fastest point of the grid.
+
+        Returns:
+            Tuple of (n_jobs, chunksize, predicted time)
+        """
+        points = (
+            (float(time), n, chunksize)
+            for n, row in zip(self.n_jobs, self.times)
+            for chunksize, time in zip(self.chunksizes, row)
+        )
+        time, n, chunksize = min(points)
+        return n, chunksize, time
+
+    def speedup_curve(self) -> List[float]:
+        """
+        Best speedup for each n_jobs, over all chunk sizes.
+
+        Returns:
+            Speedups, one per value in self.n_jobs
+        """
+        return [float(max(row)) for row in self.speedup]
+
+    def efficiency_curve(self) -> List[float]:
+        """
+        Parallel efficiency (speedup / n_jobs) of the best chunk size for each n_jobs.
+
+        Returns:
+            Efficiencies, one per value in self.n_jobs
+        """
+        return [speedup / n for speedup, n in zip(self.speedup_curve(), self.n_jobs)]
+
+    def flatness(self, tolerance: float = 0.1) -> float:
+        """
+        Share of the grid within a tolerance of the fastest time.
+
+        A large share means the optimum is flat and the exact parameters
+        matter little; a small share means it is sharp.
+
+        Args:
+            tolerance: Relative slack over the fastest time (default: 10%)
+
+        Returns:
+            Fraction of grid points in [0, 1]
+        """
+        limit = self.best()[2] * (1 + tolerance)
+        values = [float(time) for row in self.times for time in row]
+        return sum(1 for time in values if time <= limit) / len(values)
+
+    def __repr__(self):
+        return (
+            f"RuntimeSurface(n_jobs=1..{self.n_jobs[-1]}, "
+            f"chunksizes={len(self.chunksizes)})"
+        )
+
+    def __str__(self):
+        n_jobs, chunksize, time = self.best()
+        lines = [
+            f"Fastest: n_jobs={n_jobs}, chunksize={chunksize} ({time:.2f}s, "
+            f"serial {self.serial_time:.2f}s)",
+            f"Within 10% of the fastest: {self.flatness():.0%} of the grid",
+            "n_jobs  speedup  efficiency",
+        ]
+        for n, speedup, efficiency in zip(
+            self.n_jobs, self.speedup_curve(), self.efficiency_curve()
+        ):
+            lines.append(f"{n:>6}  {speedup:>6.2f}x  {efficiency:>9.0%}")
+        return "\n".join(lines)
+
+
+def compute_surface(
+    total_items: int,
+    avg_time: float,
+    startup_times: Sequence[float],
+    chunk_overhead: float,
+    serial_time: float,
+    chunksizes: Sequence[int],
+    time_cv: float = 0.0,
+    fixed_ipc_time: float = 0.0,
+    ipc_time_per_chunk: float = 0.0
+) -> RuntimeSurface:
+    """
+    Predict the runtime of equal-size chunks for every n_jobs and chunksize.
+
+    Uses the optimizer's model - startup, total work / n_jobs, straggler
+    tail, per-chunk dispatch and IPC - evaluated over the whole grid at
+    once with NumPy when it is installed.
+
+    Args:
+        total_items: Number of items
+        avg_time: Average time per item in seconds
+        startup_times: Worker startup time for n_jobs = 1, 2, ... (its
+            length sets the largest n_jobs)
+        chunk_overhead: Dispatch cost per chunk in seconds
+        serial_time: Predicted time of serial execution (the n_jobs=1 row)
+        chunksizes: Chunk sizes to evaluate
+        time_cv: Coefficient of variation of the per-item time
+        fixed_ipc_time: IPC time that does not depend on the chunk count
+        ipc_time_per_chunk: IPC time per chunk (reduced partial results)
+
+    Returns:
+        RuntimeSurface with one row per n_jobs and one column per chunksize
+    """
+    n_jobs = list(range(1, len(startup_times) + 1))
+    chunksizes = list(chunksizes)
+    total_time = avg_time * total_items
+
+    if HAS_NUMPY:
+        n = np.asarray(n_jobs, dtype=float)[:, None]
+        c = np.asarray(chunksizes, dtype=float)[None, :]
+        n_chunks = np.ceil(total_items / c)
+        busiest_items = np.minimum(total_items, np.ceil(n_chunks / n) * c)
+        imbalance = np.maximum(0.0, (busiest_items - total_items / n) * avg_time)
+        straggler = avg_time * time_cv * np.sqrt(c) * np.sqrt(2 * np.log(n))
+        times = (
+            np.asarray(startup_times, dtype=float)[:, None]
+            + total_time / n
+            + imbalance + straggler
+            + n_chunks * (chunk_overhead + ipc_time_per_chunk)
+            + fixed_ipc_time
+        )
+        times[0, :] = serial_time
+        return RuntimeSurface(n_jobs, chunksizes, times, serial_time)
+
+    times = []
+    for n, startup in zip(n_jobs, startup_times):
+        row = []
+        for chunksize in chunksizes:
+            if n == 1:
+                row.append(serial_time)
+                continue
+            n_chunks = -(-total_items // chunksize)
+            busiest_items = min(total_items, -(-n_chunks // n) * chunksize)
+            imbalance = max(0.0, (busiest_items - total_items / n) * avg_time)
+            straggler = avg_time * time_cv * math.sqrt(chunksize) * math.sqrt(2 * math.log(n))
+            row.append(
+                startup + total_time / n + imbalance + straggler
+                + n_chunks * (chunk_overhead + ipc_time_per_chunk)
+                + fixed_ipc_time
+            )
+        times.append(row)
+    return RuntimeSurface(n_jobs, chunksizes, times, serial_time)
@@ -4,7 +4,11 @@ System information module for detecting hardware and OS constraints.
 
 import os
 import platform
-from typing import Tuple
+import statistics
+import time
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+from typing import Dict, Optional, Tuple
 
 try:
     import psutil
@@ -51,6 +55,115 @@ def get_spawn_cost() -> float:
         return 0.15
 
 
+def get_ipc_cost_per_byte() -> float:
+    """
+    Estimate the cost of moving one byte between processes.
+    
+    Covers pickling, the pipe write/read and unpickling, which the parent
+    process performs serially for every task argument and result.
+    
+    Returns:
+        Estimated IPC cost in seconds per byte.
+    """
+    # Roughly 500MB/s end-to-end for pickle + pipe on commodity hardware
+    return 2e-9
+
+
+# Dispatch cost per chunk assumed until measure_chunk_overhead() has run:
+# roughly 100us per task for Pool.map on commodity hardware, less for threads
+DEFAULT_CHUNK_OVERHEAD = {"process": 1e-4, "thread": 2e-5}
+
+# Empty tasks timed by measure_chunk_overhead()
+CALIBRATION_TASKS = 50
+
+# Measured dispatch cost per backend, cached for the life of the process
+_chunk_overheads: Dict[str, float] = {}
+
+
+def get_chunk_overhead(backend: str = "process") -> float:
+    """
+    Estimate the fixed cost of dispatching one chunk to a worker.
+    
+    Covers building and pickling the task, the queue round trip and handing
+    the result back, which is paid per chunk regardless of its size.
+    
+    Args:
+        backend: "process" or "thread" (default: "process")
+    
+    Returns:
+        Estimated dispatch overhead in seconds per chunk - the value from
+        measure_chunk_overhead() once it has run, otherwise a default.
+    """
+    if backend in _chunk_overheads:
+        return _chunk_overheads[backend]
+    return DEFAULT_CHUNK_OVERHEAD.get(backend, DEFAULT_CHUNK_OVERHEAD["process"])
+
+
+def get_measured_chunk_overhead(backend: str = "process") -> Optional[float]:
+    """
+    Get the dispatch cost measured by measure_chunk_overhead() without measuring.
+    
+    Args:
+        backend: "process" or "thread" (default: "process")
+    
+    Returns:
+        The cached measurement, or None if the backend has not been measured
+    """
+    return _chunk_overheads.get(backend)
+
+
+def _empty_task():
+    return None
+
+
+def measure_chunk_overhead(
+    backend: str = "process",
+    tasks: int = CALIBRATION_TASKS,
+    refresh: bool = False
+) -> float:
+    """
+    Measure the round-trip latency of an empty task on this host.
+    
+    Starts a one-worker pool of the backend, waits for the worker, then
+    times tasks empty tasks one after another and keeps the median. The
+    result is cached per process and returned by get_chunk_overhead()
+    from then on.
+    
+    Args:
+        backend: "process" or "thread" (default: "process")
+        tasks: Number of timed round trips
+        refresh: Measure again instead of returning the cached value
+    
+    Returns:
+        Dispatch overhead in seconds per chunk
+    
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend not in DEFAULT_CHUNK_OVERHEAD:
+        raise ValueError(
+            f"Unknown backend {backend!r} - expected one of {sorted(DEFAULT_CHUNK_OVERHEAD)}"
+        )
+    if backend in _chunk_overheads and not refresh:
+        return _chunk_overheads[backend]
+    
+    pool = (Pool if backend == "process" else ThreadPool)(processes=1)
+    try:
+        # The first task waits for the worker to start
+        pool.apply(_empty_task)
+        times = []
+        for _ in range(max(1, tasks)):
+            start_time = time.perf_counter()
+            pool.apply(_empty_task)
+            times.append(time.perf_counter() - start_time)
+    finally:
+        pool.terminate()
+        pool.join()
+    
+    _chunk_overheads[backend] = statistics.median(times)
+    return _chunk_overheads[backend]
+
+
 def get_available_memory() -> int:
     """
     Get available system memory in bytes.
@@ -65,13 +178,60 @@ def get_available_memory() -> int:
     return 1024 * 1024 * 1024
 
 
-def calculate_max_workers(physical_cores: int, estimated_job_ram: int) -> int:
+def get_cache_size() -> int:
+    """
+    Get the size of the largest (last-level) CPU cache in bytes.
+
+    Returns:
+        Cache size in bytes. Returns a conservative default (8MB) if the
+        cache hierarchy cannot be read.
+    """
+    cache_root = "/sys/devices/system/cpu/cpu0/cache"
+    largest = 0
+
+    if os.path.isdir(cache_root):
+        for entry in os.listdir(cache_root):
+            size_path = os.path.join(cache_root, entry, "size")
+            try:
+                with open(size_path) as f:
+                    text = f.read().strip().upper()
+            except OSError:
+                continue
+
+            # Sizes are reported like "48K" or "32M"
+            multiplier = 1
+            if text.endswith("K"):
+                multiplier, text = 1024, text[:-1]
+            elif text.endswith("M"):
+                multiplier, text = 1024 * 1024, text[:-1]
+            try:
+                largest = max(largest, int(text) * multiplier)
+            except ValueError:
+                continue
+
+    if largest > 0:
+        return largest
+
+    # Conservative estimate if the cache hierarchy is unavailable (8MB)
+    return 8 * 1024 * 1024
+
+
+def calculate_max_workers(
+    physical_cores: int,
+    estimated_job_ram: int,
+    per_worker_ram: int = 0,
+    parent_ram: int = 0
+) -> int:
     """
     Calculate maximum number of workers based on memory constraints.
     
     Args:
         physical_cores: Number of physical CPU cores
         estimated_job_ram: Estimated RAM usage per job in bytes
+        per_worker_ram: RAM each worker holds for its whole lifetime, such as
+            a model loaded by a Pool initializer (default: 0)
+        parent_ram: RAM the parent process needs regardless of the number
+            of workers, such as the collected results (default: 0)
     
     Returns:
         Maximum number of workers
@@ -79,11 +239,12 @@ def calculate_max_workers(physical_cores: int, estimated_job_ram: int) -> int:
     available_ram = get_available_memory()
     
     # Leave some headroom (20%) for the system
-    usable_ram = int(available_ram * 0.8)
+    usable_ram = int(available_ram * 0.8) - parent_ram
     
     # Calculate memory-based limit
-    if estimated_job_ram > 0:
-        memory_limit = max(1, usable_ram // estimated_job_ram)
+    worker_ram = estimated_job_ram + per_worker_ram
+    if worker_ram > 0:
+        memory_limit = max(1, max(0, usable_ram) // worker_ram)
     else:
         memory_limit = physical_cores
     
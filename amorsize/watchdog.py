@@ -0,0 +1,226 @@
+"""
+Watchdog module for throttling parallel execution under memory pressure.
+"""
+
+import threading
+import time
+from typing import Optional
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+# Share of total RAM that must stay available while dispatching
+MIN_AVAILABLE_SHARE = 0.1
+
+# Threshold used when total RAM cannot be read (256MB)
+DEFAULT_MIN_AVAILABLE = 256 * 1024 * 1024
+
+# Percentage of the last 10s in which some task stalled on memory (PSI "some avg10")
+MAX_PRESSURE = 20.0
+
+# Dispatch resumes once available memory exceeds the threshold by this factor
+# and pressure falls below half of its limit, so it does not flap
+RESUME_MARGIN = 1.2
+
+# Longest pause in seconds before dispatch continues one chunk at a time
+MAX_PAUSE = 60.0
+
+
+def _read_meminfo(field: str) -> Optional[int]:
+    """Read a field of /proc/meminfo in bytes."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def read_available_memory() -> Optional[int]:
+    """
+    Read the memory currently available to new allocations.
+
+    Returns:
+        Available memory in bytes, or None if it cannot be read
+    """
+    if HAS_PSUTIL:
+        return psutil.virtual_memory().available
+    return _read_meminfo("MemAvailable")
+
+
+def read_total_memory() -> Optional[int]:
+    """
+    Read the total physical memory.
+
+    Returns:
+        Total memory in bytes, or None if it cannot be read
+    """
+    if HAS_PSUTIL:
+        return psutil.virtual_memory().total
+    return _read_meminfo("MemTotal")
+
+
+def read_memory_pressure() -> Optional[float]:
+    """
+    Read the memory pressure stall information of the kernel (Linux 4.20+).
+
+    Returns:
+        Percentage of the last 10 seconds in which at least one task was
+        stalled waiting for memory ("some avg10"), or None if unavailable
+    """
+    try:
+        with open("/proc/pressure/memory") as f:
+            for line in f:
+                if line.startswith("some"):
+                    for field in line.split()[1:]:
+                        key, _, value = field.partition("=")
+                        if key == "avg10":
+                            return float(value)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class MemoryWatchdog:
+    """
+    Background thread that watches available memory and memory pressure.
+
+    Dispatch is paused when available memory drops below min_available or
+    memory pressure exceeds max_pressure, and resumes once both have
+    recovered with some margin. execute(watchdog=...) stops submitting
+    chunks while paused, so a long job slows down instead of being killed
+    by the OOM killer; with retire_workers the pool is also shut down
+    while paused and restarted afterwards, returning its workers' memory.
+    A pause that outlasts max_pause no longer stops the job: it continues
+    with one chunk at a time, so pressure that never clears cannot hang it.
+
+    Example:
+        >>> results = execute(func, data, watchdog=MemoryWatchdog(retire_workers=True))
+    """
+
+    def __init__(
+        self,
+        min_available: Optional[int] = None,
+        max_pressure: float = MAX_PRESSURE,
+        interval: float = 0.25,
+        retire_workers: bool = False,
+        max_pause: Optional[float] = MAX_PAUSE
+    ):
+        if min_available is None:
+            total = read_total_memory()
+            min_available = int(total * MIN_AVAILABLE_SHARE) if total else DEFAULT_MIN_AVAILABLE
+        self.min_available = min_available
+        self.max_pressure = max_pressure
+        self.interval = interval
+        self.retire_workers = retire_workers
+        self.max_pause = max_pause
+        self.pauses = 0
+        self.paused_time = 0.0
+        self._clear = threading.Event()
+        self._clear.set()
+        self._paused_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def under_pressure(self) -> bool:
+        """True while dispatch should be paused."""
+        return not self._clear.is_set()
+
+    @property
+    def pause_exceeded(self) -> bool:
+        """True while a pause has lasted longer than max_pause."""
+        paused_at = self._paused_at
+        return (
+            self.max_pause is not None
+            and paused_at is not None
+            and time.monotonic() - paused_at >= self.max_pause
+        )
+
+    @property
+    def running(self) -> bool:
+        """True while the watchdog thread is polling."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def check(self) -> bool:
+        """
+        Poll memory once and update the paused state.
+
+        Returns:
+            True if dispatch should be paused
+        """
+        available = read_available_memory()
+        pressure = read_memory_pressure()
+        if self.under_pressure:
+            recovered = (
+                (available is None or available >= self.min_available * RESUME_MARGIN)
+                and (pressure is None or pressure < self.max_pressure / 2)
+            )
+            if recovered:
+                self.paused_time += time.monotonic() - self._paused_at
+                self._paused_at = None
+                self._clear.set()
+        else:
+            exceeded = (
+                (available is not None and available < self.min_available)
+                or (pressure is not None and pressure > self.max_pressure)
+            )
+            if exceeded:
+                self.pauses += 1
+                self._paused_at = time.monotonic()
+                self._clear.clear()
+        return self.under_pressure
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block while dispatch is paused.
+
+        Args:
+            timeout: Longest time to wait in seconds (default: no limit)
+
+        Returns:
+            True if dispatch may proceed
+        """
+        return self._clear.wait(timeout)
+
+    def start(self) -> "MemoryWatchdog":
+        """Start polling in a daemon thread."""
+        if not self.running:
+            self._stop.clear()
+            self.check()
+            self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling and release anyone waiting on the watchdog."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.under_pressure:
+            self.paused_time += time.monotonic() - self._paused_at
+            self._paused_at = None
+            self._clear.set()
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __repr__(self):
+        return (
+            f"MemoryWatchdog(min_available={self.min_available}, "
+            f"max_pressure={self.max_pressure}, max_pause={self.max_pause}, "
+            f"pauses={self.pauses})"
+        )
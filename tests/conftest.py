@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import pytest
+
+import amorsize.optimizer as optimizer_module
+from amorsize.sampling import SamplingResult, item_size
+
+
+@pytest.fixture
+def physical_cores(monkeypatch):
+    """
+    Make optimize() plan for a host with a given number of physical cores.
+
+    Returns:
+        Function taking the core count; every core is usable, without the
+        memory cap of calculate_max_workers()
+    """
+    def set_cores(count):
+        monkeypatch.setattr(optimizer_module, "get_physical_cores", lambda: count)
+        monkeypatch.setattr(optimizer_module, "calculate_max_workers", lambda cores, *args: cores)
+    return set_cores
+
+
+@pytest.fixture
+def fixed_dry_run(monkeypatch):
+    """
+    Make optimize() sample fixed item times instead of running the function.
+
+    Returns:
+        Function taking the sampled item times, and optionally the pickled
+        size and pickling time of the function; may be called again to
+        replace the times within a test
+    """
+    def install(item_times, func_size=0, func_pickle_time=0.0):
+        def dry_run(func, data, *args, **kwargs):
+            sample = list(data)[:len(item_times)]
+            avg_time = sum(item_times) / len(item_times)
+            std = (sum((t - avg_time) ** 2 for t in item_times) / (len(item_times) - 1)) ** 0.5
+            return SamplingResult(
+                avg_time=avg_time, return_size=8, peak_memory=1000,
+                sample_count=len(sample), is_picklable=True, input_size=8,
+                time_std=std, item_times=list(item_times),
+                item_sizes=[item_size(item) for item in sample],
+                func_size=func_size, func_pickle_time=func_pickle_time
+            )
+        monkeypatch.setattr(optimizer_module, "perform_dry_run", dry_run)
+    return install
@@ -0,0 +1,49 @@
+"""
+Tests for arguments module.
+"""
+
+import pytest
+import pickle
+from amorsize.arguments import ZippedArgs, zip_args, bind_kwargs, call_with_args
+
+
+def scaled_sum(a, b, scale=1):
+    """A multi-argument function with a keyword argument."""
+    return (a + b) * scale
+
+
+def test_zip_args_sequences():
+    """Test zipping sized sequences gives an indexable view."""
+    zipped = zip_args([1, 2, 3], "abcd")
+
+    assert isinstance(zipped, ZippedArgs)
+    assert len(zipped) == 3
+    assert zipped[0] == (1, "a")
+    assert zipped[-1] == (3, "c")
+    assert zipped[0:2] == [(1, "a"), (2, "b")]
+    assert list(zipped) == [(1, "a"), (2, "b"), (3, "c")]
+
+    with pytest.raises(IndexError):
+        zipped[3]
+
+
+def test_zip_args_iterators():
+    """Test zipping unsized iterables falls back to a lazy zip."""
+    zipped = zip_args(iter([1, 2]), [3, 4])
+    assert not hasattr(zipped, '__len__')
+    assert list(zipped) == [(1, 3), (2, 4)]
+
+
+def test_bind_kwargs_is_picklable():
+    """Test that bound keyword arguments survive pickling."""
+    assert bind_kwargs(scaled_sum) is scaled_sum
+
+    bound = bind_kwargs(scaled_sum, {"scale": 10})
+    restored = pickle.loads(pickle.dumps(bound))
+    assert restored(1, 2) == 30
+
+
+def test_call_with_args():
+    """Test single-argument and starmap calls."""
+    assert call_with_args(abs, -3) == 3
+    assert call_with_args(scaled_sum, (1, 2), starmap=True) == 3
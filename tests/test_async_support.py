@@ -0,0 +1,105 @@
+"""
+Tests for async_support module.
+"""
+
+import pytest
+import asyncio
+from amorsize import optimize, optimize_async, amap
+from amorsize.async_support import AsyncOptimizationResult
+from amorsize.sampling import perform_dry_run
+
+
+async def stub_request(x):
+    """An async stub that waits like a network call."""
+    await asyncio.sleep(0.01)
+    return x * 2
+
+
+async def failing_request(x):
+    """An async stub that raises an exception."""
+    raise ValueError("Test error")
+
+
+def sync_function(x):
+    """A regular synchronous function."""
+    return x
+
+
+def test_optimize_async_basic():
+    """Test async optimization returns a valid result."""
+    data = list(range(1000))
+    result = asyncio.run(optimize_async(stub_request, data, max_concurrency=64))
+
+    assert isinstance(result, AsyncOptimizationResult)
+    assert result.concurrency > 1
+    assert result.batch_size >= result.concurrency
+    assert result.estimated_throughput > 0
+    assert result.avg_latency > 0
+
+
+def test_optimize_async_detects_saturation():
+    """Test that concurrency stops growing once the backend saturates."""
+    async def run():
+        # A backend that only serves 4 requests at once
+        backend = asyncio.Semaphore(4)
+
+        async def limited_backend_request(x):
+            async with backend:
+                await asyncio.sleep(0.01)
+            return x
+
+        return await optimize_async(
+            limited_backend_request, list(range(1000)), max_concurrency=256
+        )
+
+    result = asyncio.run(run())
+    assert result.concurrency <= 8
+
+
+def test_optimize_async_rejects_sync_function():
+    """Test that a synchronous function is rejected."""
+    result = asyncio.run(optimize_async(sync_function, [1, 2, 3]))
+    assert result.concurrency == 1
+    assert len(result.warnings) > 0
+
+
+def test_optimize_async_errors():
+    """Test async optimization with empty data and failing functions."""
+    result = asyncio.run(optimize_async(stub_request, []))
+    assert "Empty data sample" in result.reason
+
+    result = asyncio.run(optimize_async(failing_request, [1, 2, 3]))
+    assert "Test error" in result.reason
+
+
+def test_amap_preserves_order():
+    """Test that amap returns results in input order."""
+    data = list(range(50))
+    results = asyncio.run(amap(stub_request, data, concurrency=8, batch_size=16))
+    assert results == [x * 2 for x in data]
+
+
+def test_amap_enforces_concurrency():
+    """Test that amap never exceeds the concurrency limit."""
+    in_flight = []
+    peak = []
+
+    async def tracked(x):
+        in_flight.append(x)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.001)
+        in_flight.remove(x)
+        return x
+
+    asyncio.run(amap(tracked, range(40), concurrency=3, batch_size=10))
+    assert max(peak) <= 3
+
+
+def test_sync_optimizer_rejects_coroutine_function():
+    """Test that optimize() does not time coroutine creation."""
+    result = perform_dry_run(stub_request, [1, 2, 3])
+    assert isinstance(result.error, TypeError)
+
+    result = optimize(stub_request, [1, 2, 3])
+    assert result.n_jobs == 1
+    assert "optimize_async" in result.reason
@@ -0,0 +1,137 @@
+"""
+Tests for autotuner module.
+"""
+
+import pytest
+import time
+from amorsize import PlanCache, autotune, execute
+from amorsize.optimizer import OptimizationResult
+from amorsize.autotuner import AutotuneResult, Trial, candidate_configs, trial_slice
+import amorsize.autotuner as autotuner_module
+
+
+def sleepy(x):
+    """A function that releases the GIL while it waits."""
+    time.sleep(0.002)
+    return x * 2
+
+
+def failing(x):
+    """A function that always fails."""
+    raise ValueError("bad item")
+
+
+@pytest.fixture
+def four_cores(monkeypatch, physical_cores):
+    """Let trials use up to four workers."""
+    physical_cores(4)
+    monkeypatch.setattr(autotuner_module, "get_physical_cores", lambda: 4)
+
+
+def test_candidate_configs():
+    """Test that candidates surround the heuristic plan and include serial execution."""
+    plan = OptimizationResult(n_jobs=4, chunksize=8, reason="Test")
+    configs = candidate_configs(plan, 8, backends=("process", "thread"))
+    
+    assert configs[0] == ("serial", 1, 1)
+    assert ("process", 4, 8) in configs
+    assert ("thread", 2, 2) in configs
+    assert ("process", 8, 32) in configs
+    assert len(configs) == len(set(configs)) == 1 + 2 * 3 * 3
+    assert candidate_configs(plan, 1) == [("serial", 1, 1)]
+
+
+def test_trial_slice():
+    """Test prefix and stratified slices."""
+    data = list(range(100))
+    assert trial_slice(data, 5) == [0, 1, 2, 3, 4]
+    assert trial_slice(data, 5, stratified=True) == [0, 20, 40, 60, 80]
+    assert trial_slice(data, 500, stratified=True) == data
+
+
+def test_trial_time_per_item():
+    """Test that failed trials never win."""
+    assert Trial("process", 2, 4, 10, 0.5).time_per_item == pytest.approx(0.05)
+    assert Trial("process", 2, 4, 10, 0.0, error=ValueError()).time_per_item == float("inf")
+
+
+def test_autotune(four_cores):
+    """Test that successive halving finds a parallel plan for a sleeping function."""
+    data = list(range(300))
+    result = autotune(sleepy, data, time_budget=5.0, backends=("process", "thread"))
+    
+    assert isinstance(result, AutotuneResult)
+    assert not result.from_cache
+    assert result.rounds >= 2
+    # Each round times about half the candidates on twice the items
+    sizes = sorted({t.items for t in result.trials})
+    counts = [sum(1 for t in result.trials if t.items == size) for size in sizes]
+    assert len(sizes) == result.rounds
+    assert counts == sorted(counts, reverse=True)
+    assert counts[1] == -(-counts[0] // 2)
+    
+    plan = result.plan
+    assert plan.n_jobs > 1
+    assert plan.backend in ("process", "thread")
+    assert plan.estimated_speedup > 1.0
+    assert "Autotuned" in plan.reason
+    assert execute(sleepy, data, result=plan) == [x * 2 for x in data]
+
+
+def test_autotune_respects_worker_cap(four_cores, monkeypatch):
+    """Test that no candidate exceeds the memory and coordinator cap of the plan."""
+    plan = OptimizationResult(n_jobs=2, chunksize=4, reason="Capped", max_workers=2)
+    monkeypatch.setattr(autotuner_module, "optimize", lambda *args, **kwargs: plan)
+    result = autotune(sleepy, list(range(100)), time_budget=3.0)
+
+    assert result.trials
+    assert max(t.n_jobs for t in result.trials) <= 2
+
+
+def test_autotune_warms_new_pools(four_cores):
+    """Test that a trial on a newly started pool runs untimed first."""
+    result = autotune(sleepy, list(range(100)), time_budget=3.0)
+    first_round = [t for t in result.trials if t.items == result.trials[0].items]
+    pooled = [t for t in first_round if t.backend != "serial"]
+    # Candidates with the same worker count share a pool, started by the first
+    for previous, trial in zip([None] + pooled, pooled):
+        if previous is None or previous.n_jobs != trial.n_jobs:
+            assert trial.warmup > 0
+        else:
+            assert trial.warmup == 0
+
+
+def test_autotune_budget(four_cores):
+    """Test that a tiny budget stops after the first round."""
+    result = autotune(sleepy, list(range(2000)), time_budget=0.05)
+    assert result.rounds == 1
+    assert any("Time budget" in w for w in result.warnings)
+    
+    with pytest.raises(ValueError):
+        autotune(sleepy, [1, 2, 3], time_budget=0)
+    with pytest.raises(ValueError):
+        autotune(sleepy, [1, 2, 3], backends=("gpu",))
+
+
+def test_autotune_failing_function(four_cores):
+    """Test that the heuristic plan is returned when every trial fails."""
+    result = autotune(failing, list(range(50)), time_budget=1.0)
+    assert any("Every trial failed" in w for w in result.warnings)
+    assert result.plan.n_jobs == 1
+
+
+def test_autotune_plan_cache(four_cores, tmp_path):
+    """Test that the winning plan is persisted and reused."""
+    cache = PlanCache(str(tmp_path / "plans.json"))
+    data = list(range(200))
+    
+    tuned = autotune(sleepy, data, time_budget=3.0, cache=cache)
+    assert len(cache) == 1
+    
+    cached = autotune(sleepy, data[:150], time_budget=3.0, cache=cache)
+    assert cached.from_cache
+    assert cached.trials == []
+    assert (cached.plan.n_jobs, cached.plan.chunksize, cached.plan.backend) == (
+        tuned.plan.n_jobs, tuned.plan.chunksize, tuned.plan.backend
+    )
+    assert "plan cache" in str(cached)
@@ -0,0 +1,124 @@
+"""
+Tests for batch module.
+"""
+
+import math
+import pytest
+import time
+from amorsize import optimize_batch, iter_batches
+from amorsize.batch import BatchOptimizationResult
+from amorsize import batch as batch_module
+import amorsize.memory_model as memory_model_module
+import amorsize.system_info as system_info_module
+
+MB = 1024 * 1024
+
+
+def vectorized_sum(batch):
+    """A batch function with a fixed per-call cost and a small per-item cost."""
+    time.sleep(0.002)
+    return [x * 2 for x in batch]
+
+
+def per_item_batch(batch):
+    """A batch function with a fixed per-call cost and a larger per-item cost."""
+    time.sleep(0.002 + 2e-5 * len(batch))
+    return [x * 2 for x in batch]
+
+
+def failing_batch(batch):
+    """A batch function that raises an exception."""
+    raise ValueError("Test error")
+
+
+def test_iter_batches():
+    """Test that iter_batches yields consecutive slices."""
+    batches = list(iter_batches(list(range(10)), 4))
+    assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_optimize_batch_basic():
+    """Test batch optimization returns a valid result."""
+    data = list(range(10000))
+    result = optimize_batch(vectorized_sum, data, max_sample_time=0.2)
+
+    assert isinstance(result, BatchOptimizationResult)
+    assert result.n_jobs >= 1
+    assert result.chunksize >= 1
+    assert 1 <= result.batch_size <= len(data)
+    assert result.fixed_cost >= 0
+    assert result.per_item_cost > 0
+
+
+def test_optimize_batch_amortizes_fixed_cost(monkeypatch):
+    """Test that a large fixed cost leads to batches bigger than one item."""
+    monkeypatch.setattr(batch_module, "get_physical_cores", lambda: 4)
+    data = list(range(100000))
+    result = optimize_batch(vectorized_sum, data, max_sample_time=0.2)
+
+    assert result.batch_size > 1
+    # Every worker should get at least one batch
+    assert result.batch_size <= len(data) // 4 + 1
+
+
+def test_optimize_batch_worker_baseline_limits_workers(monkeypatch):
+    """Test that each worker's interpreter baseline counts against memory."""
+    monkeypatch.setattr(batch_module, "get_physical_cores", lambda: 8)
+    monkeypatch.setattr(memory_model_module, "get_worker_baseline_memory",
+                        lambda freeze_heap=False: 300 * MB)
+    monkeypatch.setattr(system_info_module, "get_available_memory", lambda: 1024 * MB)
+    result = optimize_batch(vectorized_sum, list(range(100000)), max_sample_time=0.2)
+
+    # 80% of 1 GB holds two 300 MB workers, not eight
+    assert result.n_jobs <= 2
+    assert any("Memory constraints" in w for w in result.warnings)
+
+
+def test_optimize_batch_chunks_leave_short_tail(monkeypatch):
+    """Test that every worker gets several chunks of batches."""
+    monkeypatch.setattr(batch_module, "get_physical_cores", lambda: 4)
+    monkeypatch.setattr(batch_module, "calculate_max_workers", lambda cores, *args: cores)
+    result = optimize_batch(per_item_batch, list(range(100000)), max_sample_time=0.2,
+                            target_chunk_duration=1.0)
+
+    assert result.n_jobs == 4
+    n_batches = math.ceil(100000 / result.batch_size)
+    assert math.ceil(n_batches / result.chunksize) >= 2 * result.n_jobs
+
+
+def test_optimize_batch_generator():
+    """Test batch optimization with generator input."""
+    def gen():
+        for i in range(1000):
+            yield i
+
+    result = optimize_batch(vectorized_sum, gen(), max_sample_time=0.1)
+    assert result.batch_size >= 1
+
+
+def test_optimize_batch_empty_data():
+    """Test batch optimization with empty data."""
+    result = optimize_batch(vectorized_sum, [])
+    assert result.n_jobs == 1
+    assert len(result.warnings) > 0
+
+
+def test_optimize_batch_exception():
+    """Test batch optimization with a function that raises."""
+    result = optimize_batch(failing_batch, list(range(10)))
+    assert result.n_jobs == 1
+    assert "Test error" in result.reason
+
+
+def test_batch_result_repr():
+    """Test BatchOptimizationResult string representation."""
+    result = BatchOptimizationResult(
+        n_jobs=4,
+        chunksize=2,
+        batch_size=512,
+        reason="Test reason",
+        estimated_speedup=3.5
+    )
+    assert "batch_size=512" in repr(result)
+    assert "batch_size=512" in str(result)
+    assert "Test reason" in str(result)
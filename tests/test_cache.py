@@ -0,0 +1,123 @@
+"""
+Tests for cache module.
+"""
+
+import functools
+
+from amorsize import PlanCache
+from amorsize.cache import default_cache_path, plan_key
+from amorsize.optimizer import OptimizationResult
+
+
+def square(x):
+    """A simple function."""
+    return x ** 2
+
+
+def test_plan_key():
+    """Test that keys name the function and bucket the data size."""
+    key = plan_key(square, 1000)
+    assert "test_cache.square" in key
+    assert "items<=1024" in key
+    assert plan_key(square, 600) == key
+    assert plan_key(square, 1025) != key
+    assert plan_key(square, 1000, starmap=True) != key
+
+
+def power(x, exponent=2):
+    """A function with a keyword argument."""
+    return x ** exponent
+
+
+class Scaler:
+    """Holder of a bound method."""
+
+    def scale(self, x):
+        return x * 2
+
+    def __call__(self, x):
+        return x * 3
+
+
+def test_plan_key_arguments_and_backends():
+    """Test that keyword arguments and tried backends are part of the key."""
+    key = plan_key(power, 100)
+    assert plan_key(power, 100, func_kwargs={"exponent": 2}) != key
+    assert plan_key(power, 100, func_kwargs={"exponent": 3}) != plan_key(
+        power, 100, func_kwargs={"exponent": 2}
+    )
+    assert plan_key(power, 100, func_kwargs={}) == key
+    assert plan_key(power, 100, backends=("process", "thread")) != key
+    assert plan_key(power, 100, backends=("thread", "process")) == plan_key(
+        power, 100, backends=("process", "thread")
+    )
+    # Objects in the arguments are keyed without their address
+    assert plan_key(power, 100, func_kwargs={"exponent": object()}) == plan_key(
+        power, 100, func_kwargs={"exponent": object()}
+    )
+
+
+def test_plan_key_stable_names():
+    """Test that partials, bound methods and callable objects have stable keys."""
+    first = plan_key(functools.partial(power, exponent=3), 100)
+    assert first == plan_key(functools.partial(power, exponent=3), 100)
+    assert "0x" not in first
+    assert "test_cache.power" in first
+    assert first != plan_key(functools.partial(power, exponent=4), 100)
+
+    method = plan_key(Scaler().scale, 100)
+    assert method == plan_key(Scaler().scale, 100)
+    assert "test_cache.Scaler.scale" in method
+
+    instance = plan_key(Scaler(), 100)
+    assert instance == plan_key(Scaler(), 100)
+    assert "0x" not in instance
+    assert "test_cache.Scaler" in instance
+
+
+def test_default_cache_path(monkeypatch, tmp_path):
+    """Test that the cache lives under XDG_CACHE_HOME when it is set."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_path() == str(tmp_path / "amorsize" / "plans.json")
+
+
+def test_plan_cache_roundtrip(tmp_path):
+    """Test that stored plans are read back."""
+    cache = PlanCache(str(tmp_path / "nested" / "plans.json"))
+    assert cache.get("missing") is None
+    assert len(cache) == 0
+    
+    plan = OptimizationResult(
+        n_jobs=4, chunksize=16, reason="Tuned", estimated_speedup=3.5,
+        predicted_time=2.0, core_seconds=8.0, schedule="guided", backend="thread"
+    )
+    cache.put("job", plan)
+    loaded = PlanCache(cache.path).get("job")
+    assert (loaded.n_jobs, loaded.chunksize, loaded.schedule, loaded.backend) == (
+        4, 16, "guided", "thread"
+    )
+    assert loaded.predicted_time == 2.0
+    assert "backend=thread" in str(loaded)
+    
+    cache.remove("job")
+    assert cache.get("job") is None
+
+
+def test_plan_cache_corrupt_file(tmp_path):
+    """Test that an unreadable cache file is treated as empty."""
+    path = tmp_path / "plans.json"
+    path.write_text("{not json")
+    cache = PlanCache(str(path))
+    assert cache.get("job") is None
+    cache.put("job", OptimizationResult(n_jobs=2, chunksize=1, reason="Tuned"))
+    assert cache.get("job").n_jobs == 2
+
+
+def test_plan_cache_malformed_entry(tmp_path):
+    """Test that an entry missing its fields is dropped as a miss."""
+    path = tmp_path / "plans.json"
+    path.write_text('{"job": {"chunksize": 4}, "other": {"n_jobs": 2, "chunksize": 1}}')
+    cache = PlanCache(str(path))
+    assert cache.get("job") is None
+    assert len(cache) == 1
+    assert cache.get("other").n_jobs == 2
@@ -0,0 +1,221 @@
+"""
+Tests for coordinator module.
+"""
+
+import os
+import pytest
+import stat
+import threading
+import time
+from amorsize import CoreCoordinator, enable_coordination, disable_coordination, optimize, execute
+from amorsize.coordinator import default_lease_path, fair_shares, get_coordinator
+from amorsize.optimizer import OptimizationResult
+import amorsize.executor as executor_module
+
+
+def square(x):
+    """A simple function."""
+    return x ** 2
+
+
+def slow_function(x):
+    """A slow function."""
+    time.sleep(0.01)
+    return x
+
+
+@pytest.fixture
+def coordinator(tmp_path):
+    """A coordinator with a private lease file and 8 cores."""
+    return CoreCoordinator(total_cores=8, lease_path=str(tmp_path / "leases.json"))
+
+
+def test_fair_shares_water_filling():
+    """Test that small requests are granted in full and the rest split evenly."""
+    assert fair_shares({"a": 8}, 8) == {"a": 8}
+    assert fair_shares({"a": 8, "b": 8}, 8) == {"a": 4, "b": 4}
+    assert fair_shares({"a": 2, "b": 8, "c": 8}, 8) == {"a": 2, "b": 3, "c": 3}
+    # Every job gets at least one core
+    assert fair_shares({str(i): 4 for i in range(10)}, 4) == {str(i): 1 for i in range(10)}
+
+
+def test_acquire_splits_and_release_restores(coordinator):
+    """Test that concurrent leases share the cores without exceeding the budget."""
+    first = coordinator.acquire(8)
+    assert first.cores == 8
+    # Every core is held - a new job would run serially
+    assert coordinator.available(8) == 0
+
+    second = coordinator.acquire(8)
+    assert second.cores == 0
+    assert len(coordinator.leases()) == 2
+
+    # Rebalancing shrinks the first lease to its fair share, freeing cores
+    assert first.rebalance() == 4
+    assert second.rebalance() == 4
+
+    second.release()
+    first.release()
+    assert coordinator.leases() == {}
+    assert coordinator.available() == 8
+
+
+def test_rebalance_after_release(coordinator):
+    """Test that a lease grows back once another job finishes."""
+    first = coordinator.acquire(8)
+    second = coordinator.acquire(8)
+    assert first.rebalance() == 4
+    assert second.rebalance() == 4
+    second.release()
+    assert first.rebalance() == 8
+    first.release()
+
+
+def test_grants_never_exceed_budget(coordinator):
+    """Test that simultaneous leases together hold at most the total cores."""
+    leases = [coordinator.acquire(8) for _ in range(3)]
+    assert sum(lease.cores for lease in leases) <= 8
+    for lease in leases:
+        lease.rebalance()
+        assert sum(entry["cores"] for entry in coordinator.leases().values()) <= 8
+    for lease in leases:
+        lease.release()
+
+
+def test_lease_context_manager(coordinator):
+    """Test that leases are released when the block exits."""
+    with coordinator.acquire(3) as lease:
+        assert lease.cores == 3
+        assert len(coordinator.leases()) == 1
+    assert lease.released
+    assert coordinator.leases() == {}
+
+
+def test_dead_process_leases_pruned(coordinator):
+    """Test that leases of exited processes do not hold cores."""
+    def add_stale(table):
+        table["stale"] = {"pid": 2 ** 22 + 1, "requested": 8, "cores": 8}
+    coordinator._transact(add_stale)
+    assert coordinator.leases() == {}
+    assert coordinator.available(8) == 8
+
+
+def test_leases_shared_between_coordinators(tmp_path):
+    """Test that coordinators using the same lease file see each other's leases."""
+    path = str(tmp_path / "leases.json")
+    first = CoreCoordinator(total_cores=8, lease_path=path)
+    second = CoreCoordinator(total_cores=8, lease_path=path)
+    with first.acquire(6):
+        assert second.available(8) == 2
+
+
+def test_optimize_capped_by_coordinator(coordinator, physical_cores):
+    """Test that optimize only plans for the cores it could lease."""
+    physical_cores(8)
+    data = list(range(2000))
+
+    with coordinator.acquire(8):
+        result = optimize(slow_function, data, coordinator=coordinator)
+    assert result.n_jobs <= 4
+    assert any("Core coordinator" in w for w in result.warnings)
+
+
+def test_enable_coordination_sets_default(tmp_path):
+    """Test that enable_coordination installs a default used by execute."""
+    try:
+        coordinator = enable_coordination(total_cores=2, lease_path=str(tmp_path / "leases.json"))
+        assert get_coordinator() is coordinator
+        assert execute(square, list(range(20))) == [x ** 2 for x in range(20)]
+        assert coordinator.leases() == {}
+    finally:
+        disable_coordination()
+    assert get_coordinator() is None
+
+
+def test_execute_holds_lease_while_running(coordinator):
+    """Test that a parallel execute leases cores and returns them afterwards."""
+    from amorsize.optimizer import OptimizationResult
+    result = OptimizationResult(n_jobs=2, chunksize=5, reason="forced", estimated_speedup=2.0)
+    assert execute(square, list(range(20)), result=result, coordinator=coordinator) == [
+        x ** 2 for x in range(20)
+    ]
+    assert coordinator.leases() == {}
+
+
+def sleepy(x):
+    """A function sleeping for 50ms."""
+    time.sleep(0.05)
+    return x
+
+
+def test_execute_grows_with_rebalanced_lease(coordinator, monkeypatch):
+    """Test that a job started without free cores takes them once they are released."""
+    monkeypatch.setattr(executor_module, "REBALANCE_INTERVAL", 0.05)
+    other = coordinator.acquire(8)
+    threading.Timer(0.3, other.release).start()
+
+    result = OptimizationResult(n_jobs=4, chunksize=1, reason="forced", estimated_speedup=4.0)
+    data = list(range(40))
+    start = time.perf_counter()
+    assert execute(sleepy, data, result=result, coordinator=coordinator) == data
+    # Serially the 40 items take 2s; one at a time for 0.3s, then four
+    assert time.perf_counter() - start < 1.4
+    assert coordinator.leases() == {}
+
+
+def test_running_job_shrinks_for_newcomer(coordinator, monkeypatch):
+    """Test that a running job gives back cores to a job that arrives later."""
+    monkeypatch.setattr(executor_module, "REBALANCE_INTERVAL", 0.05)
+    result = OptimizationResult(n_jobs=8, chunksize=1, reason="forced", estimated_speedup=8.0)
+    data = list(range(160))
+    runner = threading.Thread(
+        target=execute, args=(sleepy, data), kwargs={"result": result, "coordinator": coordinator}
+    )
+    runner.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not coordinator.leases() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        newcomer = coordinator.acquire(8)
+        assert newcomer.cores == 0
+        while newcomer.rebalance() == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert newcomer.cores == 4
+        held = sum(lease["cores"] for lease in coordinator.leases().values())
+        assert held <= 8
+        newcomer.release()
+    finally:
+        runner.join()
+
+
+def test_default_lease_path_per_user(monkeypatch, tmp_path):
+    """Test that the default lease file is private to the user."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert default_lease_path() == str(tmp_path / "amorsize-core-leases.json")
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert str(os.getuid()) in os.path.basename(default_lease_path())
+
+
+def test_lease_file_created_private(coordinator):
+    """Test that the lease file is only readable and writable by its owner."""
+    with coordinator.acquire(2):
+        pass
+    assert stat.S_IMODE(os.stat(coordinator.lease_path).st_mode) == 0o600
+
+
+def test_unusable_lease_file_disables_coordination(tmp_path, physical_cores):
+    """Test that jobs run uncoordinated when the lease file cannot be opened."""
+    physical_cores(8)
+    target = tmp_path / "elsewhere.json"
+    target.write_text("{}")
+    link = tmp_path / "leases.json"
+    link.symlink_to(target)
+    coordinator = CoreCoordinator(total_cores=8, lease_path=str(link))
+    with pytest.raises(OSError):
+        coordinator.acquire(2)
+
+    result = optimize(slow_function, list(range(2000)), coordinator=coordinator)
+    assert any("coordination unavailable" in w for w in result.warnings)
+    forced = OptimizationResult(n_jobs=2, chunksize=5, reason="forced", estimated_speedup=2.0)
+    data = list(range(20))
+    assert execute(square, data, result=forced, coordinator=coordinator) == [x ** 2 for x in data]
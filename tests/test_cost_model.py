@@ -0,0 +1,61 @@
+"""
+Tests for cost_model module.
+"""
+
+import pytest
+from amorsize.cost_model import (
+    fit_linear,
+    predict_linear,
+    fit_power_law,
+    predict_power_law,
+    fit_scaling_model,
+    predict_scaling_model,
+)
+
+
+def test_fit_linear_exact():
+    """Test that an exact linear relation is recovered."""
+    xs = [1, 2, 4, 8]
+    ys = [0.5 + 2 * x for x in xs]
+    intercept, slope = fit_linear(xs, ys)
+
+    assert intercept == pytest.approx(0.5)
+    assert slope == pytest.approx(2.0)
+    assert predict_linear((intercept, slope), 10) == pytest.approx(20.5)
+
+
+def test_fit_linear_single_point():
+    """Test that a single point yields a proportional model."""
+    intercept, slope = fit_linear([4], [2.0])
+    assert intercept == 0.0
+    assert slope == pytest.approx(0.5)
+
+
+def test_fit_linear_empty():
+    """Test fitting with no samples."""
+    assert fit_linear([], []) == (0.0, 0.0)
+
+
+
+def test_fit_power_law_exact():
+    """Test that an exact power law is recovered."""
+    xs = [1, 2, 4, 8]
+    ys = [3 * x ** 2 for x in xs]
+    coefficient, exponent = fit_power_law(xs, ys)
+
+    assert coefficient == pytest.approx(3.0)
+    assert exponent == pytest.approx(2.0)
+    assert predict_power_law((coefficient, exponent), 10) == pytest.approx(300.0)
+    assert fit_power_law([0, -1], [1, 2]) == (0.0, 0.0)
+
+
+def test_fit_scaling_model_picks_better_fit():
+    """Test that the model with the smaller error is chosen."""
+    xs = [10, 20, 40, 80, 160]
+    quadratic = fit_scaling_model(xs, [1e-6 * x ** 2 for x in xs])
+    assert quadratic[0] == "power"
+    assert predict_scaling_model(quadratic, 320) == pytest.approx(1e-6 * 320 ** 2)
+
+    affine = fit_scaling_model(xs, [0.5 + 0.01 * x for x in xs])
+    assert affine[0] == "linear"
+    assert predict_scaling_model(affine, 100) == pytest.approx(1.5)
@@ -0,0 +1,142 @@
+"""
+Tests for copy-on-write module.
+"""
+
+import gc
+import pytest
+import weakref
+from amorsize import execute
+from amorsize.optimizer import OptimizationResult
+from amorsize.cow import (
+    GEN2_DISABLED_THRESHOLD,
+    frozen_heap,
+    gc_worker_initializer,
+    get_cow_share,
+    is_fork_start,
+    probe_cow_share,
+    read_smaps_rollup,
+    unique_memory,
+)
+from amorsize.memory_model import (
+    get_process_memory,
+    get_worker_baseline_memory,
+)
+import amorsize.cow as cow_module
+
+needs_fork = pytest.mark.skipif(
+    not is_fork_start() or read_smaps_rollup() is None,
+    reason="requires forked workers and /proc/<pid>/smaps_rollup"
+)
+
+
+class Node:
+    """A garbage-collector-tracked object."""
+
+
+def gen2_threshold(x):
+    """Report the worker's generation-2 collection threshold."""
+    return gc.get_threshold()[2]
+
+
+def test_read_smaps_rollup():
+    """Test that the memory summary is read in bytes."""
+    smaps = read_smaps_rollup()
+    if smaps is None:
+        pytest.skip("smaps_rollup unavailable")
+    assert smaps["Rss"] > 0
+    assert 0 < unique_memory(smaps) <= smaps["Rss"]
+    assert read_smaps_rollup("no-such-pid") is None
+
+
+@needs_fork
+def test_frozen_heap():
+    """Test that the heap is frozen only inside the block."""
+    with frozen_heap():
+        assert gc.get_freeze_count() > 0
+    assert gc.get_freeze_count() == 0
+    with frozen_heap(enabled=False):
+        assert gc.get_freeze_count() == 0
+
+
+def test_gc_worker_initializer():
+    """Test that the wrapper disables full collections and runs the user's initializer."""
+    calls = []
+    
+    def setup(value):
+        calls.append(value)
+    
+    wrapper = gc_worker_initializer(setup)
+    assert gc_worker_initializer(setup) is wrapper
+    
+    threshold = gc.get_threshold()
+    try:
+        wrapper(42)
+        assert gc.get_threshold()[2] == GEN2_DISABLED_THRESHOLD
+        assert calls == [42]
+    finally:
+        gc.set_threshold(*threshold)
+
+
+def test_gc_worker_initializer_releases_closures():
+    """Test that wrappers of closures are dropped once no pool holds them."""
+    def make_setup():
+        state = []
+        return lambda: state.append(1)
+    
+    setup = make_setup()
+    dead = weakref.ref(setup)
+    wrapper = gc_worker_initializer(setup)
+    assert gc_worker_initializer(setup) is wrapper
+    del setup, wrapper
+    gc.collect()
+    assert dead() is None
+
+
+@needs_fork
+def test_probe_cow_share(monkeypatch):
+    """Test that freezing the heap reduces how much a worker copies."""
+    monkeypatch.setattr(cow_module, "_cow_shares", {})
+    heap = [Node() for _ in range(200000)]
+    unfrozen = probe_cow_share(refresh=True)
+    frozen = probe_cow_share(freeze_heap=True, refresh=True)
+    assert 0 <= frozen < unfrozen <= 1
+    assert get_cow_share(True) == frozen
+    del heap
+
+
+def test_worker_baseline_uses_probed_share(monkeypatch):
+    """Test that the memory model charges only the probed share of the parent."""
+    monkeypatch.setattr(cow_module, "_cow_shares", {True: 0.25})
+    resident = get_process_memory()
+    if not resident or not is_fork_start():
+        pytest.skip("requires forked workers and a readable resident size")
+    assert get_worker_baseline_memory(True) == pytest.approx(resident * 0.25, rel=0.2)
+    # No probe without freezing - the whole heap is eventually copied
+    assert get_worker_baseline_memory(False) == pytest.approx(resident, rel=0.2)
+
+
+@needs_fork
+def test_execute_freeze_heap():
+    """Test that workers run with full collections disabled."""
+    result = OptimizationResult(n_jobs=2, chunksize=2, reason="Test")
+    thresholds = execute(gen2_threshold, list(range(8)), result=result, freeze_heap=True)
+    assert thresholds == [GEN2_DISABLED_THRESHOLD] * 8
+    assert gc.get_freeze_count() == 0
+    assert gc.get_threshold()[2] != GEN2_DISABLED_THRESHOLD
+
+
+def test_is_fork_start_leaves_start_method_unset():
+    """Test that checking the start method does not fix it for the application."""
+    import subprocess
+    import sys
+    code = (
+        "import multiprocessing\n"
+        "from amorsize import optimize\n"
+        "from amorsize.cow import is_fork_start\n"
+        "is_fork_start()\n"
+        "optimize(abs, list(range(100)))\n"
+        "multiprocessing.set_start_method('spawn')\n"
+        "assert not is_fork_start()\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,179 @@
+"""
+Tests for executor module.
+"""
+
+import gc
+import pytest
+import time
+import weakref
+from collections import deque
+from amorsize import execute, zip_args
+from amorsize.optimizer import OptimizationResult
+
+
+def square(x):
+    """A simple single-argument function."""
+    return x ** 2
+
+
+def weighted_sum(a, b, weight=1):
+    """A multi-argument function with a keyword argument."""
+    return (a + b) * weight
+
+
+def test_execute_serial():
+    """Test execution of a fast function (runs serially)."""
+    data = list(range(20))
+    assert execute(square, data) == [x ** 2 for x in data]
+
+
+def test_execute_generator():
+    """Test that generator items consumed by sampling are not lost."""
+    def gen():
+        for i in range(20):
+            yield i
+
+    assert execute(square, gen()) == [x ** 2 for x in range(20)]
+
+
+def test_execute_parallel_with_result():
+    """Test parallel execution with a given optimization result."""
+    data = list(range(50))
+    result = OptimizationResult(n_jobs=2, chunksize=5, reason="Test")
+    assert execute(square, data, result=result) == [x ** 2 for x in data]
+
+
+def test_execute_guided_schedule():
+    """Test that guided chunks return results in input order."""
+    data = list(range(101))
+    result = OptimizationResult(n_jobs=3, chunksize=2, reason="Test", schedule="guided")
+    assert execute(square, data, result=result) == [x ** 2 for x in data]
+
+    a, b = list(range(40)), list(range(40, 80))
+    results = execute(weighted_sum, zip_args(a, b), starmap=True, result=result)
+    assert results == [x + y for x, y in zip(a, b)]
+
+
+def test_execute_lpt_schedule():
+    """Test that cost-balanced chunks return results in input order."""
+    data = list(range(60))
+    result = OptimizationResult(
+        n_jobs=2, chunksize=10, reason="Test", schedule="lpt", cost_model=(0.0, 1.0)
+    )
+    assert execute(square, data, result=result, cost_hint=lambda x: x) == [x ** 2 for x in data]
+
+    a, b = list(range(30)), list(range(30, 60))
+    results = execute(weighted_sum, zip_args(a, b), starmap=True, result=result,
+                      cost_hint=lambda args: args[0])
+    assert results == [x + y for x, y in zip(a, b)]
+
+
+def test_execute_unindexable_data():
+    """Test that sets, dict views and deques are run as the list of their items."""
+    items = list(range(40))
+    lpt = OptimizationResult(
+        n_jobs=2, chunksize=5, reason="Test", schedule="lpt", cost_model=(0.0, 1.0)
+    )
+    static = OptimizationResult(n_jobs=2, chunksize=5, reason="Test")
+    for data in (set(items), dict.fromkeys(items).keys(), deque(items)):
+        expected = [x ** 2 for x in data]
+        assert execute(square, data, result=lpt, cost_hint=lambda x: x) == expected
+        assert execute(square, data, result=static, watchdog=True) == expected
+
+
+def test_execute_starmap_with_kwargs():
+    """Test starmap execution with zipped arguments and keyword arguments."""
+    a = list(range(30))
+    b = list(range(30, 60))
+    expected = [(x + y) * 3 for x, y in zip(a, b)]
+
+    results = execute(weighted_sum, zip_args(a, b), starmap=True, func_kwargs={"weight": 3})
+    assert results == expected
+
+    result = OptimizationResult(n_jobs=2, chunksize=4, reason="Test")
+    results = execute(
+        weighted_sum, zip_args(a, b), starmap=True,
+        func_kwargs={"weight": 3}, result=result
+    )
+    assert results == expected
+
+
+_OFFSET = {}
+
+
+def set_offset(value):
+    """Per-worker initializer."""
+    _OFFSET["value"] = value
+
+
+def add_offset(x):
+    """A function relying on the initializer's state."""
+    return x + _OFFSET["value"]
+
+
+def test_execute_with_initializer():
+    """Test that the initializer runs serially and in every worker."""
+    data = list(range(20))
+    assert execute(add_offset, data, initializer=set_offset, initargs=(100,)) == [x + 100 for x in data]
+
+    result = OptimizationResult(n_jobs=2, chunksize=3, reason="Test")
+    assert execute(add_offset, data, result=result, initializer=set_offset,
+                   initargs=(5,)) == [x + 5 for x in data]
+
+
+def test_execute_thread_backend():
+    """Test that a plan with the thread backend runs on a thread pool."""
+    data = list(range(20))
+    result = OptimizationResult(n_jobs=2, chunksize=5, reason="Test", backend="thread")
+    # Threads need no pickling, so even a lambda works
+    assert execute(lambda x: x + 1, data, result=result) == [x + 1 for x in data]
+
+
+def scale(x, factor=1, table=None):
+    """A function whose bound keyword arguments carry a large table."""
+    return x * factor + len(table or ())
+
+
+def test_execute_install_function():
+    """Test that an installed function runs in the workers with its bound state."""
+    data = list(range(30))
+    kwargs = {"factor": 3, "table": list(range(1000))}
+    expected = [x * 3 + 1000 for x in data]
+
+    result = OptimizationResult(n_jobs=2, chunksize=4, reason="Test")
+    assert execute(scale, data, result=result, func_kwargs=kwargs,
+                   install_function=True) == expected
+    # Together with a user initializer, and with the cost-balanced schedule
+    assert execute(add_offset, data, result=result, initializer=set_offset,
+                   initargs=(7,), install_function=True) == [x + 7 for x in data]
+    result = OptimizationResult(n_jobs=2, chunksize=4, reason="Test", schedule="guided")
+    assert execute(scale, data, result=result, func_kwargs=kwargs,
+                   install_function=True) == expected
+
+
+def test_execute_install_function_releases_initializer():
+    """Test that a closure initializer is not kept alive after its run."""
+    offsets = {"value": 5}
+    setup = lambda: set_offset(offsets["value"])
+    dead = weakref.ref(setup)
+    
+    data = list(range(10))
+    result = OptimizationResult(n_jobs=2, chunksize=4, reason="Test")
+    assert execute(add_offset, data, result=result, initializer=setup,
+                   install_function=True, freeze_heap=True) == [x + 5 for x in data]
+    del setup
+    gc.collect()
+    assert dead() is None
+
+
+def test_execute_install_function_rejects_pool_manager():
+    """Test that an installed function is not baked into shared warm pools."""
+    from amorsize import PoolManager
+    manager = PoolManager()
+    try:
+        with pytest.raises(ValueError):
+            execute(scale, list(range(10)), func_kwargs={"factor": 2},
+                    install_function=True, pool_manager=manager)
+        assert manager.warm_workers() == 0
+    finally:
+        manager.shutdown()
@@ -0,0 +1,144 @@
+"""
+Tests for memory model module.
+"""
+
+import pytest
+import time
+from amorsize import optimize
+from amorsize.memory_model import (
+    DEFAULT_WORKER_BASELINE,
+    MemoryEstimate,
+    estimate_memory,
+    get_process_memory,
+    get_worker_baseline_memory,
+    recommend_imap,
+)
+from amorsize.cow import is_fork_start
+import amorsize.memory_model as memory_model_module
+import amorsize.optimizer as optimizer_module
+
+MB = 1024 * 1024
+
+
+def slow_function(x):
+    """A slow function."""
+    time.sleep(0.01)
+    return x
+
+
+def large_result(x):
+    """A slow function returning a large result."""
+    time.sleep(0.01)
+    return b"x" * 100000
+
+
+def test_get_process_memory(monkeypatch):
+    """Test that the resident size of this process is read."""
+    import amorsize.cow as cow_module
+    monkeypatch.setattr(cow_module, "_cow_shares", {})
+    memory = get_process_memory()
+    assert isinstance(memory, int)
+    assert memory > 0
+    # Without a probe frozen-heap workers are not charged this process's memory
+    assert get_worker_baseline_memory(freeze_heap=True) == DEFAULT_WORKER_BASELINE
+
+
+def test_estimate_memory_components():
+    """Test that worker and parent memory add up from their parts."""
+    estimate = estimate_memory(
+        n_jobs=4, chunksize=10, total_items=1000, item_memory=MB,
+        input_size=100, return_size=1000, init_memory=5 * MB,
+        worker_baseline=50 * MB
+    )
+    assert isinstance(estimate, MemoryEstimate)
+    assert estimate.chunk_buffers == 10 * 1100
+    assert estimate.per_worker == 50 * MB + 5 * MB + MB + 11000
+    assert estimate.parent_in_flight == 4 * 11000
+    assert estimate.parent_results == 1000 * 1000
+    assert estimate.total == 4 * estimate.per_worker + estimate.parent
+    assert "4 workers" in str(estimate)
+
+
+def test_estimate_memory_streamed_results():
+    """Test that streamed or reduced results are not held by the parent."""
+    estimate = estimate_memory(2, 10, 1000, 0, 100, 1000, worker_baseline=0,
+                               collect_results=False)
+    assert estimate.parent_results == 0
+    assert estimate.parent == estimate.parent_in_flight
+
+
+def test_recommend_imap():
+    """Test that imap is recommended once results would fill half the RAM."""
+    assert not recommend_imap(100 * MB, available_memory=1000 * MB)
+    assert recommend_imap(600 * MB, available_memory=1000 * MB)
+
+
+def test_optimize_worker_baseline_limits_workers(monkeypatch):
+    """Test that the interpreter baseline is charged to every worker."""
+    monkeypatch.setattr(optimizer_module, "get_physical_cores", lambda: 8)
+    monkeypatch.setattr(memory_model_module, "get_worker_baseline_memory",
+                        lambda freeze_heap=False: 300 * MB)
+    import amorsize.system_info as system_info_module
+    monkeypatch.setattr(system_info_module, "get_available_memory", lambda: 1024 * MB)
+    
+    result = optimize(slow_function, list(range(200)), sample_size=3)
+    # 80% of 1GB only fits 2 workers of 300MB each
+    assert result.n_jobs <= 2
+    assert any("Memory constraints" in w for w in result.warnings)
+    assert result.memory_estimate.worker_baseline == 300 * MB
+
+
+@pytest.mark.skipif(not is_fork_start(), reason="requires forked workers")
+def test_optimize_large_parent_charged_to_unfrozen_workers(monkeypatch):
+    """Test that forked workers are charged the parent's heap unless it is frozen."""
+    import amorsize.cow as cow_module
+    import amorsize.system_info as system_info_module
+    monkeypatch.setattr(cow_module, "_cow_shares", {})
+    # No probe result, as without /proc/<pid>/smaps_rollup
+    monkeypatch.setattr(optimizer_module, "probe_cow_share", lambda freeze_heap=False: None)
+    monkeypatch.setattr(optimizer_module, "get_physical_cores", lambda: 8)
+    monkeypatch.setattr(memory_model_module, "get_process_memory", lambda: 450 * MB)
+    monkeypatch.setattr(system_info_module, "get_available_memory", lambda: 2048 * MB)
+    
+    unfrozen = optimize(slow_function, list(range(400)), sample_size=3)
+    assert unfrozen.memory_estimate.worker_baseline == 450 * MB
+    assert any("Memory constraints" in w for w in unfrozen.warnings)
+    
+    frozen = optimize(slow_function, list(range(400)), sample_size=3, freeze_heap=True)
+    assert frozen.memory_estimate.worker_baseline == DEFAULT_WORKER_BASELINE
+    assert not any("Memory constraints" in w for w in frozen.warnings)
+
+
+@pytest.mark.skipif(not is_fork_start(), reason="requires forked workers")
+def test_optimize_probes_cow_share_unfrozen(monkeypatch):
+    """Test that the probed share is charged whether or not the heap is frozen."""
+    import amorsize.cow as cow_module
+    probes = []
+    
+    def probe(freeze_heap=False):
+        probes.append(freeze_heap)
+        cow_module._cow_shares[freeze_heap] = 0.1 if freeze_heap else 0.5
+        return cow_module._cow_shares[freeze_heap]
+    monkeypatch.setattr(cow_module, "_cow_shares", {})
+    monkeypatch.setattr(optimizer_module, "probe_cow_share", probe)
+    monkeypatch.setattr(memory_model_module, "get_process_memory", lambda: 400 * MB)
+    
+    unfrozen = optimize(slow_function, list(range(400)), sample_size=3)
+    frozen = optimize(slow_function, list(range(400)), sample_size=3, freeze_heap=True)
+    assert probes == [False, True]
+    assert unfrozen.memory_estimate.worker_baseline == 200 * MB
+    assert frozen.memory_estimate.worker_baseline == 40 * MB
+
+
+def test_optimize_recommends_imap(monkeypatch):
+    """Test that imap is recommended when the collected results would not fit."""
+    monkeypatch.setattr(memory_model_module, "get_available_memory", lambda: 20 * MB)
+    
+    result = optimize(large_result, list(range(300)), sample_size=3)
+    assert result.use_imap
+    assert any("imap" in w for w in result.warnings)
+    assert result.memory_estimate.parent_results == 0
+    
+    small = optimize(slow_function, list(range(300)), sample_size=3)
+    assert not small.use_imap
+    assert small.memory_estimate.parent_results > 0
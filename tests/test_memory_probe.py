@@ -0,0 +1,162 @@
+"""
+Tests for memory_probe module.
+"""
+
+import threading
+import tracemalloc
+
+import pytest
+
+from amorsize.memory_probe import trace_memory
+from amorsize.sampling import perform_dry_run
+
+
+@pytest.fixture
+def no_tracing():
+    """Make sure tracing is off around a test."""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    yield
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def allocate(n):
+    """Allocate and return about n * 8 bytes."""
+    return [0] * n
+
+
+def test_trace_memory_starts_and_stops(no_tracing):
+    """Test that a probe starts tracing for the block and stops it afterwards."""
+    with trace_memory() as probe:
+        assert tracemalloc.is_tracing()
+        data = allocate(100000)
+        current, peak = probe.get_traced_memory()
+        assert current >= 800000
+    assert not tracemalloc.is_tracing()
+    assert probe.current >= 800000
+    assert probe.peak >= probe.current
+    del data
+
+
+def test_trace_memory_reuses_existing_session(no_tracing):
+    """Test that an application's tracing session is kept running and measured relative to."""
+    tracemalloc.start(5)
+    held = allocate(200000)
+    before, _ = tracemalloc.get_traced_memory()
+
+    with trace_memory() as probe:
+        temporary = allocate(100000)
+        del temporary
+
+    assert tracemalloc.is_tracing()
+    assert tracemalloc.get_traceback_limit() == 5
+    # Memory traced before the probe is not attributed to it
+    assert probe.current < 100000
+    assert 800000 <= probe.peak < 1600000
+    assert tracemalloc.get_traced_memory()[0] >= before
+    del held
+
+
+def test_trace_memory_nested_peak(no_tracing):
+    """Test that an enclosing probe keeps its peak across a nested probe."""
+    with trace_memory() as outer:
+        large = allocate(300000)
+        del large
+        with trace_memory() as inner:
+            small = allocate(10000)
+            del small
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    assert inner.peak < 2400000
+    assert outer.peak >= 2400000
+
+
+def test_trace_memory_threads(no_tracing):
+    """Test that concurrent probes from several threads do not interfere."""
+    peaks = []
+    errors = []
+
+    def probe_worker():
+        try:
+            for _ in range(20):
+                with trace_memory() as probe:
+                    data = allocate(50000)
+                    del data
+                peaks.append(probe.peak)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=probe_worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(peaks) == 80
+    # Overlapping probes share tracemalloc's totals, so another thread
+    # freeing its list can hide part of a probe's allocation
+    assert max(peaks) >= 400000
+    assert not tracemalloc.is_tracing()
+
+
+def test_perform_dry_run_keeps_tracing(no_tracing):
+    """Test that sampling does not stop tracing the application started."""
+    tracemalloc.start()
+    result = perform_dry_run(allocate, [100000] * 3, sample_size=3)
+    assert tracemalloc.is_tracing()
+    assert result.error is None
+    assert result.peak_memory >= 800000
+
+
+def test_trace_memory_without_reset_peak(no_tracing, monkeypatch):
+    """Test that probes work on Pythons without tracemalloc.reset_peak()."""
+    monkeypatch.delattr(tracemalloc, "reset_peak")
+
+    with trace_memory() as probe:
+        data = allocate(100000)
+    assert probe.peak >= 800000
+    del data
+
+    # An application session with an earlier, higher peak
+    tracemalloc.start()
+    spike = allocate(500000)
+    del spike
+    with trace_memory() as probe:
+        held = allocate(100000)
+    assert tracemalloc.is_tracing()
+    assert 800000 <= probe.peak < 4000000
+    del held
+
+    result = perform_dry_run(allocate, [1000] * 3, sample_size=3)
+    assert result.error is None
+
+
+def test_trace_memory_overlapping_threads(no_tracing):
+    """Test that probes in different threads run at the same time."""
+    # Both probed blocks must be open at once to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    peaks = {}
+    errors = []
+
+    def probe_worker(n):
+        try:
+            with trace_memory() as probe:
+                data = allocate(n)
+                barrier.wait()
+                del data
+            peaks[n] = probe.peak
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=probe_worker, args=(n,)) for n in (50000, 200000)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert peaks[50000] >= 400000
+    assert peaks[200000] >= 1600000
+    assert not tracemalloc.is_tracing()
@@ -5,7 +5,12 @@ Tests for optimizer module.
 import pytest
 import time
 from amorsize import optimize
-from amorsize.optimizer import OptimizationResult
+from amorsize.optimizer import (
+    OptimizationResult,
+    chunks_per_worker,
+    estimate_tail_time,
+    fit_size_model,
+)
 
 
 def simple_function(x):
@@ -27,6 +32,12 @@ def slow_function(x):
     return x ** 2
 
 
+def slow_sleep_function(x):
+    """A function slower than a worker's startup."""
+    time.sleep(0.06)
+    return x
+
+
 def unpicklable_function_wrapper():
     """Returns an unpicklable function."""
     return lambda x: x * 2
@@ -85,6 +96,20 @@ def test_optimize_generator():
     assert result.n_jobs >= 1
 
 
+def test_optimize_cheap_function_generator(physical_cores):
+    """Test that a cheap function over data of unknown size stays serial."""
+    physical_cores(8)
+    
+    result = optimize(simple_function, (x for x in range(100000)))
+    assert result.n_jobs == 1
+    assert result.estimated_speedup == 1.0
+    assert any("data size is unknown" in w for w in result.warnings)
+    
+    # Items that outweigh a worker's startup are still parallelized
+    slow = optimize(slow_sleep_function, (x for x in range(100)), sample_size=2)
+    assert slow.n_jobs == 8
+
+
 def test_optimize_very_fast_function():
     """Test that very fast functions return n_jobs=1."""
     # Use the module-level simple_function which is picklable
@@ -137,3 +162,419 @@ def test_optimize_with_custom_parameters():
     
     assert isinstance(result, OptimizationResult)
     assert result.chunksize >= 1
+
+
+def slow_add(a, b):
+    """A slow multi-argument function."""
+    time.sleep(0.01)
+    return a + b
+
+
+def test_optimize_starmap():
+    """Test optimization of a multi-argument function over zipped arguments."""
+    from amorsize import zip_args
+    
+    result = optimize(slow_add, zip_args(range(50), range(50)), sample_size=3, starmap=True)
+    
+    assert isinstance(result, OptimizationResult)
+    assert result.n_jobs >= 1
+    assert "Error" not in result.reason
+
+
+_MODEL = {}
+
+
+def load_model(size):
+    """A heavy per-worker initializer."""
+    time.sleep(0.05)
+    _MODEL["weights"] = bytearray(size)
+
+
+def predict(x):
+    """A function relying on the initializer's state."""
+    time.sleep(0.005)
+    return len(_MODEL["weights"]) + x
+
+
+def test_optimize_charges_initializer_per_worker(physical_cores):
+    """Test that initializer time reduces the number of workers chosen."""
+    physical_cores(64)
+    
+    data = list(range(200))
+    result = optimize(predict, data, sample_size=3, initializer=load_model, initargs=(0,))
+    assert result.n_jobs < 64
+    assert result.n_jobs > 1
+
+
+def test_optimize_initializer_memory_limits_workers(monkeypatch):
+    """Test that initializer memory is charged to every worker."""
+    import amorsize.system_info as system_info_module
+    import amorsize.optimizer as optimizer_module
+    monkeypatch.setattr(optimizer_module, "get_physical_cores", lambda: 8)
+    monkeypatch.setattr(system_info_module, "get_available_memory", lambda: 50 * 1024 * 1024)
+    
+    data = list(range(200))
+    result = optimize(predict, data, sample_size=3, initializer=load_model,
+                      initargs=(10 * 1024 * 1024,))
+    # 80% of 50MB only fits 4 workers holding 10MB each
+    assert result.n_jobs <= 4
+    assert any("Memory constraints" in w for w in result.warnings)
+
+
+def test_optimize_reports_time_and_cost():
+    """Test that the plan reports predicted time and core-second cost."""
+    data = list(range(50))
+    result = optimize(slow_function, data, sample_size=3)
+    
+    assert result.predicted_time > 0
+    assert result.core_seconds == pytest.approx(result.predicted_time * result.n_jobs)
+    assert "core-seconds" in str(result)
+
+
+def test_optimize_deadline_objective(physical_cores):
+    """Test that the deadline objective uses the fewest sufficient workers."""
+    physical_cores(16)
+    
+    data = list(range(400))
+    fastest = optimize(slow_function, data, sample_size=3)
+    relaxed = optimize(slow_function, data, sample_size=3, objective="deadline",
+                       deadline=fastest.predicted_time * 2)
+    
+    assert relaxed.n_jobs < fastest.n_jobs
+    assert relaxed.predicted_time <= fastest.predicted_time * 2
+    assert relaxed.core_seconds < fastest.core_seconds
+    
+    impossible = optimize(slow_function, data, sample_size=3, objective="deadline",
+                          deadline=0.001)
+    assert impossible.n_jobs > relaxed.n_jobs
+    assert any("cannot be met" in w for w in impossible.warnings)
+
+
+def test_optimize_efficiency_objective(physical_cores):
+    """Test that the efficiency objective respects the floor."""
+    physical_cores(16)
+    
+    data = list(range(400))
+    result = optimize(slow_function, data, sample_size=3, objective="efficiency",
+                      min_efficiency=0.8)
+    
+    assert result.estimated_speedup / result.n_jobs >= 0.8
+
+
+def test_optimize_invalid_objective():
+    """Test that invalid objectives are rejected."""
+    with pytest.raises(ValueError):
+        optimize(simple_function, [1, 2, 3], objective="cheapest")
+    with pytest.raises(ValueError):
+        optimize(simple_function, [1, 2, 3], objective="deadline")
+    with pytest.raises(ValueError):
+        optimize(simple_function, [1, 2, 3], objective="efficiency", min_efficiency=1.5)
+
+
+def variable_function(x):
+    """A function whose cost depends on the input (x milliseconds)."""
+    time.sleep(0.001 * x)
+    return x
+
+
+def half_millisecond_function(x):
+    """A cheap function (about 0.5ms per item)."""
+    time.sleep(0.0005)
+    return x
+
+
+def test_optimize_cheap_function_large_data(physical_cores):
+    """Test that cheap functions parallelize when the total work is large."""
+    physical_cores(8)
+    
+    result = optimize(half_millisecond_function, range(1_000_000), schedule="static")
+    
+    assert result.n_jobs > 1
+    assert result.estimated_speedup > 1
+    # Large chunks amortize the per-chunk dispatch cost
+    assert result.chunksize >= 20
+
+
+def test_optimize_charges_dispatch_per_chunk(monkeypatch, physical_cores):
+    """Test that a high per-chunk overhead is reflected in the predicted time."""
+    import amorsize.optimizer as optimizer_module
+    physical_cores(8)
+    data = list(range(400))
+    
+    cheap = optimize(slow_function, data, sample_size=3, target_chunk_duration=0.01)
+    monkeypatch.setattr(optimizer_module, "get_chunk_overhead", lambda: 0.05)
+    costly = optimize(slow_function, data, sample_size=3, target_chunk_duration=0.01)
+    
+    assert costly.predicted_time > cheap.predicted_time
+
+
+def test_chunks_per_worker_grows_with_variance():
+    """Test that variable item times ask for more chunks per worker."""
+    assert chunks_per_worker(0.0) == 2
+    assert chunks_per_worker(1.0) > chunks_per_worker(0.1)
+    assert chunks_per_worker(100.0) == 16
+
+
+def test_estimate_tail_time():
+    """Test the straggler estimate for too few and enough chunks."""
+    # 10 chunks of 100 items for 32 workers: one round of 0.1s instead of 1000/32 items
+    few_chunks = estimate_tail_time(1000, 100, 32, 0.001)
+    assert few_chunks == pytest.approx(0.1 - 1000 / 32 * 0.001)
+    # 64 chunks on 32 workers split evenly
+    assert estimate_tail_time(1024, 16, 32, 0.001) == pytest.approx(0.0)
+    # Variable item times add a straggler term
+    assert estimate_tail_time(1024, 16, 32, 0.001, time_cv=1.0) > 0
+    assert estimate_tail_time(1000, 100, 1, 0.001) == 0.0
+
+
+def test_optimize_gives_every_worker_chunks(monkeypatch, physical_cores):
+    """Test that the chunk size leaves several chunks for every worker."""
+    import amorsize.optimizer as optimizer_module
+    physical_cores(32)
+    monkeypatch.setattr(optimizer_module, "get_spawn_cost", lambda: 0.001)
+    
+    data = list(range(2000))
+    result = optimize(half_millisecond_function, data)
+    
+    assert result.n_jobs > 10
+    n_chunks = -(-len(data) // result.chunksize)
+    assert n_chunks >= 2 * result.n_jobs
+    assert result.tail_time is not None
+    assert result.tail_time < result.predicted_time
+
+
+def test_optimize_schedule_from_variance(physical_cores, fixed_dry_run):
+    """Test that variable item times choose a guided or dynamic schedule."""
+    physical_cores(8)
+    
+    fixed_dry_run([0.01] * 3)
+    uniform = optimize(slow_function, list(range(400)), sample_size=3)
+    assert uniform.schedule == "static"
+    
+    # Item costs vary widely: sampled items are 0, 1, 2, 8 and 16 ms
+    fixed_dry_run([0.0001, 0.001, 0.002, 0.008, 0.016])
+    variable = optimize(variable_function, [0, 1, 2, 8, 16] * 80)
+    assert variable.schedule in ("guided", "dynamic")
+    assert variable.n_jobs > 1
+    assert variable.schedule in str(variable)
+
+
+def test_optimize_forced_schedule(physical_cores):
+    """Test that a schedule can be requested explicitly."""
+    physical_cores(8)
+    
+    result = optimize(slow_function, list(range(400)), sample_size=3, schedule="guided")
+    assert result.schedule == "guided"
+    
+    with pytest.raises(ValueError):
+        optimize(slow_function, list(range(400)), schedule="fastest")
+
+
+def test_optimize_cost_hint(physical_cores, fixed_dry_run):
+    """Test that a cost hint predicts the total work and balances chunks."""
+    physical_cores(8)
+    
+    # A few expensive items after cheap ones: the sample alone underestimates
+    data = [2, 10, 4, 12, 6] + [1, 2] * 100 + [20] * 20
+    fixed_dry_run([0.0001 + 0.001 * x for x in data[:5]])
+    result = optimize(variable_function, data, cost_hint=float)
+    
+    assert result.schedule == "lpt"
+    intercept, slope = result.cost_model
+    assert intercept == pytest.approx(0.0001)
+    assert slope == pytest.approx(0.001)
+    # Serial time follows the hint rather than the sample average
+    serial_time = result.predicted_time * result.estimated_speedup
+    assert serial_time == pytest.approx(0.0001 * len(data) + 0.001 * sum(data))
+    
+    with pytest.raises(ValueError):
+        optimize(variable_function, data, schedule="lpt")
+
+
+def quadratic_function(size):
+    """A function whose cost grows with the square of its input."""
+    return sum(i * j for i in range(size) for j in range(size))
+
+
+def test_fit_size_model_requires_dependency():
+    """Test that a size model is only used when time depends on size."""
+    assert fit_size_model([1, 2, 3, 4], [0.01, 0.01, 0.01, 0.01]) is None
+    assert fit_size_model([5, 5, 6], [0.01, 0.02, 0.03]) is None
+    model = fit_size_model([10, 20, 40, 80], [0.001 * x for x in [10, 20, 40, 80]])
+    assert model is not None
+
+
+def test_optimize_size_model_predicts_total_work(physical_cores, fixed_dry_run):
+    """Test that large items beyond the sample are accounted for."""
+    physical_cores(8)
+    
+    data = [40, 60, 80, 100, 120] + [240] * 50
+    fixed_dry_run([1e-7 * x ** 2 for x in data[:5]])
+    result = optimize(quadratic_function, data)
+    
+    kind, coefficient, exponent = result.size_model
+    assert kind == "power"
+    assert exponent == pytest.approx(2.0)
+    # The sample average alone would miss the large items
+    serial_time = result.predicted_time * result.estimated_speedup
+    assert serial_time == pytest.approx(sum(1e-7 * x ** 2 for x in data), rel=0.05)
+
+
+def test_optimize_simulate(physical_cores, fixed_dry_run):
+    """Test that the simulator picks the plan and predicts its time."""
+    physical_cores(8)
+    fixed_dry_run([0.01] * 3)
+    
+    data = list(range(400))
+    analytic = optimize(slow_function, data, sample_size=3)
+    simulated = optimize(slow_function, data, sample_size=3, simulate=True)
+    
+    assert analytic.simulation is None
+    assert simulated.simulation is not None
+    assert simulated.n_jobs > 1
+    assert simulated.predicted_time == simulated.simulation.makespan
+    # Uniform items: the simulation agrees with the analytic model
+    assert simulated.predicted_time == pytest.approx(analytic.predicted_time, rel=0.25)
+    assert 0.5 < simulated.simulation.utilization <= 1.0
+
+
+def test_optimize_simulate_variable_items(physical_cores, fixed_dry_run):
+    """Test that heterogeneous item times are replayed through the pool model."""
+    physical_cores(8)
+    fixed_dry_run([0.0001, 0.001, 0.002, 0.008, 0.016])
+    
+    result = optimize(variable_function, [0, 1, 2, 8, 16] * 80, simulate=True)
+    assert result.simulation is not None
+    assert result.simulation.n_chunks >= result.n_jobs
+    serial_time = 80 * (0.0001 + 0.001 + 0.002 + 0.008 + 0.016)
+    assert serial_time / result.n_jobs < result.predicted_time < serial_time
+
+
+def test_optimize_function_shipping_cost(physical_cores, fixed_dry_run):
+    """Test that a heavy callable is charged per chunk unless it is installed once."""
+    physical_cores(8)
+    
+    data = list(range(1000))
+    fixed_dry_run([0.001] * 5)
+    light = optimize(slow_function, data)
+    
+    # A bound method carrying ~5MB of state, pickled into every chunk
+    fixed_dry_run([0.001] * 5, func_size=5_000_000, func_pickle_time=0.005)
+    shipped = optimize(slow_function, data)
+    installed = optimize(slow_function, data, install_function=True)
+    
+    assert shipped.predicted_time > light.predicted_time
+    assert any("install_function" in w for w in shipped.warnings)
+    # Shipping per chunk favours fewer, larger chunks
+    assert shipped.chunksize >= light.chunksize
+    assert installed.predicted_time < shipped.predicted_time
+    assert not any("install_function" in w for w in installed.warnings)
+
+
+def test_optimize_max_overhead(monkeypatch, physical_cores, fixed_dry_run):
+    """Test that max_overhead derives the chunk duration from the measured overhead."""
+    import amorsize.optimizer as optimizer_module
+    physical_cores(8)
+    fixed_dry_run([0.0001] * 5)
+    data = list(range(100000))
+    
+    # A slow host: 1ms per dispatch, at most 10% overhead -> 10ms chunks of 100 items
+    monkeypatch.setattr(optimizer_module, "measure_chunk_overhead", lambda: 0.001)
+    slow_host = optimize(slow_function, data, max_overhead=0.1)
+    assert slow_host.chunksize == 100
+    
+    # A fast host needs much smaller chunks for the same overhead share
+    monkeypatch.setattr(optimizer_module, "measure_chunk_overhead", lambda: 0.00002)
+    fast_host = optimize(slow_function, data, max_overhead=0.1)
+    assert fast_host.chunksize == 2
+    
+    with pytest.raises(ValueError):
+        optimize(slow_function, data, max_overhead=1.5)
+
+
+def very_slow_function(x):
+    """A function slower than the analysis budget."""
+    time.sleep(0.5)
+    return x
+
+
+def test_optimize_time_budget(physical_cores):
+    """Test that max_optimize_time bounds the analysis of a very slow function."""
+    physical_cores(8)
+    
+    start_time = time.perf_counter()
+    result = optimize(very_slow_function, list(range(100)), max_optimize_time=0.1)
+    assert time.perf_counter() - start_time < 0.1
+    
+    # Even the lower bound of 0.1s per item makes 100 items worth parallelizing
+    assert result.n_jobs > 1
+    assert result.confidence == 0.0
+    assert any("lower bound" in w for w in result.warnings)
+    
+    with pytest.raises(ValueError):
+        optimize(very_slow_function, list(range(100)), max_optimize_time=0)
+
+
+def busy_function(x):
+    """A function that spins for 1.5ms - short enough to be re-timed in batches."""
+    start_time = time.perf_counter()
+    while time.perf_counter() - start_time < 0.0015:
+        pass
+    return x
+
+
+def test_optimize_time_budget_short_calls(physical_cores, monkeypatch):
+    """Test that pickling, re-timing and calibration stay within a tight budget."""
+    import amorsize.optimizer as optimizer_module
+    physical_cores(8)
+    
+    for budget in (0.005, 0.02):
+        # Best of three, so a scheduler hiccup does not count against the budget
+        elapsed = []
+        for _ in range(3):
+            start_time = time.perf_counter()
+            result = optimize(busy_function, list(range(1000)), max_optimize_time=budget)
+            elapsed.append(time.perf_counter() - start_time)
+            assert result.n_jobs > 1
+        assert min(elapsed) < budget
+    
+    # Starting a worker does not fit - the default dispatch cost is used
+    calibrations = []
+    monkeypatch.setattr(optimizer_module, "get_measured_chunk_overhead", lambda: None)
+    monkeypatch.setattr(optimizer_module, "measure_chunk_overhead",
+                        lambda: calibrations.append(True) or 1e-4)
+    elapsed = []
+    for _ in range(3):
+        start_time = time.perf_counter()
+        result = optimize(busy_function, list(range(1000)), max_optimize_time=0.01,
+                          max_overhead=0.05, simulate=True)
+        elapsed.append(time.perf_counter() - start_time)
+    assert min(elapsed) < 0.01
+    assert not calibrations
+    assert any("dispatch overhead" in w for w in result.warnings)
+
+
+def test_optimize_reports_confidence():
+    """Test that the sampled time's confidence is reported without a budget."""
+    result = optimize(slow_function, list(range(100)), sample_size=3)
+    assert 0.0 < result.confidence <= 1.0
+    assert "Confidence" in str(result)
+
+
+def test_optimize_simulate_with_objective(physical_cores, fixed_dry_run):
+    """Test that simulation checks other objectives' plans without disowning them."""
+    physical_cores(8)
+    fixed_dry_run([0.01] * 3)
+    data = list(range(400))
+    
+    deadline = optimize(slow_function, data, objective="deadline", deadline=2.0, simulate=True)
+    efficiency = optimize(slow_function, data, objective="efficiency", min_efficiency=0.5,
+                          simulate=True)
+    for result in (deadline, efficiency):
+        assert result.simulation is not None
+        assert not any("Cannot evaluate" in w for w in result.warnings)
+    
+    # Without the data size the objective cannot be applied, simulated or not
+    unsized = optimize(slow_function, (x for x in data), objective="deadline", deadline=2.0,
+                       simulate=True)
+    assert any("Cannot evaluate the 'deadline' objective" in w for w in unsized.warnings)
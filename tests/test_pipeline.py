@@ -0,0 +1,164 @@
+"""
+Tests for pipeline module.
+"""
+
+import os
+import pytest
+import time
+from amorsize import optimize_pipeline, execute_pipeline
+from amorsize.pipeline import PipelinePlan, allocate_workers
+import amorsize.pipeline as pipeline_module
+
+
+def parse(x):
+    """Fast first stage."""
+    time.sleep(0.001)
+    return x + 1
+
+
+def enrich(x):
+    """Slow middle stage."""
+    time.sleep(0.008)
+    return x * 2
+
+
+def score(x):
+    """Fast last stage."""
+    time.sleep(0.001)
+    return x - 3
+
+
+def failing_stage(x):
+    """A stage that raises for odd items."""
+    if x % 2:
+        raise ValueError("odd item")
+    return x
+
+
+def test_allocate_workers_balances_bottleneck():
+    """Test that extra cores go to the slowest stage."""
+    assert allocate_workers([1.0, 4.0, 1.0], 6) == [1, 4, 1]
+    assert allocate_workers([1.0, 1.0], 2) == [1, 1]
+    # Budget smaller than the number of stages still gives one each
+    assert allocate_workers([1.0, 1.0, 1.0], 2) == [1, 1, 1]
+
+
+def test_optimize_pipeline_allocates_cores(monkeypatch):
+    """Test that the slowest stage receives the most workers."""
+    monkeypatch.setattr(pipeline_module, "get_physical_cores", lambda: 6)
+    monkeypatch.setattr(pipeline_module, "calculate_max_workers", lambda cores, *args: cores)
+
+    plan = optimize_pipeline([parse, enrich, score], list(range(1000)))
+
+    assert isinstance(plan, PipelinePlan)
+    assert len(plan.stage_times) == 3
+    assert sum(plan.workers) == 6
+    assert plan.workers[1] > plan.workers[0]
+    assert plan.workers[1] > plan.workers[2]
+    assert plan.queue_size >= max(plan.workers)
+
+
+def test_optimize_pipeline_errors():
+    """Test pipeline planning with empty data and no stages."""
+    plan = optimize_pipeline([parse], [])
+    assert plan.serial is True
+    assert len(plan.warnings) > 0
+
+    plan = optimize_pipeline([], [1, 2, 3])
+    assert plan.serial is True
+
+
+def test_execute_pipeline_serial():
+    """Test a pipeline of fast stages (runs serially)."""
+    data = list(range(10))
+    results = execute_pipeline([parse, enrich, score], data)
+    assert results == [(x + 1) * 2 - 3 for x in data]
+
+
+def test_execute_pipeline_parallel_preserves_order():
+    """Test a pipeline with processes per stage and bounded queues."""
+    data = list(range(40))
+    plan = PipelinePlan(workers=[1, 3, 1], stage_times=[0.001, 0.004, 0.001],
+                        reason="Test", queue_size=2)
+    results = execute_pipeline([parse, enrich, score], iter(data), plan)
+    assert results == [(x + 1) * 2 - 3 for x in data]
+
+
+def test_execute_pipeline_stage_failure():
+    """Test that a failing stage raises after the pipeline drains."""
+    plan = PipelinePlan(workers=[2, 1], stage_times=[0.001, 0.001],
+                        reason="Test", queue_size=2)
+    with pytest.raises(RuntimeError, match="stage 0"):
+        execute_pipeline([failing_stage, parse], list(range(10)), plan)
+
+
+def make_record(x):
+    """Cheap stage with a large result."""
+    return bytes(10000)
+
+
+def record_length(record):
+    """Cheap stage with a small result."""
+    return len(record)
+
+
+def test_optimize_pipeline_cheap_stages_serial(monkeypatch):
+    """Test that queue and pickling costs make cheap stages run serially."""
+    monkeypatch.setattr(pipeline_module, "get_physical_cores", lambda: 8)
+    monkeypatch.setattr(pipeline_module, "calculate_max_workers", lambda cores, *args: cores)
+
+    plan = optimize_pipeline([make_record, record_length], list(range(100000)))
+
+    assert plan.serial is True
+    # Cheap stages are batched so one message carries many items
+    assert all(size > 1 for size in plan.batch_sizes)
+
+
+def test_optimize_pipeline_batches_cheap_stages(monkeypatch):
+    """Test that a fast stage gets larger batches than a slow one."""
+    monkeypatch.setattr(pipeline_module, "get_physical_cores", lambda: 6)
+    monkeypatch.setattr(pipeline_module, "calculate_max_workers", lambda cores, *args: cores)
+
+    plan = optimize_pipeline([record_length, enrich], [b"x"] * 1000)
+
+    assert plan.batch_sizes[0] >= plan.batch_sizes[1]
+
+
+def test_execute_pipeline_batched_preserves_order():
+    """Test batches of different sizes between stages, with a partial last batch."""
+    data = list(range(37))
+    plan = PipelinePlan(workers=[1, 2, 1], stage_times=[0.001, 0.004, 0.001],
+                        reason="Test", queue_size=2, batch_sizes=[5, 3, 4])
+    results = execute_pipeline([parse, enrich, score], iter(data), plan)
+    assert results == [(x + 1) * 2 - 3 for x in data]
+
+
+def dying_stage(x):
+    """A stage whose worker process exits on item 3."""
+    time.sleep(0.005)
+    if x == 3:
+        os._exit(1)
+    return x
+
+
+def failing_input():
+    """Input that raises part way through."""
+    yield 1
+    yield 2
+    raise ValueError("bad input")
+
+
+def test_execute_pipeline_lost_items():
+    """Test that items lost with an exited worker are reported by index."""
+    plan = PipelinePlan(workers=[2, 1], stage_times=[0.005, 0.001],
+                        reason="Test", queue_size=2)
+    with pytest.raises(RuntimeError, match=r"lost 1 of 10 item\(s\) \(indices 3\)"):
+        execute_pipeline([dying_stage, parse], list(range(10)), plan)
+
+
+def test_execute_pipeline_input_error():
+    """Test that an error from the input is raised instead of hanging."""
+    plan = PipelinePlan(workers=[1, 1], stage_times=[0.001, 0.001],
+                        reason="Test", queue_size=2)
+    with pytest.raises(ValueError, match="bad input"):
+        execute_pipeline([parse, score], failing_input(), plan)
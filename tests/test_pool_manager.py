@@ -0,0 +1,169 @@
+"""
+Tests for pool_manager module.
+"""
+
+import pytest
+import time
+from amorsize import PoolManager, get_pool_manager, optimize, execute
+from amorsize.optimizer import OptimizationResult
+import amorsize.optimizer as optimizer_module
+
+
+def square(x):
+    """A simple function."""
+    return x ** 2
+
+
+def slow_function(x):
+    """A slow function."""
+    time.sleep(0.005)
+    return x
+
+
+def test_pool_reused_between_calls():
+    """Test that the same warm pool serves repeated requests."""
+    manager = PoolManager()
+    try:
+        with manager.pool(2) as first:
+            assert first.map(square, range(5)) == [0, 1, 4, 9, 16]
+        with manager.pool(2) as second:
+            assert second is first
+        assert len(manager) == 1
+        assert manager.warm_workers() == 2
+        assert manager.startup_workers(2) == 0
+    finally:
+        manager.shutdown()
+
+
+def test_busy_pool_not_shared():
+    """Test that a pool in use is not handed out twice."""
+    manager = PoolManager()
+    try:
+        with manager.pool(1, backend="thread") as first:
+            assert manager.warm_workers("thread") == 0
+            with manager.pool(1, backend="thread") as second:
+                assert second is not first
+        assert len(manager) == 2
+    finally:
+        manager.shutdown()
+
+
+def test_pool_grown_by_replacement():
+    """Test that a larger request replaces a smaller idle pool."""
+    manager = PoolManager()
+    try:
+        with manager.pool(1, backend="thread") as small:
+            pass
+        assert manager.startup_workers(3, backend="thread") == 3
+        with manager.pool(3, backend="thread") as pool:
+            assert pool is not small
+            assert pool.map(square, range(6)) == [x ** 2 for x in range(6)]
+        assert len(manager) == 1
+        assert manager.warm_workers("thread") == 3
+    finally:
+        manager.shutdown()
+
+
+def test_larger_pool_not_lent_for_smaller_request():
+    """Test that a smaller request does not run on a larger pool's extra workers."""
+    manager = PoolManager()
+    try:
+        with manager.pool(3, backend="thread") as large:
+            pass
+        assert manager.startup_workers(1, backend="thread") == 1
+        with manager.pool(1, backend="thread") as small:
+            assert small is not large
+        assert len(manager) == 2
+        assert manager.startup_workers(3, backend="thread") == 0
+    finally:
+        manager.shutdown()
+
+
+def test_idle_pools_shut_down():
+    """Test that idle pools are reaped after the timeout."""
+    manager = PoolManager(idle_timeout=0.1)
+    try:
+        with manager.pool(1, backend="thread"):
+            pass
+        deadline = time.monotonic() + 5
+        while len(manager) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(manager) == 0
+    finally:
+        manager.shutdown()
+
+
+def test_retire_single_pool():
+    """Test that retiring a pool leaves the manager's other pools warm."""
+    manager = PoolManager()
+    try:
+        with manager.pool(1, backend="thread") as first:
+            pass
+        with manager.pool(2, backend="thread", initializer=square, initargs=(2,)) as second:
+            # Borrowed pools are not retired
+            assert not manager.retire(second)
+        assert manager.retire(first)
+        assert not manager.retire(first)
+        assert len(manager) == 1
+        assert manager.warm_workers("thread", initializer=square, initargs=(2,)) == 2
+    finally:
+        manager.shutdown()
+
+
+def test_pools_keyed_by_initializer():
+    """Test that warm pools are only shared with the same initializer."""
+    manager = PoolManager()
+    try:
+        with manager.pool(1, backend="thread", initializer=square, initargs=(2,)):
+            pass
+        assert manager.warm_workers("thread") == 0
+        assert manager.warm_workers("thread", initializer=square, initargs=(2,)) == 1
+        assert manager.startup_workers(1, "thread", initializer=square, initargs=(2,)) == 0
+    finally:
+        manager.shutdown()
+
+
+def test_unknown_backend():
+    """Test that an unknown backend is rejected."""
+    manager = PoolManager()
+    with pytest.raises(ValueError):
+        with manager.pool(1, backend="gpu"):
+            pass
+
+
+def test_get_pool_manager_singleton():
+    """Test that the default manager is shared."""
+    assert get_pool_manager() is get_pool_manager()
+
+
+def test_optimize_models_warm_pool(monkeypatch, physical_cores):
+    """Test that a warm pool removes spawn cost from the speedup estimate."""
+    physical_cores(2)
+    monkeypatch.setattr(optimizer_module, "get_spawn_cost", lambda: 0.5)
+
+    data = list(range(100))
+    cold = optimize(slow_function, data, sample_size=3)
+
+    manager = PoolManager()
+    try:
+        with manager.pool(2):
+            pass
+        warm = optimize(slow_function, data, sample_size=3, pool_manager=manager)
+    finally:
+        manager.shutdown()
+
+    assert cold.n_jobs == 1
+    assert warm.n_jobs == 2
+    assert warm.estimated_speedup > 1.0
+
+
+def test_execute_with_pool_manager():
+    """Test execution borrowing a warm pool."""
+    manager = PoolManager()
+    try:
+        result = OptimizationResult(n_jobs=2, chunksize=3, reason="Test")
+        data = list(range(20))
+        assert execute(square, data, result=result, pool_manager=manager) == [x ** 2 for x in data]
+        assert manager.warm_workers() == 2
+    finally:
+        manager.shutdown()
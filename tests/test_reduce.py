@@ -0,0 +1,93 @@
+"""
+Tests for reduce module.
+"""
+
+import pytest
+import operator
+import time
+from collections import Counter
+from amorsize import optimize, optimize_reduce, execute_reduce
+from amorsize.optimizer import OptimizationResult
+from amorsize.sampling import perform_dry_run
+
+
+def square(x):
+    """A simple single-argument function."""
+    return x ** 2
+
+
+def word_counts(line):
+    """Count words in a line, returning a large per-item result."""
+    return Counter(line.split())
+
+
+def slow_histogram(x):
+    """A slow function with a bulky per-item result."""
+    time.sleep(0.01)
+    return {"bucket": x % 4, "payload": list(range(200))}
+
+
+def count_buckets(counts, record):
+    """Fold a record into a bucket histogram."""
+    counts[record["bucket"]] += 1
+    return counts
+
+
+def test_dry_run_measures_partial_size():
+    """Test that the dry run folds results and records the partial size."""
+    result = perform_dry_run(slow_histogram, list(range(5)), combine=count_buckets,
+                             initial=Counter())
+    assert result.error is None
+    assert result.partial_size > 0
+    assert result.partial_size < result.return_size
+
+
+def test_optimize_reduce_models_smaller_ipc(monkeypatch, physical_cores):
+    """Test that reducing in workers improves the modelled speedup."""
+    import amorsize.optimizer as optimizer_module
+    physical_cores(4)
+    # Make IPC expensive enough to matter for this small payload
+    monkeypatch.setattr(optimizer_module, "get_ipc_cost_per_byte", lambda: 1e-6)
+
+    data = list(range(200))
+    map_result = optimize(slow_histogram, data, sample_size=3)
+    reduce_result = optimize_reduce(slow_histogram, count_buckets, data,
+                                    initial=Counter(), sample_size=3)
+
+    assert isinstance(reduce_result, OptimizationResult)
+    assert reduce_result.estimated_speedup > map_result.estimated_speedup
+
+
+def test_execute_reduce_serial():
+    """Test map-reduce of a fast function (runs serially)."""
+    data = list(range(100))
+    assert execute_reduce(square, operator.add, data) == sum(x ** 2 for x in data)
+
+
+def test_execute_reduce_parallel():
+    """Test map-reduce with workers reducing chunks locally."""
+    lines = ["a b c", "a b", "a"] * 20
+    result = OptimizationResult(n_jobs=2, chunksize=7, reason="Test")
+    totals = execute_reduce(word_counts, operator.add, lines, initial=Counter(), result=result)
+    assert totals == Counter({"a": 60, "b": 40, "c": 20})
+
+
+def test_execute_reduce_guided_schedule():
+    """Test map-reduce over guided chunks."""
+    data = list(range(200))
+    result = OptimizationResult(n_jobs=2, chunksize=3, reason="Test", schedule="guided")
+    assert execute_reduce(square, operator.add, data, result=result) == sum(x ** 2 for x in data)
+
+
+def test_execute_reduce_with_merge():
+    """Test map-reduce with a separate merge for partials."""
+    data = list(range(50))
+    result = OptimizationResult(n_jobs=2, chunksize=5, reason="Test")
+    totals = execute_reduce(slow_histogram, count_buckets, data, initial=Counter(),
+                            merge=operator.add, result=result)
+    assert totals == Counter(x % 4 for x in data)
+
+
+def test_execute_reduce_empty():
+    """Test map-reduce over empty data returns the initial value."""
+    assert execute_reduce(square, operator.add, [], initial=0) == 0
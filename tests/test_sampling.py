@@ -9,6 +9,9 @@ from amorsize.sampling import (
     safe_slice_data,
     perform_dry_run,
     estimate_total_items,
+    measure_call_time,
+    item_size,
+    sample_item_sizes,
     SamplingResult
 )
 
@@ -86,6 +89,22 @@ def test_perform_dry_run_slow():
     assert result.sample_count == 3
 
 
+def add(a, b, offset=0):
+    """A multi-argument function for testing."""
+    return a + b + offset
+
+
+def test_perform_dry_run_starmap():
+    """Test dry run with argument tuples and keyword arguments."""
+    data = [(i, i + 1) for i in range(10)]
+    result = perform_dry_run(add, data, sample_size=5, starmap=True, func_kwargs={"offset": 1})
+    
+    assert result.error is None
+    assert result.sample_count == 5
+    assert result.is_picklable is True
+    assert result.input_size > 0
+
+
 def test_perform_dry_run_empty_data():
     """Test dry run with empty data."""
     data = []
@@ -123,3 +142,213 @@ def test_estimate_total_items_generator():
     data = gen()
     count = estimate_total_items(data, True)
     assert count == -1  # Cannot determine size
+
+
+_STATE = {}
+
+
+def setup_state(size):
+    """An initializer that keeps memory alive."""
+    _STATE["buffer"] = bytearray(size)
+
+
+def use_state(x):
+    """A function relying on the initializer's state."""
+    return len(_STATE["buffer"]) + x
+
+
+def test_perform_dry_run_initializer():
+    """Test that the initializer runs first and its cost is measured."""
+    result = perform_dry_run(use_state, list(range(5)), initializer=setup_state,
+                             initargs=(1024 * 1024,))
+    
+    assert result.error is None
+    assert result.init_time > 0
+    assert result.init_memory >= 1024 * 1024
+
+
+def microsecond_function(x):
+    """A function costing a few microseconds."""
+    return sum(range(200)) + x
+
+
+def test_measure_call_time_microsecond_function():
+    """Test that batched timing matches timeit for calls below timer resolution."""
+    import timeit
+    reference = min(timeit.repeat(lambda: microsecond_function(1), number=2000, repeat=3)) / 2000
+    
+    measured = measure_call_time(microsecond_function, 1)
+    assert reference / 3 < measured < reference * 3
+
+
+def test_measure_call_time_subtracts_overhead():
+    """Test that the harness overhead is not counted as work."""
+    def noop(x):
+        return None
+    
+    assert measure_call_time(noop, 1) < measure_call_time(microsecond_function, 1)
+
+
+def add_one(x):
+    """A function about as cheap as the call itself."""
+    return x + 1
+
+
+def test_measure_call_time_call_sized_function():
+    """Test that a function costing about one call is not measured as free."""
+    times = [measure_call_time(add_one, x) for x in range(5)]
+    assert all(t > 0 for t in times)
+
+
+def test_perform_dry_run_constant_cost_low_variation():
+    """Test that a constant-cost function is not given timer noise as spread."""
+    for func in (add_one, microsecond_function):
+        result = perform_dry_run(func, list(range(5)))
+        assert result.error is None
+        assert result.avg_time > 0
+        assert result.time_std / result.avg_time < 0.25
+
+
+def test_perform_dry_run_times_short_folds_in_batches():
+    """Test that a cheap combine adds its batched time to every folded item."""
+    import operator
+    plain = perform_dry_run(microsecond_function, list(range(5)))
+    folded = perform_dry_run(microsecond_function, list(range(5)), combine=operator.add,
+                             initial=0)
+    assert folded.error is None
+    assert folded.avg_time >= plain.avg_time * 0.8
+    assert folded.time_std / folded.avg_time < 0.25
+
+
+def test_perform_dry_run_microsecond_function():
+    """Test that cheap functions get a per-item cost rather than timer noise."""
+    import timeit
+    reference = min(timeit.repeat(lambda: microsecond_function(1), number=2000, repeat=3)) / 2000
+    
+    result = perform_dry_run(microsecond_function, list(range(5)))
+    assert result.error is None
+    assert reference / 3 < result.avg_time < reference * 3
+
+
+def variable_function(x):
+    """A function whose cost depends on the input."""
+    time.sleep(0.002 * x)
+    return x
+
+
+def test_perform_dry_run_time_std():
+    """Test that the spread of item times is reported."""
+    uniform = perform_dry_run(slow_function, [1] * 5)
+    variable = perform_dry_run(variable_function, [0, 1, 2, 4, 8])
+    
+    assert variable.time_std > 0.003
+    assert variable.time_std > uniform.time_std
+
+
+def test_item_size():
+    """Test the size feature of different kinds of items."""
+    assert item_size(250) == 250.0
+    assert item_size(-3.5) == 3.5
+    assert item_size("abcd") == 4.0
+    assert item_size([1, 2, 3]) == 3.0
+    assert item_size(("ab", 7), starmap=True) == 7.0
+    assert item_size(None) > 0
+
+
+def test_sample_item_sizes():
+    """Test that large datasets are sampled with a stride."""
+    sizes = sample_item_sizes(list(range(10000)), max_items=100)
+    assert len(sizes) == 100
+    assert sizes[0] == 0.0 and sizes[-1] == 9900.0
+    assert sample_item_sizes(["a", "bb"]) == [1.0, 2.0]
+
+
+def test_perform_dry_run_item_sizes():
+    """Test that each sampled item's size and time are recorded."""
+    result = perform_dry_run(variable_function, [0, 1, 2, 4, 8])
+    assert result.item_sizes == [0.0, 1.0, 2.0, 4.0, 8.0]
+    assert len(result.item_times) == 5
+
+
+def test_measure_pickle_cost():
+    """Test that the pickled size and time of a callable are measured."""
+    import functools
+    import pickle
+    from amorsize.sampling import measure_pickle_cost
+
+    payload = list(range(10000))
+    bound = functools.partial(simple_function, payload)
+    size, seconds = measure_pickle_cost(bound)
+    assert size == len(pickle.dumps(bound))
+    assert size > len(pickle.dumps(simple_function))
+    assert seconds > 0
+
+    # Unpicklable objects report no cost
+    assert measure_pickle_cost(lambda x: x) == (0, 0.0)
+
+
+def lookup(x, table=None):
+    """A function that reads from a table passed as a keyword argument."""
+    return table[x] if table else x
+
+
+def test_perform_dry_run_function_size():
+    """Test that the dry run reports the pickled size of the bound function."""
+    plain = perform_dry_run(lookup, list(range(10)), sample_size=3)
+    bound = perform_dry_run(
+        lookup, list(range(10)), sample_size=3,
+        func_kwargs={"table": list(range(10000))}
+    )
+    assert bound.error is None
+    assert plain.func_size > 0
+    assert bound.func_size > plain.func_size
+
+
+def test_sample_confidence():
+    """Test the confidence score of sampled item times."""
+    from amorsize.sampling import sample_confidence
+
+    assert sample_confidence([0.1, 0.1, 0.1]) == pytest.approx(1.0)
+    assert sample_confidence([0.1]) == 0.5
+    assert sample_confidence([0.1, 0.1], censored=True) == 0.0
+    assert sample_confidence([]) == 0.0
+    assert sample_confidence([0.1, 0.3, 0.05, 0.2]) < sample_confidence([0.1, 0.11, 0.1, 0.09])
+
+
+def test_perform_dry_run_budget_censors_slow_item():
+    """Test that an item outlasting the budget becomes a lower bound on the item time."""
+    def very_slow(x):
+        time.sleep(0.5)
+        return x
+
+    start_time = time.perf_counter()
+    result = perform_dry_run(very_slow, list(range(5)), sample_size=5, max_time=0.1)
+    elapsed = time.perf_counter() - start_time
+
+    # The abandoned call ends at the budget; only sizing the item follows
+    assert elapsed < 0.1 + 0.01
+    assert result.error is None
+    assert result.censored is True
+    assert result.sample_count == 1
+    assert result.avg_time >= 0.09
+    assert result.confidence == 0.0
+    assert result.input_size > 0
+
+
+def test_perform_dry_run_budget_stops_when_converged():
+    """Test that a budgeted dry run stops once the item time is known well enough."""
+    result = perform_dry_run(slow_function, [1] * 10, sample_size=10, max_time=5.0)
+    assert result.error is None
+    assert result.censored is False
+    assert 2 <= result.sample_count < 10
+    assert len(result.item_times) == result.sample_count
+    assert result.confidence > 0.9
+
+
+def test_perform_dry_run_budget_propagates_errors():
+    """Test that an exception raised in the sampling thread is reported."""
+    def error_function(x):
+        raise ValueError("Test error")
+
+    result = perform_dry_run(error_function, [1, 2, 3], max_time=1.0)
+    assert isinstance(result.error, ValueError)
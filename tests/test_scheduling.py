@@ -0,0 +1,59 @@
+"""
+Tests for scheduling module.
+"""
+
+import pytest
+from amorsize.scheduling import (
+    choose_schedule,
+    min_chunksize_for_overhead,
+    guided_chunk_sizes,
+    iter_chunks,
+    lpt_partition,
+)
+
+
+def test_choose_schedule():
+    """Test that the schedule follows the item-time variation."""
+    assert choose_schedule(0.0) == "static"
+    assert choose_schedule(0.8) == "guided"
+    assert choose_schedule(3.0) == "dynamic"
+
+
+def test_min_chunksize_for_overhead():
+    """Test that dispatch stays within 5% of a chunk's time."""
+    # 100us dispatch, 1ms items: 2 items would be 5% overhead
+    assert min_chunksize_for_overhead(0.001, 1e-4) == 2
+    assert min_chunksize_for_overhead(1e-6, 1e-4) == 2000
+    assert min_chunksize_for_overhead(1.0, 1e-4) == 1
+    assert min_chunksize_for_overhead(0.0, 1e-4) == 1
+
+
+def test_guided_chunk_sizes():
+    """Test that guided chunks shrink to the minimum and cover every item."""
+    sizes = guided_chunk_sizes(1000, 4, min_chunksize=5)
+
+    assert sum(sizes) == 1000
+    assert sizes[0] == 125
+    assert sizes == sorted(sizes, reverse=True)
+    assert min(sizes[:-1]) == 5
+    assert guided_chunk_sizes(0, 4) == []
+
+
+def test_iter_chunks():
+    """Test fixed and variable chunking."""
+    assert list(iter_chunks(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(iter_chunks(range(7), [4, 2, 1])) == [[0, 1, 2, 3], [4, 5], [6]]
+    assert list(iter_chunks(iter(range(3)), 5)) == [[0, 1, 2]]
+
+
+def test_lpt_partition_balances_cost():
+    """Test that chunks have balanced predicted cost, most expensive first."""
+    costs = [100, 1, 1, 1, 50, 50, 2, 2, 30, 20, 20, 10]
+    chunks = lpt_partition(costs, 3)
+
+    assert sorted(index for chunk in chunks for index in chunk) == list(range(len(costs)))
+    loads = [sum(costs[index] for index in chunk) for chunk in chunks]
+    assert loads == sorted(loads, reverse=True)
+    assert max(loads) - min(loads) <= max(costs)
+    # More chunks than items leaves no empty chunks
+    assert len(lpt_partition([1, 2], 5)) == 2
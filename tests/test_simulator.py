@@ -0,0 +1,74 @@
+"""
+Tests for simulator module.
+"""
+
+import pytest
+from amorsize.simulator import (
+    EXACT_DRAW_ITEMS,
+    SimulationResult,
+    sample_chunk_times,
+    simulate_plan,
+    simulate_pool,
+)
+
+
+def test_simulate_pool_balanced():
+    """Test that equal chunks keep every worker busy."""
+    result = simulate_pool([1.0] * 4, 2, [0.0] * 4, [0.0] * 4)
+    assert isinstance(result, SimulationResult)
+    assert result.makespan == pytest.approx(2.0)
+    assert result.utilization == pytest.approx(1.0)
+    assert result.worker_busy == [2.0, 2.0]
+    assert result.n_chunks == 4
+
+
+def test_simulate_pool_startup_and_straggler():
+    """Test that startup delays every worker and a late long chunk sets the makespan."""
+    result = simulate_pool([0.1, 0.1, 0.1, 1.0], 2, [0.0] * 4, [0.0] * 4, startup_time=0.5)
+    # The long chunk starts once a worker finishes its first chunk
+    assert result.makespan == pytest.approx(0.5 + 0.1 + 1.0)
+    assert result.utilization < 1.0
+
+
+def test_simulate_pool_serial_dispatch():
+    """Test that the parent dispatches chunks one after another."""
+    result = simulate_pool([0.1] * 4, 4, [0.5] * 4, [0.0] * 4)
+    # The last chunk leaves the parent at 2.0s, although workers were idle
+    assert result.makespan == pytest.approx(2.1)
+    assert result.parent_busy == pytest.approx(2.0)
+
+
+def test_simulate_pool_serial_collection():
+    """Test that results are collected one at a time."""
+    result = simulate_pool([1.0] * 4, 4, [0.0] * 4, [0.25] * 4)
+    assert result.makespan == pytest.approx(2.0)
+
+
+def test_sample_chunk_times():
+    """Test that chunk times are repeatable sums of sampled item times."""
+    item_times = [0.001, 0.002, 0.003]
+    times = sample_chunk_times(item_times, [1, 10, 1000], seed=1)
+    assert times == sample_chunk_times(item_times, [1, 10, 1000], seed=1)
+    assert times[0] in item_times
+    assert 0.010 <= times[1] <= 0.030
+    # Large chunks use the normal approximation around the mean
+    assert 1000 > EXACT_DRAW_ITEMS
+    assert times[2] == pytest.approx(2.0, rel=0.1)
+    assert sample_chunk_times([0.5], [3, 100]) == [1.5, 50.0]
+
+
+def test_simulate_plan():
+    """Test that dispatch, IPC and partial results are charged per chunk."""
+    result = simulate_plan(
+        [0.01], [10] * 8, 2, chunk_overhead=0.001,
+        input_bytes_time=0.0001, result_bytes_time=0.0001
+    )
+    # 4 chunks per worker of 0.1s, then the last result is collected
+    assert result.makespan == pytest.approx(0.4 + 0.002 + 0.001, rel=0.05)
+    assert result.parent_busy == pytest.approx(8 * (0.001 + 0.001 + 0.001))
+    
+    reduced = simulate_plan([0.01], [10] * 8, 2, 0.001, partial_time=0.0)
+    assert reduced.parent_busy == pytest.approx(8 * 0.001)
+    
+    known = simulate_plan([0.01], [1, 1], 2, 0.0, chunk_times=[0.5, 0.2])
+    assert known.makespan == pytest.approx(0.5)
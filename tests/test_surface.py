@@ -0,0 +1,103 @@
+"""
+Tests for surface module.
+"""
+
+import pytest
+import time
+from amorsize import optimize
+from amorsize.surface import RuntimeSurface, compute_surface, log_spaced_chunksizes
+import amorsize.surface as surface_module
+
+
+def slow_function(x):
+    """A slow function."""
+    time.sleep(0.005)
+    return x
+
+
+def surface_inputs():
+    """A workload of 1000 items of 10ms on up to 8 workers."""
+    return dict(
+        total_items=1000,
+        avg_time=0.01,
+        startup_times=[0.05 * n for n in range(1, 9)],
+        chunk_overhead=1e-4,
+        serial_time=10.0,
+        chunksizes=log_spaced_chunksizes(1000),
+        time_cv=0.3,
+        fixed_ipc_time=0.01
+    )
+
+
+def test_log_spaced_chunksizes():
+    """Test that chunk sizes span 1 to the item count on a log scale."""
+    sizes = log_spaced_chunksizes(1000)
+    assert sizes[0] == 1
+    assert sizes[-1] == 1000
+    assert sizes == sorted(set(sizes))
+    assert 10 <= len(sizes) <= 14
+    assert 37 in log_spaced_chunksizes(1000, include=[37])
+    assert log_spaced_chunksizes(1) == [1]
+
+
+def test_compute_surface(monkeypatch):
+    """Test the shape of the grid and the serial row."""
+    monkeypatch.setattr(surface_module, "HAS_NUMPY", False)
+    surface = compute_surface(**surface_inputs())
+    
+    assert isinstance(surface, RuntimeSurface)
+    assert surface.n_jobs == list(range(1, 9))
+    assert len(surface.times) == 8
+    assert all(len(row) == len(surface.chunksizes) for row in surface.times)
+    assert all(time == 10.0 for time in surface.times[0])
+    assert surface.efficiency[0][0] == pytest.approx(1.0)
+    
+    n_jobs, chunksize, time = surface.best()
+    assert n_jobs == 8
+    assert 1 < chunksize < 1000
+    assert time == surface.time(n_jobs, chunksize)
+    # One chunk per item pays dispatch a thousand times, one chunk leaves workers idle
+    assert surface.time(8, 1) > time
+    assert surface.time(8, 1000) > time
+
+
+def test_surface_curves(monkeypatch):
+    """Test the speedup and efficiency curves and the flatness of the optimum."""
+    monkeypatch.setattr(surface_module, "HAS_NUMPY", False)
+    surface = compute_surface(**surface_inputs())
+    
+    speedups = surface.speedup_curve()
+    efficiencies = surface.efficiency_curve()
+    assert speedups[0] == pytest.approx(1.0)
+    assert speedups == sorted(speedups)
+    assert all(0 < e <= 1 for e in efficiencies)
+    assert efficiencies[-1] == pytest.approx(speedups[-1] / 8)
+    assert 0 < surface.flatness() <= surface.flatness(tolerance=1.0) <= 1
+    assert "Fastest: n_jobs=8" in str(surface)
+
+
+def test_compute_surface_numpy_matches_python(monkeypatch):
+    """Test that the vectorized grid matches the pure Python one."""
+    pytest.importorskip("numpy")
+    vectorized = compute_surface(**surface_inputs())
+    monkeypatch.setattr(surface_module, "HAS_NUMPY", False)
+    plain = compute_surface(**surface_inputs())
+    for row, expected in zip(vectorized.times, plain.times):
+        assert list(row) == pytest.approx(expected)
+    assert vectorized.best() == pytest.approx(plain.best())
+
+
+def test_optimize_return_surface(physical_cores):
+    """Test that the surface contains the recommended plan."""
+    physical_cores(8)
+    
+    data = list(range(500))
+    result = optimize(slow_function, data, schedule="static", return_surface=True)
+    surface = result.surface
+    
+    assert surface.n_jobs == list(range(1, 9))
+    assert surface.time(result.n_jobs, result.chunksize) == pytest.approx(result.predicted_time)
+    assert surface.time(1, 1) == pytest.approx(result.predicted_time * result.estimated_speedup)
+    assert surface.best()[2] <= result.predicted_time + 1e-9
+    
+    assert optimize(slow_function, data).surface is None
@@ -7,6 +7,9 @@ from amorsize.system_info import (
     get_physical_cores,
     get_spawn_cost,
     get_available_memory,
+    get_cache_size,
+    get_chunk_overhead,
+    measure_chunk_overhead,
     calculate_max_workers,
     get_system_info
 )
@@ -33,6 +36,35 @@ def test_get_available_memory():
     assert memory > 0
 
 
+def test_get_cache_size():
+    """Test that get_cache_size returns a positive integer."""
+    size = get_cache_size()
+    assert isinstance(size, int)
+    assert size > 0
+
+
+def test_get_chunk_overhead():
+    """Test that the per-chunk dispatch overhead is a small positive time."""
+    overhead = get_chunk_overhead()
+    assert isinstance(overhead, float)
+    assert 0 < overhead < get_spawn_cost()
+
+
+def test_measure_chunk_overhead(monkeypatch):
+    """Test that the empty-task round trip is measured, cached and then used."""
+    import amorsize.system_info as system_info_module
+    monkeypatch.setattr(system_info_module, "_chunk_overheads", {})
+
+    for backend in ("process", "thread"):
+        overhead = measure_chunk_overhead(backend, tasks=10)
+        assert 0 < overhead < 1.0
+        assert measure_chunk_overhead(backend) == overhead
+        assert get_chunk_overhead(backend) == overhead
+
+    with pytest.raises(ValueError):
+        measure_chunk_overhead("cluster")
+
+
 def test_calculate_max_workers():
     """Test max workers calculation."""
     # Test with no memory constraint
@@ -43,6 +75,10 @@ def test_calculate_max_workers():
     result = calculate_max_workers(8, 1024 * 1024 * 1024)  # 1GB per job
     assert result >= 1
     assert result <= 8
+    
+    # Per-worker memory (e.g. from an initializer) is charged on top
+    with_init = calculate_max_workers(8, 1024 * 1024 * 1024, 1024 * 1024 * 1024)
+    assert 1 <= with_init <= result
 
 
 def test_get_system_info():
@@ -56,3 +92,13 @@ def test_get_system_info():
     assert cores > 0
     assert spawn_cost > 0
     assert memory > 0
+
+
+def test_calculate_max_workers_parent_memory(monkeypatch):
+    """Test that memory held by the parent leaves less for the workers."""
+    import amorsize.system_info as system_info_module
+    monkeypatch.setattr(system_info_module, "get_available_memory", lambda: 1000)
+    
+    assert calculate_max_workers(8, 100) == 8
+    assert calculate_max_workers(8, 100, parent_ram=400) == 4
+    assert calculate_max_workers(8, 100, parent_ram=2000) == 1
@@ -0,0 +1,226 @@
+"""
+Tests for watchdog module.
+"""
+
+import pytest
+import threading
+import time
+from amorsize import MemoryWatchdog, PoolManager, execute
+from amorsize.optimizer import OptimizationResult
+from amorsize.watchdog import (
+    read_available_memory,
+    read_memory_pressure,
+    read_total_memory,
+)
+import amorsize.watchdog as watchdog_module
+
+MB = 1024 * 1024
+
+
+def square(x):
+    """A simple single-argument function."""
+    return x ** 2
+
+def slow_square(x):
+    """A slow single-argument function."""
+    time.sleep(0.01)
+    return x ** 2
+
+def finish_time(x):
+    """Sleep - long for the first item - and return when the item finished."""
+    time.sleep(0.5 if x == 0 else 0.01)
+    return time.time()
+
+
+class FakeMemory:
+    """Replaceable memory readings."""
+
+    def __init__(self, available=1000 * MB, pressure=0.0):
+        self.available = available
+        self.pressure = pressure
+
+    def install(self, monkeypatch):
+        monkeypatch.setattr(watchdog_module, "read_available_memory", lambda: self.available)
+        monkeypatch.setattr(watchdog_module, "read_memory_pressure", lambda: self.pressure)
+        return self
+
+
+def test_read_memory():
+    """Test that memory readings are positive or unavailable."""
+    available = read_available_memory()
+    total = read_total_memory()
+    if available is not None:
+        assert 0 < available <= total
+    pressure = read_memory_pressure()
+    assert pressure is None or 0.0 <= pressure <= 100.0
+
+
+def test_default_threshold():
+    """Test that the default threshold is a share of total memory."""
+    watchdog = MemoryWatchdog()
+    assert 0 < watchdog.min_available
+    assert not watchdog.under_pressure
+
+
+def test_check_pauses_and_resumes_with_margin(monkeypatch):
+    """Test that dispatch pauses on low memory and resumes after recovery."""
+    memory = FakeMemory().install(monkeypatch)
+    watchdog = MemoryWatchdog(min_available=100 * MB)
+    
+    assert not watchdog.check()
+    memory.available = 90 * MB
+    assert watchdog.check()
+    assert watchdog.pauses == 1
+    # Just above the threshold is not enough to resume
+    memory.available = 110 * MB
+    assert watchdog.check()
+    memory.available = 200 * MB
+    assert not watchdog.check()
+    assert watchdog.pauses == 1
+    assert watchdog.paused_time > 0
+
+
+def test_check_pressure(monkeypatch):
+    """Test that memory pressure pauses dispatch until it falls well below the limit."""
+    memory = FakeMemory().install(monkeypatch)
+    watchdog = MemoryWatchdog(min_available=100 * MB, max_pressure=20.0)
+    
+    memory.pressure = 30.0
+    assert watchdog.check()
+    memory.pressure = 15.0
+    assert watchdog.check()
+    memory.pressure = 5.0
+    assert not watchdog.check()
+
+
+def test_wait_and_stop(monkeypatch):
+    """Test that waiters block while paused and are released by stop()."""
+    FakeMemory(available=0).install(monkeypatch)
+    watchdog = MemoryWatchdog(min_available=100 * MB, interval=0.01).start()
+    assert watchdog.running
+    assert watchdog.under_pressure
+    assert not watchdog.wait(0.05)
+    
+    watchdog.stop()
+    assert not watchdog.running
+    assert watchdog.wait(0)
+
+
+def test_execute_with_watchdog():
+    """Test that watched execution returns results in input order."""
+    data = list(range(50))
+    result = OptimizationResult(n_jobs=2, chunksize=5, reason="Test")
+    assert execute(square, data, result=result, watchdog=True) == [x ** 2 for x in data]
+    
+    guided = OptimizationResult(n_jobs=2, chunksize=2, reason="Test", schedule="guided")
+    assert execute(square, data, result=guided, watchdog=True) == [x ** 2 for x in data]
+
+
+def test_execute_pauses_under_pressure(monkeypatch):
+    """Test that submission waits for memory pressure to clear."""
+    memory = FakeMemory(available=0).install(monkeypatch)
+    watchdog = MemoryWatchdog(min_available=100 * MB, interval=0.01)
+    
+    def recover():
+        time.sleep(0.2)
+        memory.available = 1000 * MB
+    threading.Thread(target=recover).start()
+    
+    data = list(range(20))
+    result = OptimizationResult(n_jobs=2, chunksize=5, reason="Test")
+    start = time.perf_counter()
+    assert execute(square, data, result=result, watchdog=watchdog) == [x ** 2 for x in data]
+    assert time.perf_counter() - start >= 0.15
+    assert watchdog.pauses == 1
+    assert not watchdog.running
+
+
+def test_execute_watched_submits_on_any_completion(monkeypatch):
+    """Test that a free worker gets the next chunk while an earlier chunk still runs."""
+    FakeMemory().install(monkeypatch)
+    watchdog = MemoryWatchdog(min_available=100 * MB, interval=5.0)
+    
+    result = OptimizationResult(n_jobs=2, chunksize=1, reason="Test")
+    finished = execute(finish_time, list(range(20)), result=result, watchdog=watchdog)
+    # The second worker keeps taking chunks while the first item runs
+    # instead of idling until it completes
+    assert sum(1 for when in finished[1:] if when < finished[0]) >= 10
+
+
+def test_execute_retires_workers(monkeypatch):
+    """Test that a retired pool is shut down and replaced when pressure clears."""
+    memory = FakeMemory().install(monkeypatch)
+    manager = PoolManager()
+    # Another caller's warm pool, which retiring must leave alone
+    with manager.pool(1, backend="thread"):
+        pass
+    watchdog = MemoryWatchdog(min_available=100 * MB, interval=0.01, retire_workers=True)
+    
+    pools = []
+    original_pool = manager.pool
+    
+    def tracking_pool(*args, **kwargs):
+        context = original_pool(*args, **kwargs)
+        pool = context.__enter__()
+        pools.append(pool)
+        return _Borrowed(context, pool)
+    monkeypatch.setattr(manager, "pool", tracking_pool)
+    
+    def pressure_spike():
+        time.sleep(0.1)
+        memory.available = 0
+        time.sleep(0.2)
+        memory.available = 1000 * MB
+    threading.Thread(target=pressure_spike).start()
+    
+    data = list(range(100))
+    result = OptimizationResult(n_jobs=2, chunksize=1, reason="Test")
+    try:
+        assert execute(slow_square, data, result=result, watchdog=watchdog,
+                       pool_manager=manager) == [x ** 2 for x in data]
+        assert manager.warm_workers("thread") == 1
+    finally:
+        manager.shutdown()
+    assert watchdog.pauses == 1
+    assert len(pools) == 2
+    assert pools[0] is not pools[1]
+
+
+class _Borrowed:
+    """Context manager around an already entered pool context."""
+
+    def __init__(self, context, pool):
+        self.context = context
+        self.pool = pool
+
+    def __enter__(self):
+        return self.pool
+
+    def __exit__(self, *exc_info):
+        return self.context.__exit__(*exc_info)
+
+
+def test_execute_continues_after_max_pause(monkeypatch):
+    """Test that pressure that never clears slows a run down instead of hanging it."""
+    FakeMemory(available=0).install(monkeypatch)
+    
+    data = list(range(20))
+    result = OptimizationResult(n_jobs=2, chunksize=5, reason="Test")
+    for retire_workers in (False, True):
+        watchdog = MemoryWatchdog(min_available=100 * MB, interval=0.01,
+                                  retire_workers=retire_workers, max_pause=0.1)
+        with pytest.warns(RuntimeWarning, match="one chunk at a time"):
+            assert execute(square, data, result=result, watchdog=watchdog) == [x ** 2 for x in data]
+        assert watchdog.pauses == 1
+
+
+def test_pause_exceeded(monkeypatch):
+    """Test that a pause is exceeded only past max_pause, and never without one."""
+    FakeMemory(available=0).install(monkeypatch)
+    limited = MemoryWatchdog(min_available=100 * MB, max_pause=0.05)
+    unlimited = MemoryWatchdog(min_available=100 * MB, max_pause=None)
+    assert limited.check() and unlimited.check()
+    assert not limited.pause_exceeded
+    time.sleep(0.06)
+    assert limited.pause_exceeded
+    assert not unlimited.pause_exceeded